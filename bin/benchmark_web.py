@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    Measure web search, radio start and artwork fill times against
+    bin/mock_webservices.py
+
+    bin/benchmark_web.py --root fixtures --latency 0.1 --runs 3
+    A copy of --database is used, so albums/artists exist in collection
+    Cache is cleared between runs unless --warm is passed
+
+    No fixtures are shipped: requests depend on the collection database,
+    so record them once from live services with the same database:
+    bin/benchmark_web.py --root fixtures --record
+"""
+
+from os import path
+from shutil import copy, rmtree
+from statistics import median
+from subprocess import run
+from tempfile import mkdtemp
+from threading import Thread
+import json
+import os
+import sys
+
+sys.path.insert(0, path.dirname(path.abspath(__file__)))
+from mock_webservices import get_parser, get_server  # noqa: E402
+
+
+def run_lollypop(options, data_home, cache_home, output):
+    """
+        Run Lollypop benchmark
+        @param options as argparse.Namespace
+        @param data_home as str
+        @param cache_home as str
+        @param output as str
+        @return [{}]
+    """
+    env = dict(os.environ)
+    env.update({
+        "GSETTINGS_BACKEND": "memory",
+        "XDG_DATA_HOME": data_home,
+        "XDG_CACHE_HOME": cache_home,
+        "LOLLYPOP_MOCK_URI": "http://%s:%s" % (options.address, options.port),
+        "LOLLYPOP_BENCHMARK": options.scenarios,
+        "LOLLYPOP_BENCHMARK_OUTPUT": output,
+        "LOLLYPOP_BENCHMARK_TERM": options.term
+    })
+    run([options.lollypop], env=env, timeout=options.timeout)
+    results = []
+    try:
+        with open(output, "r") as f:
+            for line in f:
+                results.append(json.loads(line))
+    except FileNotFoundError:
+        pass
+    return results
+
+
+def print_results(runs):
+    """
+        Print median of each measure
+        @param runs as [[{}]]
+    """
+    measures = {}
+    for results in runs:
+        for result in results:
+            if result["scenario"] == "http":
+                continue
+            key = (result["scenario"], result["name"])
+            if key not in measures.keys():
+                measures[key] = {"first": [], "total": []}
+            for measure in ["first", "total"]:
+                if result.get(measure) is not None:
+                    measures[key][measure].append(result[measure])
+    print("%-10s %-12s %10s %10s %6s" % ("scenario", "name",
+                                         "first (s)", "total (s)", "runs"))
+    for ((scenario, name), values) in sorted(measures.items()):
+        first = "%.2f" % median(values["first"]) if values["first"] else "-"
+        total = "%.2f" % median(values["total"]) if values["total"] else "-"
+        print("%-10s %-12s %10s %10s %6s" % (scenario, name, first, total,
+                                             len(values["total"])))
+
+
+if __name__ == "__main__":
+    parser = get_parser()
+    parser.add_argument("--lollypop", default="lollypop",
+                        help="lollypop executable")
+    parser.add_argument("--database",
+                        default=path.expanduser(
+                            "~/.local/share/lollypop/lollypop.db"),
+                        help="collection database to copy")
+    parser.add_argument("--scenarios", default="search,radio,artwork")
+    parser.add_argument("--term", default="love", help="search term")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--warm", action="store_true",
+                        help="keep cache between runs")
+    parser.add_argument("--timeout", type=int, default=600)
+    options = parser.parse_args()
+    if not options.record and (not path.isdir(options.root) or
+                               not os.listdir(options.root)):
+        print("No fixtures in %s, record them first with --record" %
+              options.root, file=sys.stderr)
+        sys.exit(1)
+    server = get_server(options)
+    Thread(target=server.serve_forever, daemon=True).start()
+    tmp = mkdtemp(prefix="lollypop-benchmark-")
+    data_home = path.join(tmp, "data")
+    os.makedirs(path.join(data_home, "lollypop"))
+    if path.exists(options.database):
+        copy(options.database, path.join(data_home, "lollypop"))
+    runs = []
+    try:
+        for i in range(0, options.runs):
+            cache_home = path.join(tmp, "cache")
+            if not options.warm:
+                rmtree(cache_home, ignore_errors=True)
+            output = path.join(tmp, "results-%s.json" % i)
+            runs.append(run_lollypop(options, data_home, cache_home, output))
+        print_results(runs)
+        print()
+        server.stats.dump()
+    finally:
+        server.shutdown()
+        rmtree(tmp, ignore_errors=True)
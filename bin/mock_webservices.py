@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    Local stand-in for web services used by Lollypop
+    Replays recorded payloads (Spotify, Deezer, Last.fm, MusicBrainz,
+    AudioDB, ...) with configurable latency, errors and rate limiting
+
+    Run Lollypop with LOLLYPOP_MOCK_URI=http://127.0.0.1:8080 to send
+    https://host/path?query to http://127.0.0.1:8080/host/path?query
+
+    Record payloads once with --record, then replay them offline:
+    bin/mock_webservices.py --root fixtures --record
+    bin/mock_webservices.py --root fixtures --latency 0.2 --error-rate 0.05
+"""
+
+from argparse import ArgumentParser
+from hashlib import sha1
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from random import random, uniform
+from threading import Lock
+from time import sleep, time
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+import os
+import sys
+
+
+class MockStats:
+    """
+        Per host counters
+    """
+
+    def __init__(self):
+        """
+            Init stats
+        """
+        self.__lock = Lock()
+        self.__hosts = {}
+
+    def add(self, host, status):
+        """
+            Count a response for host
+            @param host as str
+            @param status as int
+        """
+        with self.__lock:
+            if host not in self.__hosts.keys():
+                self.__hosts[host] = {}
+            stats = self.__hosts[host]
+            stats[status] = stats.get(status, 0) + 1
+
+    def dump(self):
+        """
+            Print counters
+        """
+        with self.__lock:
+            for (host, stats) in sorted(self.__hosts.items()):
+                print("%s: %s" % (host, ", ".join(
+                    "%s: %s" % (status, count)
+                    for (status, count) in sorted(stats.items()))))
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """
+        Serve /host/path?query from fixtures
+    """
+
+    # Keep-alive, like real web services
+    protocol_version = "HTTP/1.1"
+    __MAGICS = {b"\xff\xd8\xff": "image/jpeg",
+                b"\x89PNG": "image/png",
+                b"GIF8": "image/gif",
+                b"RIFF": "image/webp"}
+
+    def do_GET(self):
+        """
+            Serve GET requests
+        """
+        self.__serve(None)
+
+    def do_POST(self):
+        """
+            Serve POST requests (tokens, scrobbles)
+        """
+        length = int(self.headers.get("Content-Length", 0))
+        self.__serve(self.rfile.read(length))
+
+    def log_message(self, format, *args):
+        """
+            Only log with --verbose
+        """
+        if self.server.options.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+#######################
+# PRIVATE             #
+#######################
+    def __serve(self, body):
+        """
+            Serve fixture for request
+            @param body as bytes/None
+        """
+        options = self.server.options
+        (host, path, query) = self.__split()
+        if options.latency or options.jitter:
+            sleep(max(0, options.latency +
+                      uniform(-options.jitter, options.jitter)))
+        if random() < options.ratelimit_rate:
+            reset = int(time()) + 1
+            self.__reply(host, 429, b"{}",
+                         [("X-RateLimit-Remaining", "0"),
+                          ("X-RateLimit-Reset", str(reset)),
+                          ("Retry-After", "1")])
+            return
+        if random() < options.error_rate:
+            self.__reply(host, 500, b"{}")
+            return
+        content = self.__read(host, path, query)
+        if content is None and options.record:
+            content = self.__record(host, path, query, body)
+        if content is None:
+            self.__reply(host, 404, b"{}")
+        else:
+            self.__reply(host, 200, content)
+
+    def __split(self):
+        """
+            Split request path
+            @return (host as str, path as str, query as str)
+        """
+        (path, sep, query) = self.path.partition("?")
+        (host, sep, path) = path.lstrip("/").partition("/")
+        return (host, "/" + path, query)
+
+    def __get_path(self, host, path, query):
+        """
+            Get fixture path
+            @param host as str
+            @param path as str
+            @param query as str
+            @return str
+        """
+        name = path.strip("/").replace("/", "__") or "index"
+        if query:
+            name += "@" + sha1(query.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.server.options.root, host, name)
+
+    def __read(self, host, path, query):
+        """
+            Read fixture, fallback to fixture without query
+            @param host as str
+            @param path as str
+            @param query as str
+            @return bytes/None
+        """
+        for candidate in [self.__get_path(host, path, query),
+                          self.__get_path(host, path, "")]:
+            try:
+                with open(candidate, "rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                pass
+        return None
+
+    def __record(self, host, path, query, body):
+        """
+            Fetch payload from web service and save it
+            @param host as str
+            @param path as str
+            @param query as str
+            @param body as bytes/None
+            @return bytes/None
+        """
+        uri = "https://%s%s" % (host, path)
+        if query:
+            uri += "?" + query
+        headers = {"User-Agent": self.headers.get("User-Agent", "Lollypop")}
+        for name in ["Authorization", "Content-Type", "Accept"]:
+            if self.headers.get(name) is not None:
+                headers[name] = self.headers.get(name)
+        try:
+            with urlopen(Request(uri, data=body, headers=headers),
+                         timeout=30) as response:
+                content = response.read()
+        except HTTPError as e:
+            print("%s: %s" % (uri, e.code), file=sys.stderr)
+            return None
+        except Exception as e:
+            print("%s: %s" % (uri, e), file=sys.stderr)
+            return None
+        fixture = self.__get_path(host, path, query)
+        os.makedirs(os.path.dirname(fixture), exist_ok=True)
+        with open(fixture, "wb") as f:
+            f.write(content)
+        return content
+
+    def __reply(self, host, status, content, headers=[]):
+        """
+            Send response
+            @param host as str
+            @param status as int
+            @param content as bytes
+            @param headers as [(str, str)]
+        """
+        content_type = "application/json"
+        for (magic, mime) in self.__MAGICS.items():
+            if content.startswith(magic):
+                content_type = mime
+                break
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for (name, value) in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(content)
+        self.server.stats.add(host, status)
+
+
+def get_server(options):
+    """
+        Get mock server for options
+        @param options as argparse.Namespace
+        @return ThreadingHTTPServer
+    """
+    server = ThreadingHTTPServer((options.address, options.port), MockHandler)
+    server.daemon_threads = True
+    server.options = options
+    server.stats = MockStats()
+    return server
+
+
+def get_parser():
+    """
+        Get command line parser
+        @return ArgumentParser
+    """
+    parser = ArgumentParser(description="Lollypop web services mock")
+    parser.add_argument("--root", default="fixtures",
+                        help="fixtures directory: <root>/<host>/<path>")
+    parser.add_argument("--address", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0,
+                        help="seconds added to each response")
+    parser.add_argument("--jitter", type=float, default=0,
+                        help="random seconds added/removed to latency")
+    parser.add_argument("--error-rate", type=float, default=0,
+                        help="ratio of 500 responses")
+    parser.add_argument("--ratelimit-rate", type=float, default=0,
+                        help="ratio of 429 responses")
+    parser.add_argument("--record", action="store_true",
+                        help="fetch and save missing fixtures")
+    parser.add_argument("--verbose", action="store_true")
+    return parser
+
+
+if __name__ == "__main__":
+    options = get_parser().parse_args()
+    server = get_server(options)
+    print("Serving %s on http://%s:%s" % (options.root,
+                                          options.address,
+                                          options.port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.stats.dump()
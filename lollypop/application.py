@@ -13,6 +13,7 @@
 import gi
 gi.require_version("Gst", "1.0")
 gi.require_version("GstAudio", "1.0")
+gi.require_version("GstController", "1.0")
 gi.require_version("GstPbutils", "1.0")
 gi.require_version("TotemPlParser", "1.0")
 gi.require_version("Handy", "1")
@@ -21,14 +22,13 @@ Gst.init(None)
 GstPbutils.pb_utils_init()
 
 from threading import current_thread
-from pickle import dump
 from signal import signal, SIGINT, SIGTERM
 from urllib.parse import urlparse
 
 from lollypop.utils import init_proxy_from_gnome, emit_signal
 from lollypop.application_actions import ApplicationActions
 from lollypop.utils_file import get_file_type, install_youtube_dl
-from lollypop.define import LOLLYPOP_DATA_PATH, ScanType, StorageType, FileType
+from lollypop.define import ScanType, FileType
 from lollypop.database import Database
 from lollypop.player import Player
 from lollypop.inhibitor import Inhibitor
@@ -48,6 +48,10 @@ from lollypop.objects_track import Track
 from lollypop.objects_album import Album
 from lollypop.helper_task import TaskHelper
 from lollypop.helper_art import ArtHelper
+from lollypop.helper_cache_quota import CacheQuotaHelper
+from lollypop.helper_stream_resolver import StreamResolverHelper
+from lollypop.helper_audio_cache import AudioCacheHelper
+from lollypop.helper_replay_gain import ReplayGainHelper
 from lollypop.collection_scanner import CollectionScanner
 
 
@@ -178,9 +182,15 @@ class Application(Gtk.Application, ApplicationActions):
         self.scanner = CollectionScanner()
         self.notify = NotificationManager()
         self.task_helper = TaskHelper()
+        self.stream_resolver = StreamResolverHelper()
         self.art_helper = ArtHelper()
         self.art = Art()
         self.art.update_art_size()
+        self.cache_quota = CacheQuotaHelper()
+        self.cache_quota.start()
+        self.audio_cache = AudioCacheHelper()
+        self.replay_gain = ReplayGainHelper()
+        self.replay_gain.start()
         self.ws_director = DirectorWebService()
         self.ws_director.start()
         if not self.settings.get_value("disable-mpris"):
@@ -214,6 +224,14 @@ class Application(Gtk.Application, ApplicationActions):
             self.__window.setup()
             self.__window.show()
             self.player.restore_state()
+            scenarios = GLib.environ_getenv(GLib.get_environ(),
+                                            "LOLLYPOP_BENCHMARK")
+            if scenarios is not None:
+                from lollypop.helper_benchmark import BenchmarkHelper
+                BenchmarkHelper(
+                    scenarios,
+                    GLib.environ_getenv(GLib.get_environ(),
+                                        "LOLLYPOP_BENCHMARK_OUTPUT")).start()
 
     def quit(self, vacuum=False):
         """
@@ -227,6 +245,12 @@ class Application(Gtk.Application, ApplicationActions):
             return
         if self.settings.get_value("save-state"):
             self.__window.container.stack.save_history()
+        self.task_helper.http_pool.log_stats()
+        self.task_helper.http_cache.log_stats()
+        self.task_helper.http_scheduler.log_stats()
+        self.stream_resolver.stop()
+        self.audio_cache.stop()
+        self.replay_gain.stop()
         # Then vacuum db
         if vacuum:
             self.__vacuum()
@@ -346,28 +370,7 @@ class Application(Gtk.Application, ApplicationActions):
             Save player state
         """
         if self.settings.get_value("save-state"):
-            if self.player.current_track.id is None or\
-                    self.player.current_track.storage_type &\
-                    StorageType.EPHEMERAL:
-                track_id = None
-            else:
-                track_id = self.player.current_track.id
-                # Save albums context
-                try:
-                    with open(LOLLYPOP_DATA_PATH + "/Albums.bin", "wb") as f:
-                        dump(self.player.albums, f)
-                except Exception as e:
-                    Logger.error("Application::__save_state(): %s" % e)
-            dump(track_id, open(LOLLYPOP_DATA_PATH + "/track_id.bin", "wb"))
-            dump([self.player.is_playing, self.player.is_party],
-                 open(LOLLYPOP_DATA_PATH + "/player.bin", "wb"))
-            dump(self.player.queue,
-                 open(LOLLYPOP_DATA_PATH + "/queue.bin", "wb"))
-            if self.player.current_track.id is not None:
-                position = self.player.position
-            else:
-                position = 0
-            dump(position, open(LOLLYPOP_DATA_PATH + "/position.bin", "wb"))
+            self.player.save_state()
         self.player.stop_all()
 
     def __vacuum(self):
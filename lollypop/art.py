@@ -18,9 +18,10 @@ from lollypop.art_base import BaseArt
 from lollypop.art_album import AlbumArt
 from lollypop.art_artist import ArtistArt
 from lollypop.art_downloader import DownloaderArt
+from lollypop.art_pack import ArtPack
 from lollypop.logger import Logger
 from lollypop.define import CACHE_PATH, ALBUMS_WEB_PATH, ALBUMS_PATH
-from lollypop.define import ARTISTS_PATH, TimeStamp
+from lollypop.define import ARTISTS_PATH, PACK_PATH, TimeStamp
 from lollypop.define import App
 from lollypop.utils import emit_signal
 from lollypop.utils_file import create_dir, remove_oldest
@@ -55,6 +56,10 @@ class Art(BaseArt, AlbumArt, ArtistArt, DownloaderArt):
             self._ext = "png"
         else:
             self._ext = "jpg"
+        if App().settings.get_value("packed-artwork-cache"):
+            self._pack = ArtPack(PACK_PATH)
+        else:
+            self._pack = None
 
     def add_artwork_to_cache(self, name, surface, prefix):
         """
@@ -68,14 +73,21 @@ class Art(BaseArt, AlbumArt, ArtistArt, DownloaderArt):
             encoded = md5(name.encode("utf-8")).hexdigest()
             width = surface.get_width()
             height = surface.get_height()
+            quality = str(App().settings.get_value(
+                "cover-quality").get_int32())
+            pixbuf = Gdk.pixbuf_get_from_surface(surface, 0, 0, width, height)
+            if self._use_pack(width, height):
+                key = "@%s@%s_%s_%s" % (prefix, encoded, width, height)
+                (status, data) = pixbuf.save_to_bufferv(
+                    "jpeg", ["quality"], [quality])
+                if status:
+                    self._pack.add(key, data)
+                return
             cache_path_jpg = "%s/@%s@%s_%s_%s.jpg" % (CACHE_PATH,
                                                       prefix,
                                                       encoded,
                                                       width, height)
-            pixbuf = Gdk.pixbuf_get_from_surface(surface, 0, 0, width, height)
-            pixbuf.savev(cache_path_jpg, "jpeg", ["quality"],
-                         [str(App().settings.get_value(
-                             "cover-quality").get_int32())])
+            pixbuf.savev(cache_path_jpg, "jpeg", ["quality"], [quality])
         except Exception as e:
             Logger.error("Art::add_artwork_to_cache(): %s" % e)
 
@@ -88,6 +100,8 @@ class Art(BaseArt, AlbumArt, ArtistArt, DownloaderArt):
         try:
             from glob import glob
             encoded = md5(name.encode("utf-8")).hexdigest()
+            if self._pack is not None:
+                self._pack.remove_prefix("@%s@%s_" % (prefix, encoded))
             search = "%s/@%s@%s_*.jpg" % (CACHE_PATH,
                                           prefix,
                                           encoded)
@@ -110,11 +124,22 @@ class Art(BaseArt, AlbumArt, ArtistArt, DownloaderArt):
         """
         try:
             encoded = md5(name.encode("utf-8")).hexdigest()
+            if self._use_pack(width, height):
+                key = "@%s@%s_%s_%s" % (prefix, encoded, width, height)
+                data = self._pack.get(key)
+                if data is None:
+                    return None
+                bytes = GLib.Bytes.new(data)
+                stream = Gio.MemoryInputStream.new_from_bytes(bytes)
+                pixbuf = GdkPixbuf.Pixbuf.new_from_stream(stream, None)
+                stream.close()
+                return pixbuf
             cache_path_jpg = "%s/@%s@%s_%s_%s.jpg" % (CACHE_PATH,
                                                       prefix,
                                                       encoded,
                                                       width, height)
             pixbuf = GdkPixbuf.Pixbuf.new_from_file(cache_path_jpg)
+            App().cache_quota.touch(cache_path_jpg)
             return pixbuf
         except Exception as e:
             Logger.warning("Art::get_artwork_from_cache(): %s" % e)
@@ -130,6 +155,9 @@ class Art(BaseArt, AlbumArt, ArtistArt, DownloaderArt):
             @return bool
         """
         encoded = md5(name.encode("utf-8")).hexdigest()
+        if self._use_pack(width, height):
+            key = "@%s@%s_%s_%s" % (prefix, encoded, width, height)
+            return self._pack.exists(key)
         cache_path_jpg = "%s/@%s@%s_%s_%s.jpg" % (CACHE_PATH,
                                                   prefix,
                                                   encoded,
@@ -146,19 +174,39 @@ class Art(BaseArt, AlbumArt, ArtistArt, DownloaderArt):
             remove_oldest(ARTISTS_PATH, TimeStamp.THREE_YEAR)
             remove_oldest(ALBUMS_PATH, TimeStamp.THREE_YEAR)
             remove_oldest(ALBUMS_WEB_PATH, TimeStamp.ONE_YEAR)
+            App().cache_quota.clean()
+            if self._pack is not None:
+                self._pack.compact()
         except Exception as e:
             Logger.error("Art::clean_artwork(): %s", e)
 
-    def clean_rounded(self):
+    def clean_rounded(self, album_ids=None):
         """
             Clean rounded artwork
+            @param album_ids as [int]: only clean collages using those albums
         """
         try:
-            from pathlib import Path
-            for p in Path(CACHE_PATH).glob("@ROUNDED*@*.jpg"):
-                p.unlink()
+            if album_ids is None:
+                from pathlib import Path
+                for p in Path(CACHE_PATH).glob("@ROUNDED*@*.jpg"):
+                    p.unlink()
+                if self._pack is not None:
+                    self._pack.remove_prefix("@ROUNDED")
+                App().cache.clear_table("collage")
+            else:
+                for name in App().cache.get_collage_names(album_ids):
+                    self.uncache_collage(name)
         except Exception as e:
-            Logger.error("Art::clean_all_cache(): %s", e)
+            Logger.error("Art::clean_rounded(): %s", e)
+
+    def uncache_collage(self, name):
+        """
+            Remove collage artwork from cache, widgets will rebuild it
+            @param name as str
+        """
+        Logger.debug("Art::uncache_collage(): %s", name)
+        App().cache.clear_collage(name)
+        self.remove_artwork_from_cache(name, "ROUNDED")
 
     def clean_all_cache(self):
         """
@@ -168,5 +216,9 @@ class Art(BaseArt, AlbumArt, ArtistArt, DownloaderArt):
             from pathlib import Path
             for p in Path(CACHE_PATH).glob("*.jpg"):
                 p.unlink()
+            if self._pack is not None:
+                self._pack.clear()
+            # Allow providers to be queried again
+            App().cache.clear_table("negative")
         except Exception as e:
             Logger.error("Art::clean_all_cache(): %s", e)
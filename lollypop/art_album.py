@@ -62,7 +62,10 @@ class AlbumArt:
             if f.query_exists():
                 return cache_filepath
             else:
-                self.get_album_artwork(album, width, height, 1)
+                pixbuf = self.get_album_artwork(album, width, height, 1)
+                # Packed artwork, callers need a file
+                if pixbuf is not None and not f.query_exists():
+                    self._save_pixbuf_to_file(pixbuf, cache_filepath)
                 if f.query_exists():
                     return cache_filepath
         except Exception as e:
@@ -189,15 +192,23 @@ class AlbumArt:
             h = height
         cache_filepath = "%s/%s_%s_%s.%s" % (CACHE_PATH, album.lp_album_id,
                                              w, h, self._ext)
+        blur_cache_path = self.get_blur_cache_path(album.lp_album_id,
+                                                   width, height, behaviour)
         pixbuf = None
         try:
+            # Look in blur cache
+            pixbuf = self.get_blur_from_cache(blur_cache_path,
+                                              width, height, behaviour)
+            if pixbuf is not None:
+                return pixbuf
             # Look in cache
-            f = Gio.File.new_for_path(cache_filepath)
-            if not behaviour & ArtBehaviour.NO_CACHE and f.query_exists():
-                pixbuf = GdkPixbuf.Pixbuf.new_from_file(cache_filepath)
+            if not behaviour & ArtBehaviour.NO_CACHE:
+                pixbuf = self._get_pixbuf_from_cache(cache_filepath, w, h)
+            if pixbuf is not None:
                 if optimized_blur:
                     pixbuf = self.load_behaviour(pixbuf, None,
-                                                 width, height, behaviour)
+                                                 width, height, behaviour,
+                                                 blur_cache_path)
 
             # Use favorite folder artwork
             if pixbuf is None:
@@ -240,7 +251,8 @@ class AlbumArt:
                 self.cache_album_artwork(album.id)
                 return None
             pixbuf = self.load_behaviour(pixbuf, cache_filepath,
-                                         width, height, behaviour)
+                                         width, height, behaviour,
+                                         blur_cache_path)
             return pixbuf
         except Exception as e:
             Logger.error("AlbumArt::get_album_artwork(): %s -> %s" % (uri, e))
@@ -287,6 +299,7 @@ class AlbumArt:
         """
         if album_id is not None:
             emit_signal(self, "album-artwork-changed", album_id)
+            App().task_helper.run(self.clean_rounded, [album_id])
 
     def remove_album_artwork(self, album):
         """
@@ -317,7 +330,13 @@ class AlbumArt:
             if width == -1 or height == -1:
                 for p in Path(CACHE_PATH).glob("%s*.jpg" % album.lp_album_id):
                     p.unlink()
+                if self._pack is not None:
+                    self._pack.remove_prefix("%s_" % album.lp_album_id)
             else:
+                if self._pack is not None:
+                    self._pack.remove("%s_%s_%s.%s" % (album.lp_album_id,
+                                                       width, height,
+                                                       self._ext))
                 filename = "%s/%s_%s_%s.jpg" % (CACHE_PATH,
                                                 album.lp_album_id,
                                                 width,
@@ -102,15 +102,23 @@ class ArtistArt:
         filename = self.encode_artist_name(artist)
         cache_filepath = "%s/%s_%s_%s.%s" % (CACHE_PATH, filename,
                                              w, h, self._ext)
+        blur_cache_path = self.get_blur_cache_path(filename, width, height,
+                                                   behaviour)
         pixbuf = None
         try:
+            # Look in blur cache
+            pixbuf = self.get_blur_from_cache(blur_cache_path,
+                                              width, height, behaviour)
+            if pixbuf is not None:
+                return pixbuf
             # Look in cache
-            f = Gio.File.new_for_path(cache_filepath)
-            if not behaviour & ArtBehaviour.NO_CACHE and f.query_exists():
-                pixbuf = GdkPixbuf.Pixbuf.new_from_file(cache_filepath)
+            if not behaviour & ArtBehaviour.NO_CACHE:
+                pixbuf = self._get_pixbuf_from_cache(cache_filepath, w, h)
+            if pixbuf is not None:
                 if optimized_blur:
                     pixbuf = self.load_behaviour(pixbuf, None,
-                                                 width, height, behaviour)
+                                                 width, height, behaviour,
+                                                 blur_cache_path)
                 return pixbuf
             else:
                 filepath = self.get_artist_artwork_path(artist)
@@ -123,7 +131,8 @@ class ArtistArt:
                     self.cache_artist_artwork(artist)
                     return None
                 pixbuf = self.load_behaviour(pixbuf, cache_filepath,
-                                             width, height, behaviour)
+                                             width, height, behaviour,
+                                             blur_cache_path)
             return pixbuf
         except Exception as e:
             Logger.error("ArtistArt::get_artist_artwork(): %s" % e)
@@ -143,9 +152,11 @@ class ArtistArt:
         """
         try:
             from pathlib import Path
-            search = "%s*.jpg" % self.encode_artist_name(artist)
-            for p in Path(CACHE_PATH).glob(search):
+            encoded = self.encode_artist_name(artist)
+            for p in Path(CACHE_PATH).glob("%s*.jpg" % encoded):
                 p.unlink()
+            if self._pack is not None:
+                self._pack.remove_prefix("%s_" % encoded)
         except Exception as e:
             Logger.error("ArtistArt::uncache_artist_artwork(): %s" % e)
 
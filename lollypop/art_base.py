@@ -12,10 +12,11 @@
 
 from gi.repository import GObject, Gio, GLib, GdkPixbuf
 
+from os.path import basename
 from PIL import Image, ImageFilter
 
 from lollypop.define import ArtSize, App, ArtBehaviour
-from lollypop.define import ALBUMS_PATH
+from lollypop.define import ALBUMS_PATH, CACHE_PATH
 from lollypop.logger import Logger
 
 
@@ -32,19 +33,32 @@ class BaseArt(GObject.GObject):
                               (GObject.TYPE_PYOBJECT,)),
     }
 
+    # Blurred artwork is cached rounded to this size
+    _BLUR_BUCKET = 50
+    # Downscale factor is gaussian // _BLUR_FACTOR
+    _BLUR_FACTOR = 8
+    # Do not downscale under this size
+    _BLUR_MIN_SIZE = 32
+    # Artwork bigger than this is never stored in packs
+    _PACK_MAX_SIZE = 512
+
     def __init__(self):
         """
             Init base art
         """
         GObject.GObject.__init__(self)
+        # ArtPack if "packed-artwork-cache" is enabled
+        self._pack = None
 
-    def load_behaviour(self, pixbuf, cache_path, width, height, behaviour):
+    def load_behaviour(self, pixbuf, cache_path, width, height, behaviour,
+                       blur_cache_path=None):
         """
             Load behaviour on pixbuf
             @param cache_path as str
             @param width as int
             @param height as int
             @param behaviour as ArtBehaviour
+            @param blur_cache_path as str/None
         """
         # Crop image as square
         if behaviour & ArtBehaviour.CROP_SQUARE:
@@ -54,26 +68,26 @@ class BaseArt(GObject.GObject):
             pixbuf = self._crop_pixbuf(pixbuf, width, height)
 
         # Handle blur
-        if behaviour & ArtBehaviour.BLUR:
-            _pixbuf = pixbuf
-            pixbuf = _pixbuf.scale_simple(width,
-                                          height,
-                                          GdkPixbuf.InterpType.NEAREST)
-            del _pixbuf
-            pixbuf = self._get_blur(pixbuf, 25)
-        elif behaviour & ArtBehaviour.BLUR_HARD:
-            _pixbuf = pixbuf
-            pixbuf = _pixbuf.scale_simple(width,
-                                          height,
-                                          GdkPixbuf.InterpType.NEAREST)
-            pixbuf = self._get_blur(pixbuf, 50)
-        elif behaviour & ArtBehaviour.BLUR_MAX:
-            _pixbuf = pixbuf
-            pixbuf = _pixbuf.scale_simple(width,
-                                          height,
-                                          GdkPixbuf.InterpType.NEAREST)
-            del _pixbuf
-            pixbuf = self._get_blur(pixbuf, 100)
+        gaussian = self._get_blur_radius(behaviour)
+        if gaussian is not None:
+            if blur_cache_path is None:
+                pixbuf = self._get_blur(pixbuf, gaussian, width, height)
+            else:
+                (bucket_width, bucket_height) = self._get_blur_bucket(
+                    width, height)
+                pixbuf = self._get_blur(pixbuf, gaussian,
+                                        bucket_width, bucket_height)
+                if not behaviour & ArtBehaviour.NO_CACHE:
+                    try:
+                        pixbuf.savev(blur_cache_path, "jpeg",
+                                     ["quality"], ["90"])
+                    except Exception as e:
+                        Logger.error("BaseArt::load_behaviour(): %s", e)
+                if bucket_width != width or bucket_height != height:
+                    _pixbuf = pixbuf
+                    pixbuf = _pixbuf.scale_simple(
+                        width, height, GdkPixbuf.InterpType.BILINEAR)
+                    del _pixbuf
         else:
             _pixbuf = pixbuf
             pixbuf = _pixbuf.scale_simple(width,
@@ -81,14 +95,59 @@ class BaseArt(GObject.GObject):
                                           GdkPixbuf.InterpType.BILINEAR)
             del _pixbuf
         if behaviour & ArtBehaviour.CACHE and cache_path is not None:
-            if cache_path.endswith(".jpg"):
-                pixbuf.savev(cache_path, "jpeg", ["quality"],
-                             [str(App().settings.get_value(
-                                 "cover-quality").get_int32())])
-            else:
-                pixbuf.savev(cache_path, "png", [None], [None])
+            self._save_pixbuf_to_cache(pixbuf, cache_path, width, height)
         return pixbuf
 
+    def get_blur_cache_path(self, name, width, height, behaviour):
+        """
+            Get blur cache path for name, None if behaviour is not blurred
+            @param name as str
+            @param width as int
+            @param height as int
+            @param behaviour as ArtBehaviour
+            @return str/None
+        """
+        gaussian = self._get_blur_radius(behaviour)
+        if gaussian is None:
+            return None
+        # Cropped and uncropped artwork differ
+        if behaviour & ArtBehaviour.CROP_SQUARE:
+            crop = "s"
+        elif behaviour & ArtBehaviour.CROP:
+            crop = "c"
+        else:
+            crop = ""
+        (bucket_width, bucket_height) = self._get_blur_bucket(width, height)
+        return "%s/%s_blur%s%s_%s_%s.jpg" % (CACHE_PATH, name, gaussian, crop,
+                                             bucket_width, bucket_height)
+
+    def get_blur_from_cache(self, blur_cache_path, width, height, behaviour):
+        """
+            Get blurred pixbuf from cache, scaled to width/height
+            @param blur_cache_path as str
+            @param width as int
+            @param height as int
+            @param behaviour as ArtBehaviour
+            @return GdkPixbuf.Pixbuf/None
+        """
+        if blur_cache_path is None or behaviour & ArtBehaviour.NO_CACHE:
+            return None
+        if not GLib.file_test(blur_cache_path, GLib.FileTest.EXISTS):
+            return None
+        try:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file(blur_cache_path)
+            App().cache_quota.touch(blur_cache_path)
+            if pixbuf.get_width() != width or pixbuf.get_height() != height:
+                _pixbuf = pixbuf
+                pixbuf = _pixbuf.scale_simple(width,
+                                              height,
+                                              GdkPixbuf.InterpType.BILINEAR)
+                del _pixbuf
+            return pixbuf
+        except Exception as e:
+            Logger.warning("BaseArt::get_blur_from_cache(): %s", e)
+        return None
+
     def update_art_size(self):
         """
             Update value with some check
@@ -146,6 +205,63 @@ class BaseArt(GObject.GObject):
 #######################
 # PROTECTED           #
 #######################
+    def _use_pack(self, width, height):
+        """
+            True if artwork at size should be stored in packs
+            @param width as int
+            @param height as int
+            @return bool
+        """
+        return self._pack is not None and\
+            max(width, height) <= self._PACK_MAX_SIZE
+
+    def _get_pixbuf_from_cache(self, cache_path, width, height):
+        """
+            Get cached artwork, small artwork is read from packs
+            @param cache_path as str
+            @param width as int
+            @param height as int
+            @return GdkPixbuf.Pixbuf/None
+        """
+        if self._use_pack(width, height):
+            data = self._pack.get(basename(cache_path))
+            if data is None:
+                return None
+            bytes = GLib.Bytes.new(data)
+            stream = Gio.MemoryInputStream.new_from_bytes(bytes)
+            pixbuf = GdkPixbuf.Pixbuf.new_from_stream(stream, None)
+            stream.close()
+            return pixbuf
+        elif GLib.file_test(cache_path, GLib.FileTest.EXISTS):
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file(cache_path)
+            App().cache_quota.touch(cache_path)
+            return pixbuf
+        return None
+
+    def _save_pixbuf_to_cache(self, pixbuf, cache_path, width, height):
+        """
+            Save artwork to cache, small artwork is saved in packs
+            @param pixbuf as GdkPixbuf.Pixbuf
+            @param cache_path as str
+            @param width as int
+            @param height as int
+        """
+        if self._use_pack(width, height):
+            (status, data) = pixbuf.save_to_bufferv(
+                *self.__get_save_args(cache_path))
+            if status:
+                self._pack.add(basename(cache_path), data)
+        else:
+            self._save_pixbuf_to_file(pixbuf, cache_path)
+
+    def _save_pixbuf_to_file(self, pixbuf, path):
+        """
+            Save artwork at path, format depends on path extension
+            @param pixbuf as GdkPixbuf.Pixbuf
+            @param path as str
+        """
+        pixbuf.savev(path, *self.__get_save_args(path))
+
     def _crop_pixbuf(self, pixbuf, wanted_width, wanted_height):
         """
             Crop pixbuf
@@ -200,15 +316,87 @@ class BaseArt(GObject.GObject):
         del pixbuf
         return new_pixbuf
 
-    def _get_blur(self, pixbuf, gaussian):
+    def _get_blur_radius(self, behaviour):
+        """
+            Get gaussian radius for behaviour
+            @param behaviour as ArtBehaviour
+            @return int/None
+        """
+        if behaviour & ArtBehaviour.BLUR:
+            return 25
+        elif behaviour & ArtBehaviour.BLUR_HARD:
+            return 50
+        elif behaviour & ArtBehaviour.BLUR_MAX:
+            return 100
+        return None
+
+    def _get_blur_bucket(self, width, height):
+        """
+            Round size to upper blur bucket, so resizing reuses cache
+            @param width as int
+            @param height as int
+            @return (int, int)
+        """
+        bucket = self._BLUR_BUCKET
+        return (-(-width // bucket) * bucket, -(-height // bucket) * bucket)
+
+    def _get_blur(self, pixbuf, gaussian, width=None, height=None):
         """
-            Blur surface using PIL
+            Blur pixbuf using PIL
+            Blur is done on a downscaled copy and then upscaled to
+            width/height: result is the same for large radius
             @param pixbuf as GdkPixbuf.Pixbuf
             @param gaussian as int
+            @param width as int
+            @param height as int
             @return GdkPixbuf.Pixbuf
         """
         if pixbuf is None:
             return None
+        if width is None or height is None:
+            width = pixbuf.get_width()
+            height = pixbuf.get_height()
+        factor = max(1, gaussian // self._BLUR_FACTOR)
+        factor = min(factor,
+                     max(1, min(width, height) // self._BLUR_MIN_SIZE))
+        small_width = max(1, width // factor)
+        small_height = max(1, height // factor)
+        _pixbuf = pixbuf
+        pixbuf = _pixbuf.scale_simple(small_width,
+                                      small_height,
+                                      GdkPixbuf.InterpType.BILINEAR)
+        del _pixbuf
+        pixbuf = self.__blur_pixbuf(pixbuf, gaussian / factor)
+        if factor != 1:
+            _pixbuf = pixbuf
+            pixbuf = _pixbuf.scale_simple(width,
+                                          height,
+                                          GdkPixbuf.InterpType.BILINEAR)
+            del _pixbuf
+        return pixbuf
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_save_args(self, path):
+        """
+            Get pixbuf save arguments for path
+            @param path as str
+            @return (str, [str], [str]) as type, option keys, option values
+        """
+        if path.endswith(".jpg"):
+            return ("jpeg", ["quality"],
+                    [str(App().settings.get_value(
+                        "cover-quality").get_int32())])
+        return ("png", [None], [None])
+
+    def __blur_pixbuf(self, pixbuf, gaussian):
+        """
+            Blur pixbuf at its size using PIL
+            @param pixbuf as GdkPixbuf.Pixbuf
+            @param gaussian as float
+            @return GdkPixbuf.Pixbuf
+        """
         width = pixbuf.get_width()
         height = pixbuf.get_height()
         data = pixbuf.get_pixels()
@@ -233,7 +421,3 @@ class BaseArt(GObject.GObject):
                                                  height,
                                                  dst_row_stride)
         return pixbuf
-
-#######################
-# PRIVATE             #
-#######################
@@ -20,6 +20,7 @@ from lollypop.define import StorageType
 from lollypop.utils import get_network_available, noaccents, emit_signal
 from lollypop.logger import Logger
 from lollypop.objects_album import Album
+from lollypop.helper_art_fetcher import ArtFetcherHelper
 
 
 class DownloaderArt:
@@ -47,8 +48,7 @@ class DownloaderArt:
         }
         self.__albums_queue = []
         self.__artists_queue = []
-        self.__in_albums_download = False
-        self.__in_artists_download = False
+        self.__fetcher = ArtFetcherHelper()
 
     def search_album_artworks(self, artist, album, cancellable):
         """
@@ -61,7 +61,7 @@ class DownloaderArt:
         results = []
         for api in self.__album_methods.keys():
             uris = self.__album_methods[api](artist, album, cancellable)
-            for uri in uris:
+            for uri in uris or []:
                 results.append((uri, api))
         emit_signal(self, "uri-artwork-found", results)
 
@@ -75,7 +75,7 @@ class DownloaderArt:
         results = []
         for api in self.__artist_methods.keys():
             uris = self.__artist_methods[api](artist, cancellable)
-            for uri in uris:
+            for uri in uris or []:
                 results.append((uri, api))
         emit_signal(self, "uri-artwork-found", results)
 
@@ -83,23 +83,24 @@ class DownloaderArt:
         """
             Download album artwork
             @param album_id as int
+            @return concurrent.futures.Future/None if not queued
         """
-        if not get_network_available("DATA"):
-            return
+        if not get_network_available("DATA") or\
+                album_id in self.__albums_queue:
+            return None
         self.__albums_queue.append(album_id)
-        if not self.__in_albums_download:
-            App().task_helper.run(self.__cache_albums_artwork)
+        return self.__fetcher.submit(self.__cache_albums_artwork)
 
     def cache_artist_artwork(self, artist):
         """
             Cache artist artwork
             @param artist as str
         """
-        if not get_network_available("DATA"):
+        if not get_network_available("DATA") or\
+                artist in self.__artists_queue:
             return
         self.__artists_queue.append(artist)
-        if not self.__in_artists_download:
-            App().task_helper.run(self.__cache_artists_artwork)
+        self.__fetcher.submit(self.__cache_artists_artwork)
 
     def search_artwork_from_google(self, search, cancellable):
         """
@@ -145,11 +146,11 @@ class DownloaderArt:
             Get artist artwork using AutdioDB
             @param artist as str
             @param cancellable as Gio.Cancellable
-            @return uri as str
+            @return [str]/None if provider failed
             @thread safe
         """
         if not get_network_available("AUDIODB"):
-            return []
+            return None
         try:
             artist = GLib.uri_escape_string(artist, None, True)
             uri = "https://theaudiodb.com/api/v1/json/"
@@ -158,28 +159,28 @@ class DownloaderArt:
                 uri, cancellable)
             if status:
                 decode = json.loads(data.decode("utf-8"))
-                uri = None
-                for item in decode["artists"]:
+                for item in decode["artists"] or []:
                     for key in ["strArtistFanart", "strArtistThumb"]:
                         uri = item[key]
                         if uri is not None:
                             return [uri]
+                return []
         except Exception as e:
             Logger.warning("%s %s", e, artist)
             Logger.warning(
                 "DownloaderArt::_get_audiodb_artist_artwork_uri: %s", data)
-        return []
+        return None
 
     def _get_deezer_artist_artwork_uri(self, artist, cancellable=None):
         """
             Get artist artwork using Deezer
             @param artist as str
             @param cancellable as Gio.Cancellable
-            @return uri as str
+            @return [str]/None if provider failed
             @tread safe
         """
         if not get_network_available("DEEZER"):
-            return []
+            return None
         try:
             artist_formated = GLib.uri_escape_string(
                 artist, None, True).replace(" ", "+")
@@ -188,54 +189,53 @@ class DownloaderArt:
             (status, data) = App().task_helper.load_uri_content_sync(
                 uri, cancellable)
             if status:
-                uri = None
                 decode = json.loads(data.decode("utf-8"))
-                uri = decode["data"][0]["picture_xl"]
-                return [uri]
+                return [item["picture_xl"] for item in decode["data"][:1]]
         except Exception as e:
             Logger.warning("%s %s", e, artist)
             Logger.warning(
                 "DownloaderArt::_get_deezer_artist_artwork_uri(): %s", data)
-        return []
+        return None
 
     def _get_fanarttv_artist_artwork_uri(self, artist, cancellable=None):
         """
             Get artist artwork using FanartTV
             @param artist as str
             @param cancellable as Gio.Cancellable
-            @return uri as str
+            @return [str]/None if provider failed
             @thread safe
         """
         if not get_network_available("FANARTTV"):
-            return []
-        uris = []
+            return None
         try:
             mbid = self.__get_musicbrainz_mbid("artist", artist, cancellable)
             if mbid is None:
+                return None
+            elif not mbid:
                 return []
             uri = "http://webservice.fanart.tv/v3/music/%s?api_key=%s"
             (status, data) = App().task_helper.load_uri_content_sync(
                 uri % (mbid, FANARTTV_ID), cancellable)
             if status:
                 decode = json.loads(data.decode("utf-8"))
-                for item in decode["artistbackground"]:
-                    uris.append(item["url"])
+                return [item["url"]
+                        for item in decode.get("artistbackground", [])]
         except Exception as e:
             Logger.warning("%s %s", e, artist)
             Logger.warning(
                 "DownloaderArt::_get_fanarttv_artist_artwork_uri: %s", data)
-        return uris
+        return None
 
     def _get_spotify_artist_artwork_uri(self, artist, cancellable=None):
         """
             Get artist artwork using Spotify
             @param artist as str
             @param cancellable as Gio.Cancellable
-            @return uri as str
+            @return [str]/None if provider failed
             @tread safe
         """
         if not get_network_available("SPOTIFY"):
-            return []
+            return None
         try:
             artist_formated = GLib.uri_escape_string(
                 artist, None, True).replace(" ", "+")
@@ -249,18 +249,17 @@ class DownloaderArt:
              data) = App().task_helper.load_uri_content_sync_with_headers(
                     uri, headers, cancellable)
             if status:
-                uri = None
                 decode = json.loads(data.decode("utf-8"))
                 for item in decode["artists"]["items"]:
                     if noaccents(item["name"].lower()) ==\
                             noaccents(artist.lower()):
-                        uri = item["images"][0]["url"]
-                        return [uri]
+                        return [image["url"] for image in item["images"][:1]]
+                return []
         except Exception as e:
             Logger.warning("%s %s", e, artist)
             Logger.warning(
                 "DownloaderArt::_get_spotify_artist_artwork_uri(): %s", data)
-        return []
+        return None
 
     def _get_deezer_album_artwork_uri(self, artist, album, cancellable=None):
         """
@@ -268,11 +267,11 @@ class DownloaderArt:
             @param artist as str
             @param album as str
             @param cancellable as Gio.Cancellable
-            @return uri as str
+            @return [str]/None if provider failed
             @tread safe
         """
         if not get_network_available("DEEZER"):
-            return []
+            return None
         try:
             album_formated = GLib.uri_escape_string(album, None, True)
             uri = "https://api.deezer.com/search/album/?" +\
@@ -281,17 +280,16 @@ class DownloaderArt:
                 uri, cancellable)
             if status:
                 decode = json.loads(data.decode("utf-8"))
-                uri = None
                 for item in decode["data"]:
                     if noaccents(item["artist"]["name"].lower()) ==\
                             noaccents(artist.lower()):
-                        uri = item["cover_xl"]
-                        return [uri]
+                        return [item["cover_xl"]]
+                return []
         except Exception as e:
             Logger.warning("%s %s %s", e, artist, album)
             Logger.warning("DownloaderArt::__get_deezer_album_artwork_uri: %s",
                            data)
-        return []
+        return None
 
     def _get_fanarttv_album_artwork_uri(self, artist, album, cancellable=None):
         """
@@ -299,29 +297,31 @@ class DownloaderArt:
             @param artist as str
             @param album as str
             @param cancellable as Gio.Cancellable
-            @return uri as str
+            @return [str]/None if provider failed
             @thread safe
         """
         if not get_network_available("FANARTTV"):
-            return []
-        uris = []
+            return None
         try:
             search = "%s %s" % (artist, album)
             mbid = self.__get_musicbrainz_mbid("album", search, cancellable)
             if mbid is None:
+                return None
+            elif not mbid:
                 return []
             uri = "http://webservice.fanart.tv/v3/music/albums/%s?api_key=%s"
             (status, data) = App().task_helper.load_uri_content_sync(
                 uri % (mbid, FANARTTV_ID), cancellable)
             if status:
                 decode = json.loads(data.decode("utf-8"))
-                for cover in decode["albums"][mbid]["albumcover"]:
-                    uris.append(cover["url"])
+                covers = decode.get("albums", {}).get(mbid, {})
+                return [cover["url"]
+                        for cover in covers.get("albumcover", [])]
         except Exception as e:
             Logger.warning("%s %s %s", e, artist, album)
             Logger.warning(
                 "DownloaderArt::_get_fanarttv_album_artwork_uri: %s", data)
-        return uris
+        return None
 
     def _get_spotify_album_artwork_uri(self, artist, album, cancellable=None):
         """
@@ -329,11 +329,11 @@ class DownloaderArt:
             @param artist as str
             @param album as str
             @param cancellable as Gio.Cancellable
-            @return uri as str
+            @return [str]/None if provider failed
             @tread safe
         """
         if not get_network_available("SPOTIFY"):
-            return []
+            return None
         artists_spotify_ids = []
         try:
             artist_formated = GLib.uri_escape_string(
@@ -347,10 +347,11 @@ class DownloaderArt:
             (status,
              data) = App().task_helper.load_uri_content_sync_with_headers(
                     uri, headers, cancellable)
-            if status:
-                decode = json.loads(data.decode("utf-8"))
-                for item in decode["artists"]["items"]:
-                    artists_spotify_ids.append(item["id"])
+            if not status:
+                return None
+            decode = json.loads(data.decode("utf-8"))
+            for item in decode["artists"]["items"]:
+                artists_spotify_ids.append(item["id"])
 
             for artist_spotify_id in artists_spotify_ids:
                 uri = "https://api.spotify.com/v1/artists/" +\
@@ -358,18 +359,19 @@ class DownloaderArt:
                 (status,
                  data) = App().task_helper.load_uri_content_sync_with_headers(
                     uri, headers, cancellable)
-                if status:
-                    decode = json.loads(data.decode("utf-8"))
-                    uri = None
-                    for item in decode["items"]:
-                        if noaccents(item["name"].lower()) ==\
-                                noaccents(album.lower()):
-                            return [item["images"][0]["url"]]
+                if not status:
+                    return None
+                decode = json.loads(data.decode("utf-8"))
+                for item in decode["items"]:
+                    if noaccents(item["name"].lower()) ==\
+                            noaccents(album.lower()):
+                        return [image["url"] for image in item["images"][:1]]
+            return []
         except Exception as e:
             Logger.warning("%s %s %s", e, artist, album)
             Logger.warning(
                 "DownloaderArt::_get_album_art_spotify_uri: %s", data)
-        return []
+        return None
 
     def _get_itunes_album_artwork_uri(self, artist, album, cancellable=None):
         """
@@ -377,11 +379,11 @@ class DownloaderArt:
             @param artist as str
             @param album as str
             @param cancellable as Gio.Cancellable
-            @return uri as str
+            @return [str]/None if provider failed
             @tread safe
         """
         if not get_network_available("ITUNES"):
-            return []
+            return None
         try:
             album_formated = GLib.uri_escape_string(
                 album, None, True).replace(" ", "+")
@@ -397,11 +399,12 @@ class DownloaderArt:
                         uri = item["artworkUrl60"].replace("60x60",
                                                            "1024x1024")
                         return [uri]
+                return []
         except Exception as e:
             Logger.warning("%s %s %s", e, artist, album)
             Logger.warning(
                 "DownloaderArt::_get_album_art_itunes_uri: %s", data)
-        return []
+        return None
 
     def _get_audiodb_album_artwork_uri(self, artist, album, cancellable=None):
         """
@@ -409,11 +412,11 @@ class DownloaderArt:
             @param artist as str
             @param album as str
             @param cancellable as Gio.Cancellable
-            @return uri as str
+            @return [str]/None if provider failed
             @thread safe
         """
         if not get_network_available("AUDIODB"):
-            return []
+            return None
         try:
             album = GLib.uri_escape_string(album, None, True)
             artist = GLib.uri_escape_string(artist, None, True)
@@ -425,15 +428,15 @@ class DownloaderArt:
                 uri, cancellable)
             if status:
                 decode = json.loads(data.decode("utf-8"))
-                if decode["album"]:
-                    for item in decode["album"]:
-                        uri = item["strAlbumThumb"]
-                        return [uri]
+                for item in decode["album"] or []:
+                    uri = item["strAlbumThumb"]
+                    return [uri] if uri else []
+                return []
         except Exception as e:
             Logger.warning("%s %s %s", e, artist, album)
             Logger.warning(
                 "DownloaderArt::_get_audiodb_album_artwork_uri: %s", data)
-        return []
+        return None
 
     def _get_lastfm_album_artwork_uri(self, artist, album, cancellable=None):
         """
@@ -441,22 +444,24 @@ class DownloaderArt:
             @param artist as str
             @param album as str
             @param cancellable as Gio.Cancellable
-            @return [str]
+            @return [str]/None if provider failed
             @tread safe
         """
         if not get_network_available("LASTFM"):
-            return []
+            return None
         try:
             from lollypop.helper_web_lastfm import LastFMWebHelper
             helper = LastFMWebHelper()
             payload = helper.get_album_payload(album, artist, cancellable)
+            if payload is None:
+                return None
             artwork_uri = payload["image"][-1]["#text"]
-            return [artwork_uri]
+            return [artwork_uri] if artwork_uri else []
         except Exception as e:
             Logger.warning("%s %s %s", e, artist, album)
             Logger.warning(
                 "DownloaderArt::_get_album_art_lastfm_uri: %s", payload)
-        return []
+        return None
 
 #######################
 # PRIVATE             #
@@ -467,6 +472,7 @@ class DownloaderArt:
             @param mbid_type as str ("artist" or "album")
             @param string as str
             @param cancellable as Gio.Cancellable
+            @return str/None if provider failed, empty if not found
         """
         try:
             if mbid_type == "artist":
@@ -484,8 +490,9 @@ class DownloaderArt:
                 if mbid_type == "artist":
                     for item in decode["artists"]:
                         return item["id"]
+                    return ""
                 else:
-                    mbid = None
+                    mbid = ""
                     # Get album id or EP id if missing
                     for item in decode["release-groups"]:
                         if item["primary-type"] == "Album":
@@ -501,72 +508,57 @@ class DownloaderArt:
 
     def __cache_artists_artwork(self):
         """
-            Cache artwork for all artists
+            Cache artwork for last queued artist
+            One job is submitted for each queued artist
+            @thread safe
         """
-        self.__in_artists_download = True
         try:
-            while self.__artists_queue:
-                artist = self.__artists_queue.pop()
-                found = False
-                for api in self.__artist_methods.keys():
-                    result = self.__artist_methods[api](artist)
-                    for uri in result:
-                        (status,
-                         data) = App().task_helper.load_uri_content_sync(
-                            uri, None)
-                        if status:
-                            found = True
-                            App().art.add_artist_artwork(
-                                artist, data, StorageType.COLLECTION)
-                            break
-                    # Found, do not search in another helper
-                    if found:
-                        break
+            if not self.__artists_queue:
+                return
+            artist = self.__artists_queue.pop()
+            result = self.__fetcher.fetch("artist", self.__artist_methods,
+                                          artist)
+            if result is None:
                 # Not found, save empty artwork
-                if not found:
-                    App().art.add_artist_artwork(artist, None,
-                                                 StorageType.COLLECTION)
+                App().art.add_artist_artwork(artist, None,
+                                             StorageType.COLLECTION)
+            else:
+                (api, data) = result
+                Logger.debug("Artwork found with %s: %s", api, artist)
+                App().art.add_artist_artwork(artist, data,
+                                             StorageType.COLLECTION)
         except Exception as e:
             Logger.error("DownloaderArt::__cache_artists_artwork(): %s" % e)
-        self.__in_artists_download = False
 
     def __cache_albums_artwork(self):
         """
-            Cache albums artwork (from queue)
+            Cache artwork for last queued album
+            One job is submitted for each queued album
             @thread safe
         """
-        self.__in_albums_download = True
         try:
-            while self.__albums_queue:
-                album_id = self.__albums_queue.pop()
-                album = App().albums.get_name(album_id)
-                artist_ids = App().albums.get_artist_ids(album_id)
-                is_compilation = artist_ids and\
-                    artist_ids[0] == Type.COMPILATIONS
-                if is_compilation:
-                    artist = ""
-                else:
-                    artist = ", ".join(App().albums.get_artists(album_id))
-                found = False
-                for api in self.__album_methods.keys():
-                    result = self.__album_methods[api](artist, album)
-                    for uri in result:
-                        (status,
-                         data) = App().task_helper.load_uri_content_sync(uri,
-                                                                         None)
-                        if status:
-                            found = True
-                            App().art.save_album_artwork(Album(album_id), data)
-                            break
-                    # Found, do not search in another helper
-                    if found:
-                        break
+            if not self.__albums_queue:
+                return
+            album_id = self.__albums_queue.pop()
+            album = App().albums.get_name(album_id)
+            artist_ids = App().albums.get_artist_ids(album_id)
+            is_compilation = artist_ids and\
+                artist_ids[0] == Type.COMPILATIONS
+            if is_compilation:
+                artist = ""
+            else:
+                artist = ", ".join(App().albums.get_artists(album_id))
+            result = self.__fetcher.fetch("album", self.__album_methods,
+                                          artist, album)
+            if result is None:
                 # Not found, save empty artwork
-                if not found:
-                    App().art.save_album_artwork(Album(album_id), None)
+                App().art.save_album_artwork(Album(album_id), None)
+            else:
+                (api, data) = result
+                Logger.debug("Artwork found with %s: %s", api, album)
+                App().art.save_album_artwork(Album(album_id), data)
         except Exception as e:
             Logger.error("DownloaderArt::__cache_albums_artwork: %s" % e)
-        self.__in_albums_download = False
 
     def __on_load_google_content(self, uri, loaded, content):
         """
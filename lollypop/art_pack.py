@@ -0,0 +1,304 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from mmap import mmap, ACCESS_READ
+from os import makedirs, path as os_path, remove, replace, scandir
+from struct import Struct
+from threading import Lock
+
+from lollypop.logger import Logger
+
+
+class ArtPack:
+    """
+        Append only pack files storing small artwork
+        Records are read through mmap using an in memory offset index
+        Record: header (magic, flags, key length, data length), key, data
+    """
+
+    __HEADER = Struct("<4sBHI")
+    __MAGIC = b"LPK1"
+    __FLAG_DATA = 0
+    __FLAG_DELETED = 1
+    # Start a new pack file when current one is bigger than this
+    __MAX_PACK_SIZE = 64 * 1024 * 1024
+
+    def __init__(self, path):
+        """
+            Init pack store
+            @param path as str
+        """
+        self.__path = path
+        self.__lock = Lock()
+        # key: (pack_id, data offset, data length)
+        self.__index = {}
+        # pack_id: (mmap, mapped size)
+        self.__maps = {}
+        self.__current_id = 0
+        self.__dead = 0
+        self.__live = 0
+        try:
+            makedirs(path, exist_ok=True)
+            self.__load_index()
+        except Exception as e:
+            Logger.error("ArtPack::__init__(): %s", e)
+
+    def get(self, key):
+        """
+            Get data for key
+            @param key as str
+            @return bytes/None
+        """
+        location = self.__index.get(key)
+        if location is None:
+            return None
+        (pack_id, offset, length) = location
+        try:
+            with self.__lock:
+                pack = self.__get_map(pack_id, offset + length)
+                return pack[offset:offset + length]
+        except Exception as e:
+            Logger.warning("ArtPack::get(): %s", e)
+        return None
+
+    def add(self, key, data):
+        """
+            Add data for key, replacing previous data
+            @param key as str
+            @param data as bytes
+        """
+        try:
+            with self.__lock:
+                if key in self.__index.keys():
+                    self.__dead += self.__index[key][2]
+                    self.__live -= self.__index[key][2]
+                (pack_id, offset) = self.__append(key,
+                                                  self.__FLAG_DATA, data)
+                self.__index[key] = (pack_id, offset, len(data))
+                self.__live += len(data)
+        except Exception as e:
+            Logger.error("ArtPack::add(): %s", e)
+
+    def remove(self, key):
+        """
+            Remove key from pack
+            @param key as str
+        """
+        try:
+            with self.__lock:
+                self.__remove(key)
+        except Exception as e:
+            Logger.error("ArtPack::remove(): %s", e)
+
+    def remove_prefix(self, prefix):
+        """
+            Remove all keys starting with prefix
+            @param prefix as str
+        """
+        try:
+            with self.__lock:
+                for key in [k for k in self.__index.keys()
+                            if k.startswith(prefix)]:
+                    self.__remove(key)
+        except Exception as e:
+            Logger.error("ArtPack::remove_prefix(): %s", e)
+
+    def exists(self, key):
+        """
+            True if key exists in pack
+            @param key as str
+            @return bool
+        """
+        return key in self.__index.keys()
+
+    def clear(self):
+        """
+            Remove all packs
+        """
+        try:
+            with self.__lock:
+                self.__close_maps()
+                for pack_id in self.__get_pack_ids():
+                    remove(self.__get_pack_path(pack_id))
+                self.__index = {}
+                self.__current_id = 0
+                self.__dead = 0
+                self.__live = 0
+        except Exception as e:
+            Logger.error("ArtPack::clear(): %s", e)
+
+    def compact(self, ratio=0.5):
+        """
+            Rewrite live records in new packs if dead data ratio is
+            more than ratio
+            @param ratio as float
+        """
+        try:
+            with self.__lock:
+                total = self.__dead + self.__live
+                if total == 0 or self.__dead / total < ratio:
+                    return
+                Logger.info("ArtPack::compact(): %s bytes reclaimed",
+                            self.__dead)
+                old_ids = self.__get_pack_ids()
+                entries = []
+                for key in self.__index.keys():
+                    (pack_id, offset, length) = self.__index[key]
+                    pack = self.__get_map(pack_id, offset + length)
+                    entries.append((key, pack[offset:offset + length]))
+                self.__close_maps()
+                # Write after old packs so a crash keeps the store usable
+                new_id = max(old_ids) + 1 if old_ids else 0
+                self.__current_id = new_id
+                index = {}
+                for (key, data) in entries:
+                    (pack_id, offset) = self.__append(key,
+                                                      self.__FLAG_DATA,
+                                                      data)
+                    index[key] = (pack_id, offset, len(data))
+                for pack_id in old_ids:
+                    remove(self.__get_pack_path(pack_id))
+                # Renumber new packs from 0
+                self.__index = {}
+                for pack_id in range(new_id, self.__current_id + 1):
+                    if os_path.exists(self.__get_pack_path(pack_id)):
+                        replace(self.__get_pack_path(pack_id),
+                                self.__get_pack_path(pack_id - new_id))
+                for key in index.keys():
+                    (pack_id, offset, length) = index[key]
+                    self.__index[key] = (pack_id - new_id, offset, length)
+                self.__current_id -= new_id
+                self.__dead = 0
+        except Exception as e:
+            Logger.error("ArtPack::compact(): %s", e)
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_pack_path(self, pack_id):
+        """
+            Get path for pack id
+            @param pack_id as int
+            @return str
+        """
+        return "%s/%06d.pack" % (self.__path, pack_id)
+
+    def __get_pack_ids(self):
+        """
+            Get available pack ids
+            @return [int]
+        """
+        pack_ids = []
+        with scandir(self.__path) as it:
+            for entry in it:
+                if entry.name.endswith(".pack"):
+                    try:
+                        pack_ids.append(int(entry.name[:-5]))
+                    except ValueError:
+                        pass
+        return sorted(pack_ids)
+
+    def __load_index(self):
+        """
+            Rebuild index from record headers
+        """
+        header_size = self.__HEADER.size
+        for pack_id in self.__get_pack_ids():
+            self.__current_id = pack_id
+            pack_path = self.__get_pack_path(pack_id)
+            pack_size = os_path.getsize(pack_path)
+            with open(pack_path, "rb+") as f:
+                offset = 0
+                while True:
+                    header = f.read(header_size)
+                    if len(header) < header_size:
+                        break
+                    (magic, flags, key_len, data_len) =\
+                        self.__HEADER.unpack(header)
+                    key = f.read(key_len)
+                    if magic != self.__MAGIC or len(key) < key_len:
+                        break
+                    key = key.decode("utf-8")
+                    data_offset = offset + header_size + key_len
+                    if data_offset + data_len > pack_size:
+                        break
+                    previous = self.__index.pop(key, None)
+                    if previous is not None:
+                        self.__dead += previous[2]
+                        self.__live -= previous[2]
+                    if flags == self.__FLAG_DATA:
+                        self.__index[key] = (pack_id, data_offset, data_len)
+                        self.__live += data_len
+                    else:
+                        self.__dead += header_size + key_len
+                    offset = data_offset + data_len
+                    f.seek(offset)
+                # Drop a partially written record
+                f.truncate(offset)
+
+    def __append(self, key, flags, data):
+        """
+            Append a record to current pack
+            @param key as str
+            @param flags as int
+            @param data as bytes
+            @return (pack_id as int, data offset as int)
+        """
+        pack_path = self.__get_pack_path(self.__current_id)
+        if os_path.exists(pack_path) and\
+                os_path.getsize(pack_path) > self.__MAX_PACK_SIZE:
+            self.__current_id += 1
+            pack_path = self.__get_pack_path(self.__current_id)
+        encoded = key.encode("utf-8")
+        with open(pack_path, "ab") as f:
+            offset = f.tell()
+            f.write(self.__HEADER.pack(self.__MAGIC, flags,
+                                       len(encoded), len(data)))
+            f.write(encoded)
+            f.write(data)
+        return (self.__current_id,
+                offset + self.__HEADER.size + len(encoded))
+
+    def __remove(self, key):
+        """
+            Write a tombstone for key
+            @param key as str
+        """
+        location = self.__index.pop(key, None)
+        if location is not None:
+            self.__dead += location[2]
+            self.__live -= location[2]
+            self.__append(key, self.__FLAG_DELETED, b"")
+
+    def __get_map(self, pack_id, needed):
+        """
+            Get mmap for pack, remap if pack grew
+            @param pack_id as int
+            @param needed as int
+            @return mmap
+        """
+        (pack, size) = self.__maps.get(pack_id, (None, 0))
+        if pack is None or size < needed:
+            if pack is not None:
+                pack.close()
+            with open(self.__get_pack_path(pack_id), "rb") as f:
+                pack = mmap(f.fileno(), 0, access=ACCESS_READ)
+            self.__maps[pack_id] = (pack, len(pack))
+        return pack
+
+    def __close_maps(self):
+        """
+            Close all mmaps
+        """
+        for (pack, size) in self.__maps.values():
+            pack.close()
+        self.__maps = {}
@@ -34,6 +34,7 @@ from lollypop.sqlcursor import SqlCursor
 from lollypop.tagreader import TagReader, Discoverer
 from lollypop.logger import Logger
 from lollypop.database_history import History
+from lollypop.similars_local import LocalSimilars
 from lollypop.objects_track import Track
 from lollypop.utils_file import is_audio, is_pls, get_mtime, get_file_type
 from lollypop.utils_album import tracks_to_albums
@@ -69,6 +70,7 @@ class CollectionScanner(GObject.GObject, TagReader):
         self.__tags = {}
         self.__items = []
         self.__pending_new_artist_ids = []
+        self.__changed_album_ids = set()
         self.__history = History()
         self.__progress_total = 1
         self.__progress_count = 0
@@ -266,6 +268,7 @@ class CollectionScanner(GObject.GObject, TagReader):
             track_id = App().tracks.get_id_by_uri(uri)
             duration = App().tracks.get_duration(track_id)
             album_id = App().tracks.get_album_id(track_id)
+            self.__changed_album_ids.add(album_id)
             album_artist_ids = App().albums.get_artist_ids(album_id)
             artist_ids = App().tracks.get_artist_ids(track_id)
             track_pop = App().tracks.get_popularity(track_id)
@@ -411,6 +414,7 @@ class CollectionScanner(GObject.GObject, TagReader):
         App().albums.update_max_count()
         # Update featuring
         App().artists.update_featuring()
+        App().task_helper.run(LocalSimilars().update, track_ids)
         if App().ws_director.collection_ws is not None:
             App().ws_director.collection_ws.start()
 
@@ -498,7 +502,7 @@ class CollectionScanner(GObject.GObject, TagReader):
         """
         try:
             SqlCursor.add(App().db)
-            App().art.clean_rounded()
+            self.__changed_album_ids = set()
             (files, dirs, streams) = self.__get_objects_for_uris(
                 scan_type, uris)
             if not files:
@@ -549,6 +553,7 @@ class CollectionScanner(GObject.GObject, TagReader):
             self.__items += self.__save_streams_in_db(streams, storage_type)
 
             self.__remove_old_tracks(db_uris, scan_type)
+            self.__clean_collages(self.__items)
 
             if scan_type == ScanType.EXTERNAL:
                 albums = tracks_to_albums(
@@ -564,6 +569,45 @@ class CollectionScanner(GObject.GObject, TagReader):
             Logger.warning("CollectionScanner::__scan(): %s", e)
         SqlCursor.remove(App().db)
 
+    def __clean_collages(self, items):
+        """
+            Invalidate collages using changed albums
+            Widgets will lazily rebuild them
+            @param items as [CollectionItem]
+        """
+        try:
+            album_ids = self.__changed_album_ids
+            for item in items:
+                if item.album_id is not None:
+                    album_ids.add(item.album_id)
+            if not album_ids:
+                return
+            App().art.clean_rounded(album_ids)
+            # Collages not full (less than 9 covers) may use new albums
+            names = set()
+            years = None
+            for item in items:
+                if not item.new_album:
+                    continue
+                for genre_id in item.genre_ids:
+                    names.add("genre_%s" % App().genres.get_name(genre_id))
+                year = App().albums.get_year(item.album_id)
+                if year is None:
+                    continue
+                # Same name as AlbumsDecadeWidget: first and last years
+                if years is None:
+                    years = App().albums.get_years(StorageType.COLLECTION)[0]
+                decade = sorted(y for y in years if y // 10 == year // 10)
+                if decade:
+                    names.add("decade_%s - %s" % (decade[0], decade[-1]))
+            for name in names:
+                count = App().cache.get_collage_album_count(name)
+                if count is not None and count < 9:
+                    App().art.uncache_collage(name)
+            self.__changed_album_ids = set()
+        except Exception as e:
+            Logger.error("CollectionScanner::__clean_collages(): %s", e)
+
     def __scan_to_handle(self, uri):
         """
             Check if file has to be handle by scanner
@@ -109,7 +109,11 @@ class Database:
                                               storage_type INT NOT NULL,
                                               mb_track_id TEXT,
                                               lp_track_id TEXT,
-                                              bpm DOUBLE
+                                              bpm DOUBLE,
+                                              rg_track_gain DOUBLE,
+                                              rg_track_peak DOUBLE,
+                                              rg_album_gain DOUBLE,
+                                              rg_album_peak DOUBLE
                                               )"""
     __create_track_artists = """CREATE TABLE track_artists (
                                                 track_id INT NOT NULL,
@@ -117,6 +121,10 @@ class Database:
     __create_track_genres = """CREATE TABLE track_genres (
                                                 track_id INT NOT NULL,
                                                 genre_id INT NOT NULL)"""
+    __create_artist_similars = """CREATE TABLE artist_similars (
+                                                artist_id INT NOT NULL,
+                                                similar_id INT NOT NULL,
+                                                score DOUBLE NOT NULL)"""
     __create_album_artists_idx = """CREATE index idx_aa ON album_artists(
                                                 album_id)"""
     __create_track_artists_idx = """CREATE index idx_ta ON track_artists(
@@ -125,6 +133,8 @@ class Database:
                                                 album_id)"""
     __create_track_genres_idx = """CREATE index idx_tg ON track_genres(
                                                 track_id)"""
+    __create_artist_similars_idx = """CREATE index idx_as ON artist_similars(
+                                                artist_id)"""
 
     def __init__(self):
         """
@@ -154,6 +164,8 @@ class Database:
                     sql.execute(self.__create_track_artists_idx)
                     sql.execute(self.__create_album_genres_idx)
                     sql.execute(self.__create_track_genres_idx)
+                    sql.execute(self.__create_artist_similars)
+                    sql.execute(self.__create_artist_similars_idx)
                     sql.execute("PRAGMA user_version=%s" % upgrade.version)
             except Exception as e:
                 Logger.error("Database::__init__(): %s" % e)
@@ -959,6 +959,67 @@ class AlbumsDatabase:
             result = sql.execute(request, filters)
             return list(itertools.chain(*result))
 
+    def get_track_ids(self, album_id, genre_ids, artist_ids,
+                      storage_type, skipped):
+        """
+            Get tracks ids for album id
+
+            @param album_id as int
+            @param genre_ids as [int]
+            @param artist_ids as [int]
+            @param storage_type as StorageType
+            @param skipped as bool
+            @return [int]
+        """
+        genre_ids = remove_static(genre_ids)
+        artist_ids = remove_static(artist_ids)
+        with SqlCursor(self.__db) as sql:
+            filters = (album_id, storage_type)
+            request = "SELECT DISTINCT tracks.rowid\
+                       FROM tracks"
+            if genre_ids:
+                request += ", track_genres"
+                filters += tuple(genre_ids)
+            if artist_ids:
+                request += ", track_artists"
+                filters += tuple(artist_ids)
+            request += " WHERE album_id=? AND storage_type&?"
+            if genre_ids:
+                request += " AND track_genres.track_id = tracks.rowid AND"
+                request += make_subrequest("track_genres.genre_id=?",
+                                           "OR",
+                                           len(genre_ids))
+            if artist_ids:
+                request += " AND track_artists.track_id=tracks.rowid AND"
+                request += make_subrequest("track_artists.artist_id=?",
+                                           "OR",
+                                           len(artist_ids))
+            if not skipped:
+                request += " AND tracks.loved != -1"
+            request += " ORDER BY discnumber, tracknumber, tracks.name"
+            result = sql.execute(request, filters)
+            return list(itertools.chain(*result))
+
+    def get_track_ids_for_ids(self, album_ids, skipped):
+        """
+            Get tracks ids for album ids
+            @param album_ids as [int]
+            @param skipped as bool
+            @return [int]
+        """
+        track_ids = []
+        with SqlCursor(self.__db) as sql:
+            # Stay below SQLite variables limit
+            for i in range(0, len(album_ids), 500):
+                chunk = album_ids[i:i + 500]
+                request = "SELECT rowid FROM tracks WHERE album_id IN (%s)" %\
+                    ",".join("?" * len(chunk))
+                if not skipped:
+                    request += " AND loved != -1"
+                result = sql.execute(request, tuple(chunk))
+                track_ids += list(itertools.chain(*result))
+        return track_ids
+
     def get_tracks_count(self, album_id, genre_ids, artist_ids):
         """
             Get tracks ids for album
@@ -325,6 +325,133 @@ class ArtistsDatabase:
                 sql.execute("INSERT INTO featuring (artist_id, album_id)\
                              VALUES (?, ?)", (artist_id, album_id))
 
+    def get_genre_links(self, storage_type):
+        """
+            Get genres of album artists
+            @param storage_type as StorageType
+            @return [(int, int)] as artist id, genre id
+        """
+        with SqlCursor(self.__db) as sql:
+            result = sql.execute("SELECT DISTINCT album_artists.artist_id,\
+                                  album_genres.genre_id\
+                                  FROM album_artists, album_genres, albums\
+                                  WHERE album_artists.album_id=albums.rowid\
+                                  AND album_genres.album_id=albums.rowid\
+                                  AND albums.storage_type & ?",
+                                 (storage_type,))
+            return list(result)
+
+    def get_featuring_links(self, storage_type):
+        """
+            Get featured artists with album artists
+            @param storage_type as StorageType
+            @return [(int, int)] as featured artist id, album artist id
+        """
+        with SqlCursor(self.__db) as sql:
+            result = sql.execute("SELECT featuring.artist_id,\
+                                  album_artists.artist_id\
+                                  FROM featuring, album_artists, albums\
+                                  WHERE featuring.album_id=albums.rowid\
+                                  AND album_artists.album_id=albums.rowid\
+                                  AND albums.storage_type & ?",
+                                 (storage_type,))
+            return list(result)
+
+    def get_listening_links(self, storage_type):
+        """
+            Get artists of listened tracks, ordered by listening time
+            @param storage_type as StorageType
+            @return [(int, int)] as listening time, artist id
+        """
+        with SqlCursor(self.__db) as sql:
+            result = sql.execute("SELECT tracks.ltime, track_artists.artist_id\
+                                  FROM tracks, track_artists\
+                                  WHERE track_artists.track_id=tracks.rowid\
+                                  AND tracks.ltime > 0\
+                                  AND tracks.storage_type & ?\
+                                  ORDER BY tracks.ltime",
+                                 (storage_type,))
+            return list(result)
+
+    def get_uri_links(self, storage_type):
+        """
+            Get artists of tracks by uri
+            @param storage_type as StorageType
+            @return [(str, int)] as uri, artist id
+        """
+        with SqlCursor(self.__db) as sql:
+            result = sql.execute("SELECT tracks.uri, track_artists.artist_id\
+                                  FROM tracks, track_artists\
+                                  WHERE track_artists.track_id=tracks.rowid\
+                                  AND tracks.storage_type & ?",
+                                 (storage_type,))
+            return list(result)
+
+    def get_similar_ids(self, artist_ids, limit):
+        """
+            Get similar artists from local index
+            @param artist_ids as [int]
+            @param limit as int
+            @return [int]
+        """
+        with SqlCursor(self.__db) as sql:
+            filters = tuple(artist_ids) + tuple(artist_ids) + (limit,)
+            request = "SELECT similar_id FROM artist_similars WHERE "
+            request += make_subrequest("artist_id=?", "OR", len(artist_ids))
+            request += " AND similar_id NOT IN (%s)" %\
+                ",".join(["?"] * len(artist_ids))
+            request += " GROUP BY similar_id\
+                        ORDER BY SUM(score) DESC LIMIT ?"
+            result = sql.execute(request, filters)
+            return list(itertools.chain(*result))
+
+    def set_similars(self, artist_id, similars):
+        """
+            Set similar artists in local index
+            @param artist_id as int
+            @param similars as [(int, float)] as artist id, score
+            @warning: commit needed
+        """
+        with SqlCursor(self.__db) as sql:
+            sql.execute("DELETE FROM artist_similars WHERE artist_id=?",
+                        (artist_id,))
+            sql.executemany("INSERT INTO artist_similars\
+                             (artist_id, similar_id, score)\
+                             VALUES (?, ?, ?)",
+                            [(artist_id, similar_id, score)
+                             for (similar_id, score) in similars])
+
+    def add_similar(self, artist_id, similar_id, score, limit):
+        """
+            Add or update a similar artist, keep best ones
+            @param artist_id as int
+            @param similar_id as int
+            @param score as float
+            @param limit as int
+            @warning: commit needed
+        """
+        with SqlCursor(self.__db) as sql:
+            sql.execute("DELETE FROM artist_similars\
+                         WHERE artist_id=? AND similar_id=?",
+                        (artist_id, similar_id))
+            sql.execute("INSERT INTO artist_similars\
+                         (artist_id, similar_id, score) VALUES (?, ?, ?)",
+                        (artist_id, similar_id, score))
+            sql.execute("DELETE FROM artist_similars\
+                         WHERE artist_id=? AND rowid NOT IN (\
+                            SELECT rowid FROM artist_similars\
+                            WHERE artist_id=?\
+                            ORDER BY score DESC LIMIT ?)",
+                        (artist_id, artist_id, limit))
+
+    def clear_similars(self):
+        """
+            Clear local similarity index
+            @warning: commit needed
+        """
+        with SqlCursor(self.__db) as sql:
+            sql.execute("DELETE FROM artist_similars")
+
     def get_featured(self, genre_ids, artist_ids, storage_type, skipped):
         """
             Get albums where artist is in featuring
@@ -443,3 +570,8 @@ class ArtistsDatabase:
                             FROM album_artists) AND artists.rowid NOT IN (\
                                 SELECT track_artists.artist_id\
                                 FROM track_artists)")
+            sql.execute("DELETE FROM artist_similars WHERE artist_id NOT IN (\
+                            SELECT album_artists.artist_id\
+                            FROM album_artists) OR similar_id NOT IN (\
+                            SELECT album_artists.artist_id\
+                            FROM album_artists)")
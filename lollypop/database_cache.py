@@ -14,8 +14,9 @@ from gi.repository import Gio
 
 import sqlite3
 from threading import Lock
+from time import time
 
-from lollypop.define import CACHE_PATH
+from lollypop.define import CACHE_PATH, TimeStamp
 from lollypop.sqlcursor import SqlCursor
 from lollypop.database import Database
 from lollypop.logger import Logger
@@ -26,6 +27,9 @@ class CacheDatabase:
         Cache calculation into database
     """
     DB_PATH = "%s/cache_v1.db" % CACHE_PATH
+    # First negative lookup TTL, doubled on each failure
+    __NEGATIVE_TTL = 43200
+    __NEGATIVE_MAX_TTL = TimeStamp.ONE_YEAR // 4
 
     # SQLite documentation:
     # In SQLite, a column with type INTEGER PRIMARY KEY
@@ -36,6 +40,18 @@ class CacheDatabase:
                             id TEXT PRIMARY KEY,
                             album_id INT NOT NULL,
                             duration INT NOT NULL DEFAULT 0)"""
+    __create_collage = """CREATE TABLE IF NOT EXISTS collage (
+                            name TEXT NOT NULL,
+                            album_id INT NOT NULL)"""
+    __create_negative = """CREATE TABLE IF NOT EXISTS negative (
+                            provider TEXT NOT NULL,
+                            artist TEXT NOT NULL,
+                            album TEXT NOT NULL,
+                            failures INT NOT NULL DEFAULT 1,
+                            mtime INT NOT NULL,
+                            PRIMARY KEY (provider, artist, album))"""
+    __create_collage_idx = """CREATE INDEX IF NOT EXISTS idx_collage
+                                ON collage(album_id)"""
 
     def __init__(self):
         """
@@ -53,6 +69,13 @@ class CacheDatabase:
                     sql.execute(self.__create_duration)
             except Exception as e:
                 Logger.error("DatabaseCache::__init__(): %s" % e)
+        try:
+            with SqlCursor(self, True) as sql:
+                sql.execute(self.__create_collage)
+                sql.execute(self.__create_collage_idx)
+                sql.execute(self.__create_negative)
+        except Exception as e:
+            Logger.error("DatabaseCache::__init__(): %s" % e)
 
     def set_duration(self, album_id, album_hash, duration):
         """
@@ -97,6 +120,129 @@ class CacheDatabase:
             sql.execute("DELETE FROM duration WHERE album_id=?",
                         (album_id,))
 
+    def set_collage_album_ids(self, name, album_ids):
+        """
+            Set album ids used to build collage artwork
+            @param name as str
+            @param album_ids as [int]
+        """
+        try:
+            with SqlCursor(self, True) as sql:
+                sql.execute("DELETE FROM collage WHERE name=?", (name,))
+                sql.executemany("INSERT INTO collage (name, album_id)\
+                                 VALUES (?, ?)",
+                                [(name, album_id) for album_id in album_ids])
+        except Exception as e:
+            Logger.error("DatabaseCache::set_collage_album_ids(): %s", e)
+
+    def get_collage_names(self, album_ids):
+        """
+            Get collages using album ids
+            @param album_ids as [int]
+            @return [str]
+        """
+        names = set()
+        try:
+            album_ids = list(album_ids)
+            with SqlCursor(self) as sql:
+                # SQLite default max variables is 999
+                while album_ids:
+                    chunk = album_ids[:500]
+                    album_ids = album_ids[500:]
+                    request = "SELECT DISTINCT name FROM collage\
+                               WHERE album_id IN (%s)" %\
+                        ",".join(["?"] * len(chunk))
+                    result = sql.execute(request, chunk)
+                    names |= set(row[0] for row in result)
+        except Exception as e:
+            Logger.error("DatabaseCache::get_collage_names(): %s", e)
+        return list(names)
+
+    def get_collage_album_count(self, name):
+        """
+            Get album count used to build collage
+            @param name as str
+            @return int/None if collage is unknown
+        """
+        try:
+            with SqlCursor(self) as sql:
+                result = sql.execute("SELECT COUNT(*) FROM collage\
+                                      WHERE name=?", (name,))
+                v = result.fetchone()
+                if v is not None and v[0] > 0:
+                    return v[0]
+        except Exception as e:
+            Logger.error("DatabaseCache::get_collage_album_count(): %s", e)
+        return None
+
+    def clear_collage(self, name):
+        """
+            Clear album ids for collage
+            @param name as str
+        """
+        with SqlCursor(self, True) as sql:
+            sql.execute("DELETE FROM collage WHERE name=?", (name,))
+
+    def add_negative(self, provider, artist, album=""):
+        """
+            Remember provider found nothing for artist/album
+            Each new failure doubles time before next lookup
+            @param provider as str
+            @param artist as str
+            @param album as str
+        """
+        try:
+            with SqlCursor(self, True) as sql:
+                sql.execute("INSERT OR IGNORE INTO negative\
+                             (provider, artist, album, failures, mtime)\
+                             VALUES (?, ?, ?, 0, 0)",
+                            (provider, artist, album))
+                sql.execute("UPDATE negative\
+                             SET failures=failures + 1, mtime=?\
+                             WHERE provider=? AND artist=? AND album=?",
+                            (int(time()), provider, artist, album))
+        except Exception as e:
+            Logger.error("DatabaseCache::add_negative(): %s", e)
+
+    def is_negative(self, provider, artist, album=""):
+        """
+            True if provider found nothing for artist/album recently
+            @param provider as str
+            @param artist as str
+            @param album as str
+            @return bool
+        """
+        try:
+            with SqlCursor(self) as sql:
+                result = sql.execute("SELECT failures, mtime FROM negative\
+                                      WHERE provider=? AND artist=?\
+                                      AND album=?",
+                                     (provider, artist, album))
+                v = result.fetchone()
+                if v is not None:
+                    (failures, mtime) = v
+                    ttl = min(self.__NEGATIVE_TTL * 2 ** (failures - 1),
+                              self.__NEGATIVE_MAX_TTL)
+                    return time() - mtime < ttl
+        except Exception as e:
+            Logger.error("DatabaseCache::is_negative(): %s", e)
+        return False
+
+    def clear_negative(self, provider, artist, album=""):
+        """
+            Forget failures for provider and artist/album
+            @param provider as str
+            @param artist as str
+            @param album as str
+        """
+        try:
+            with SqlCursor(self, True) as sql:
+                sql.execute("DELETE FROM negative\
+                             WHERE provider=? AND artist=? AND album=?",
+                            (provider, artist, album))
+        except Exception as e:
+            Logger.error("DatabaseCache::clear_negative(): %s", e)
+
     def clear_table(self, table):
         """
             Clear table
@@ -603,6 +603,69 @@ class TracksDatabase:
             sql.execute("UPDATE tracks SET mtime=? WHERE rowid=?",
                         (mtime, track_id))
 
+    def get_ids_without_replay_gain(self):
+        """
+            Get collection tracks not analyzed, ordered by album
+            @return [int]
+        """
+        with SqlCursor(self.__db) as sql:
+            result = sql.execute("SELECT rowid FROM tracks\
+                                  WHERE rg_track_gain IS NULL\
+                                  AND storage_type & ?\
+                                  ORDER BY album_id, discnumber, tracknumber",
+                                 (StorageType.COLLECTION,))
+            return list(itertools.chain(*result))
+
+    def get_replay_gain(self, track_id):
+        """
+            Get analyzed gains for track
+            @param track_id as int
+            @return (float, float, float/None, float/None)/None as
+                    track gain, track peak, album gain, album peak
+        """
+        with SqlCursor(self.__db) as sql:
+            result = sql.execute("SELECT rg_track_gain, rg_track_peak,\
+                                  rg_album_gain, rg_album_peak\
+                                  FROM tracks WHERE rowid=?\
+                                  AND rg_track_gain IS NOT NULL",
+                                 (track_id,))
+            return result.fetchone()
+
+    def get_replay_gains_for_album(self, album_id):
+        """
+            Get analyzed gains for album tracks
+            @param album_id as int
+            @return [(int, int, float/None, float/None)] as
+                    track id, duration, track gain, track peak
+        """
+        with SqlCursor(self.__db) as sql:
+            result = sql.execute("SELECT rowid, duration, rg_track_gain,\
+                                  rg_track_peak FROM tracks\
+                                  WHERE album_id=?", (album_id,))
+            return list(result)
+
+    def set_replay_gain(self, track_id, gain, peak):
+        """
+            Set analyzed track gain
+            @param track_id as int
+            @param gain as float (dB)
+            @param peak as float
+        """
+        with SqlCursor(self.__db, True) as sql:
+            sql.execute("UPDATE tracks SET rg_track_gain=?, rg_track_peak=?\
+                         WHERE rowid=?", (gain, peak, track_id))
+
+    def set_album_replay_gain(self, album_id, gain, peak):
+        """
+            Set analyzed album gain for album tracks
+            @param album_id as int
+            @param gain as float (dB)
+            @param peak as float
+        """
+        with SqlCursor(self.__db, True) as sql:
+            sql.execute("UPDATE tracks SET rg_album_gain=?, rg_album_peak=?\
+                         WHERE album_id=?", (gain, peak, album_id))
+
     def is_empty(self):
         """
             Return True if no tracks in db
@@ -810,6 +873,31 @@ class TracksDatabase:
             result = sql.execute(request, filters)
             return list(itertools.chain(*result))
 
+    def get_randoms_for_artists(self, artist_ids, storage_type,
+                                skipped, limit):
+        """
+            Return random tracks for artists
+            @param artist_ids as [int]
+            @param storage_type as StorageType
+            @param skipped as bool
+            @param limit as int
+            @return track ids as [int]
+        """
+        with SqlCursor(self.__db) as sql:
+            filters = (storage_type,) + tuple(artist_ids) + (limit,)
+            request = "SELECT DISTINCT tracks.rowid\
+                       FROM tracks, track_artists\
+                       WHERE storage_type & ?\
+                       AND track_artists.track_id=tracks.rowid AND "
+            request += make_subrequest("track_artists.artist_id=?",
+                                       "OR",
+                                       len(artist_ids))
+            if not skipped:
+                request += " AND loved != -1"
+            request += " ORDER BY random() LIMIT ?"
+            result = sql.execute(request, filters)
+            return list(itertools.chain(*result))
+
     def set_popularity(self, track_id, popularity):
         """
             Set popularity
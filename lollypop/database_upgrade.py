@@ -173,7 +173,9 @@ class DatabaseAlbumsUpgrade(DatabaseUpgrade):
             44: self.__upgrade_44,
             45: self.__upgrade_45,
             46: self.__upgrade_46,
-            47: self.__upgrade_47
+            47: self.__upgrade_47,
+            48: self.__upgrade_48,
+            49: self.__upgrade_49
         }
 
 #######################
@@ -824,3 +826,24 @@ class DatabaseAlbumsUpgrade(DatabaseUpgrade):
         """
         from lollypop.art import clean_all_cache
         clean_all_cache()
+
+    def __upgrade_48(self, db):
+        """
+            Add ReplayGain analysis results
+        """
+        with SqlCursor(db, True) as sql:
+            sql.execute("ALTER TABLE tracks ADD rg_track_gain DOUBLE")
+            sql.execute("ALTER TABLE tracks ADD rg_track_peak DOUBLE")
+            sql.execute("ALTER TABLE tracks ADD rg_album_gain DOUBLE")
+            sql.execute("ALTER TABLE tracks ADD rg_album_peak DOUBLE")
+
+    def __upgrade_49(self, db):
+        """
+            Add local artists similarity index
+        """
+        with SqlCursor(db, True) as sql:
+            sql.execute("""CREATE TABLE artist_similars (
+                                            artist_id INT NOT NULL,
+                                            similar_id INT NOT NULL,
+                                            score DOUBLE NOT NULL)""")
+            sql.execute("CREATE index idx_as ON artist_similars(artist_id)")
@@ -34,6 +34,12 @@ MARGIN_SMALL = 5
 LOLLYPOP_DATA_PATH = GLib.get_user_data_dir() + "/lollypop"
 # All cache goes here
 CACHE_PATH = GLib.get_user_cache_dir() + "/lollypop"
+# Web services responses
+HTTP_CACHE_PATH = CACHE_PATH + "/http"
+AUDIO_CACHE_PATH = CACHE_PATH + "/audio"
+PREROLL_PATH = CACHE_PATH + "/preroll"
+# Small artwork packs
+PACK_PATH = CACHE_PATH + "/packs"
 # Stores for albums
 ALBUMS_PATH = LOLLYPOP_DATA_PATH + "/albums"
 ALBUMS_WEB_PATH = LOLLYPOP_DATA_PATH + "/albums_web"
@@ -49,6 +55,12 @@ class TimeStamp:
     THREE_YEAR = 94608000
 
 
+class HttpPriority:
+    INTERACTIVE = 0
+    PLAYBACK = 1
+    BACKGROUND = 2
+
+
 class FileType:
     UNKNOWN = 0
     AUDIO = 1
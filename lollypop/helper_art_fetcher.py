@@ -0,0 +1,181 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import Gio
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError
+from threading import Lock, Semaphore
+from urllib.parse import urlparse
+from time import time
+
+from lollypop.define import App
+from lollypop.utils import get_network_available
+from lollypop.logger import Logger
+
+
+class ArtFetcherHelper:
+    """
+        Query artwork providers in parallel, first valid image wins
+        Other providers are then cancelled
+    """
+
+    # Jobs (albums/artists) handled at once
+    __MAX_JOBS = 4
+    # Provider queries running at once, for all jobs
+    __MAX_QUERIES = 12
+    # Image downloads running at once on a same host
+    __MAX_PER_HOST = 2
+    # Seconds before giving up on a provider
+    __TIMEOUT = 20
+    __MAGICS = (b"\xff\xd8\xff", b"\x89PNG", b"GIF8", b"RIFF")
+
+    def __init__(self):
+        """
+            Init helper
+        """
+        self.__jobs = ThreadPoolExecutor(max_workers=self.__MAX_JOBS)
+        self.__queries = ThreadPoolExecutor(max_workers=self.__MAX_QUERIES)
+        self.__hosts = {}
+        self.__hosts_lock = Lock()
+
+    def submit(self, command, *args):
+        """
+            Run a job in background, at most __MAX_JOBS at once
+            @param command as function
+            @param *args as command arguments
+            @return concurrent.futures.Future
+        """
+        return self.__jobs.submit(self.__run, command, *args)
+
+    def fetch(self, namespace, methods, artist, *args):
+        """
+            Query methods in parallel and download first valid image
+            Providers recently failing for artist/album are skipped
+            @param namespace as str
+            @param methods as {str: function}
+            @param artist as str
+            @param *args as other methods arguments (album)
+            @return (api as str, data as bytes)/None
+            @thread safe
+        """
+        album = args[0] if args else ""
+        cancellables = []
+        futures = {}
+        for api in methods.keys():
+            # Network ACL names match API names
+            if not get_network_available(api.upper().replace(".", "")):
+                continue
+            provider = "%s:%s" % (namespace, api)
+            if App().cache.is_negative(provider, artist, album):
+                continue
+            cancellable = Gio.Cancellable()
+            cancellables.append(cancellable)
+            future = self.__queries.submit(self.__query, methods[api],
+                                           provider, cancellable,
+                                           artist, *args)
+            futures[future] = api
+        result = None
+        try:
+            for future in as_completed(futures.keys(),
+                                       timeout=self.__TIMEOUT):
+                data = future.result()
+                if data is not None:
+                    result = (futures[future], data)
+                    break
+        except TimeoutError:
+            pending = [futures[f] for f in futures.keys() if not f.done()]
+            Logger.info("ArtFetcherHelper::fetch(): timeout for %s -> %s",
+                        pending, (artist, album))
+        finally:
+            for cancellable in cancellables:
+                cancellable.cancel()
+        return result
+
+#######################
+# PRIVATE             #
+#######################
+    def __run(self, command, *args):
+        """
+            Run command, log errors
+            @param command as function
+            @param *args as command arguments
+        """
+        try:
+            command(*args)
+        except Exception as e:
+            Logger.error("ArtFetcherHelper::__run(): %s -> %s", e, command)
+
+    def __query(self, method, provider, cancellable, artist, *args):
+        """
+            Get uris from method and download first valid image
+            Remember provider answering without result for artist/album,
+            failures are retried next time
+            @param method as function
+            @param provider as str
+            @param cancellable as Gio.Cancellable
+            @param artist as str
+            @param *args as other method arguments
+            @return bytes/None
+        """
+        started = time()
+        album = args[0] if args else ""
+        try:
+            if cancellable.is_cancelled():
+                return None
+            uris = method(artist, *args, cancellable)
+            if uris is None or cancellable.is_cancelled():
+                return None
+            elif not uris:
+                App().cache.add_negative(provider, artist, album)
+                return None
+            for uri in uris:
+                if cancellable.is_cancelled() or\
+                        time() - started > self.__TIMEOUT:
+                    return None
+                data = self.__download(uri, cancellable)
+                if data is not None:
+                    App().cache.clear_negative(provider, artist, album)
+                    return data
+        except Exception as e:
+            Logger.warning("ArtFetcherHelper::__query(): %s", e)
+        return None
+
+    def __download(self, uri, cancellable):
+        """
+            Download image at uri
+            @param uri as str
+            @param cancellable as Gio.Cancellable
+            @return bytes/None
+        """
+        if not uri:
+            return None
+        with self.__get_host_semaphore(uri):
+            if cancellable.is_cancelled():
+                return None
+            (status, data) = App().task_helper.load_uri_content_sync(
+                uri, cancellable)
+        if status and data and bytes(data[:4]).startswith(self.__MAGICS):
+            return data
+        return None
+
+    def __get_host_semaphore(self, uri):
+        """
+            Get semaphore for uri host
+            @param uri as str
+            @return Semaphore
+        """
+        host = urlparse(uri).netloc
+        with self.__hosts_lock:
+            if host not in self.__hosts.keys():
+                self.__hosts[host] = Semaphore(self.__MAX_PER_HOST)
+            return self.__hosts[host]
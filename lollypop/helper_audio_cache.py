@@ -0,0 +1,199 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import Gio, GLib, Soup
+
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+from os import path, remove, replace, scandir
+from threading import Lock
+
+from lollypop.define import App, AUDIO_CACHE_PATH
+from lollypop.utils_file import create_dir
+from lollypop.logger import Logger
+
+
+class AudioCacheHelper:
+    """
+        Keep web tracks audio on disk, opt-in with "audio-cache-size"
+        Streams are downloaded once resolved, later plays are local
+        Disk usage is bounded by CacheQuotaHelper (LRU)
+    """
+
+    __MAX_DOWNLOADS = 2
+    __CHUNK_SIZE = 65536
+
+    def __init__(self):
+        """
+            Init helper
+        """
+        self.__lock = Lock()
+        self.__downloading = []
+        self.__executor = ThreadPoolExecutor(
+            max_workers=self.__MAX_DOWNLOADS)
+        self.__cancellable = Gio.Cancellable()
+        create_dir(AUDIO_CACHE_PATH)
+        App().settings.connect("changed::audio-cache-size",
+                               self.__on_size_changed)
+        App().task_helper.run(self.__remove_partials)
+
+    def get_uri(self, track):
+        """
+            Get local uri for track
+            @param track as Track
+            @return str/None
+        """
+        if not self.enabled:
+            return None
+        filepath = self.__get_path(track)
+        if filepath is None or not path.exists(filepath):
+            return None
+        App().cache_quota.touch(filepath)
+        return GLib.filename_to_uri(filepath)
+
+    def cache(self, track, stream_uri):
+        """
+            Download stream uri for track in background
+            @param track as Track
+            @param stream_uri as str
+        """
+        if not self.enabled or not stream_uri.startswith("http"):
+            return
+        filepath = self.__get_path(track)
+        if filepath is None or path.exists(filepath):
+            return
+        with self.__lock:
+            if filepath in self.__downloading:
+                return
+            self.__downloading.append(filepath)
+        self.__executor.submit(self.__download, stream_uri, filepath,
+                               self.__cancellable)
+
+    def remove(self, track):
+        """
+            Remove track from cache
+            @param track as Track
+        """
+        filepath = self.__get_path(track)
+        try:
+            if filepath is not None and path.exists(filepath):
+                remove(filepath)
+        except Exception as e:
+            Logger.warning("AudioCacheHelper::remove(): %s", e)
+
+    def stop(self):
+        """
+            Cancel downloads
+        """
+        self.__cancellable.cancel()
+        self.__cancellable = Gio.Cancellable()
+
+    @property
+    def enabled(self):
+        """
+            True if audio cache is enabled
+            @return bool
+        """
+        return App().settings.get_value("audio-cache-size").get_int32() > 0
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_path(self, track):
+        """
+            Get cache path for track, based on its web uri
+            @param track as Track
+            @return str/None
+        """
+        uri = App().tracks.get_uri(track.id)
+        if not uri:
+            return None
+        return "%s/%s" % (AUDIO_CACHE_PATH,
+                          sha1(uri.encode("utf-8")).hexdigest())
+
+    def __download(self, stream_uri, filepath, cancellable):
+        """
+            Download stream uri to filepath
+            @param stream_uri as str
+            @param filepath as str
+            @param cancellable as Gio.Cancellable
+        """
+        tmp_path = "%s.part" % filepath
+        try:
+            message = Soup.Message.new("GET", stream_uri)
+            stream = App().task_helper.http_pool.send(message, cancellable)
+            if message.status_code != Soup.Status.OK:
+                Logger.info("AudioCacheHelper::__download(): %s",
+                            message.status_code)
+                return
+            length = message.get_property(
+                "response-headers").get_content_length()
+            written = 0
+            with open(tmp_path, "wb") as f:
+                while True:
+                    data = stream.read_bytes(self.__CHUNK_SIZE,
+                                             cancellable).get_data()
+                    if not data:
+                        break
+                    f.write(data)
+                    written += len(data)
+            stream.close()
+            if length and written != length:
+                Logger.info("AudioCacheHelper::__download(): "
+                            "truncated %s/%s", written, length)
+                remove(tmp_path)
+                return
+            replace(tmp_path, filepath)
+            App().cache_quota.enforce()
+        except Exception as e:
+            Logger.warning("AudioCacheHelper::__download(): %s", e)
+            if path.exists(tmp_path):
+                remove(tmp_path)
+        finally:
+            with self.__lock:
+                self.__downloading.remove(filepath)
+
+    def __remove_partials(self):
+        """
+            Remove downloads interrupted by a previous run
+        """
+        try:
+            with scandir(AUDIO_CACHE_PATH) as it:
+                for entry in it:
+                    if entry.name.endswith(".part"):
+                        remove(entry.path)
+        except Exception as e:
+            Logger.warning("AudioCacheHelper::__remove_partials(): %s", e)
+
+    def __remove_all(self):
+        """
+            Remove all cached tracks
+        """
+        try:
+            with scandir(AUDIO_CACHE_PATH) as it:
+                for entry in it:
+                    if entry.is_file(follow_symlinks=False):
+                        remove(entry.path)
+        except Exception as e:
+            Logger.warning("AudioCacheHelper::__remove_all(): %s", e)
+
+    def __on_size_changed(self, settings, value):
+        """
+            Clear cache when disabled, apply new budget otherwise
+            @param settings as Gio.Settings
+            @param value as GLib.Variant
+        """
+        if self.enabled:
+            App().cache_quota.enforce()
+        else:
+            self.stop()
+            App().task_helper.run(self.__remove_all)
@@ -0,0 +1,208 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import Gio, GLib
+
+from concurrent.futures import wait
+from threading import Event
+from time import time
+import json
+
+from lollypop.define import App, StorageType
+from lollypop.logger import Logger
+
+
+class BenchmarkHelper:
+    """
+        Measure end-to-end times of web helpers then quit
+        Run by bin/benchmark_web.py against bin/mock_webservices.py:
+        LOLLYPOP_BENCHMARK: scenarios, "search,radio,artwork"
+        LOLLYPOP_BENCHMARK_OUTPUT: results file, JSON lines
+        LOLLYPOP_BENCHMARK_TERM: search term
+    """
+
+    __SCENARIOS = ["search", "radio", "artwork"]
+    __SEARCHES = ["SPOTIFY", "DEEZER", "LASTFM", "MUSICBRAINZ",
+                  "SPOTIFY,DEEZER,LASTFM,MUSICBRAINZ"]
+    # Seconds before giving up on a scenario
+    __TIMEOUT = 120
+    __ARTWORK_COUNT = 20
+    __RADIO_ARTISTS = 3
+
+    def __init__(self, scenarios, output):
+        """
+            Init helper
+            @param scenarios as str
+            @param output as str/None
+        """
+        self.__scenarios = [s for s in scenarios.split(",")
+                            if s in self.__SCENARIOS]
+        self.__output = output
+        self.__term = GLib.environ_getenv(GLib.get_environ(),
+                                          "LOLLYPOP_BENCHMARK_TERM") or "love"
+        self.__cancellable = Gio.Cancellable()
+
+    def start(self):
+        """
+            Run scenarios in background, quit when done
+            Settings are modified, so only run with a memory backend
+        """
+        backend = GLib.environ_getenv(GLib.get_environ(), "GSETTINGS_BACKEND")
+        if backend != "memory":
+            Logger.error("BenchmarkHelper::start(): "
+                         "GSETTINGS_BACKEND=memory needed")
+            return
+        App().settings.set_value("network-access",
+                                 GLib.Variant("b", True))
+        App().task_helper.run(self.__run)
+
+#######################
+# PRIVATE             #
+#######################
+    def __run(self):
+        """
+            Run scenarios and write results
+        """
+        try:
+            for scenario in self.__scenarios:
+                started = time()
+                if scenario == "search":
+                    results = self.__search()
+                elif scenario == "radio":
+                    results = self.__radio()
+                else:
+                    results = self.__artwork()
+                for result in results:
+                    result["scenario"] = scenario
+                    self.__write(result)
+                Logger.info("Benchmark %s: %.2fs",
+                            scenario, time() - started)
+            self.__write({"scenario": "http",
+                          "pool": App().task_helper.http_pool.stats,
+                          "cache": App().task_helper.http_cache.stats,
+                          "scheduler": App().task_helper.http_scheduler.stats})
+        except Exception as e:
+            Logger.error("BenchmarkHelper::__run(): %s", e)
+        GLib.idle_add(App().quit)
+
+    def __write(self, result):
+        """
+            Write result to output
+            @param result as {}
+        """
+        line = json.dumps(result)
+        if self.__output is None:
+            Logger.info("Benchmark result: %s", line)
+        else:
+            with open(self.__output, "a") as f:
+                f.write(line + "\n")
+
+    def __wait(self, event):
+        """
+            Wait for event, cancel on timeout
+            @param event as Event
+            @return True if event is set
+        """
+        if event.wait(self.__TIMEOUT):
+            return True
+        self.__cancellable.cancel()
+        self.__cancellable = Gio.Cancellable()
+        return False
+
+    def __search(self):
+        """
+            Time web searches
+            @return [{}]
+        """
+        from lollypop.search import Search
+        results = []
+        for name in self.__SEARCHES:
+            finished = Event()
+            times = {"first": None, "matches": 0}
+            started = time()
+
+            def on_match(search, object_id, storage_type):
+                if times["first"] is None:
+                    times["first"] = time() - started
+                times["matches"] += 1
+
+            def on_finished(search, last):
+                if last:
+                    finished.set()
+
+            search = Search()
+            search.set_web_search(name)
+            search.connect("match-album", on_match)
+            search.connect("match-track", on_match)
+            search.connect("finished", on_finished)
+            # Search state lives in main loop
+            GLib.idle_add(search.get, self.__term, self.__cancellable)
+            done = self.__wait(finished)
+            results.append({"name": name, "done": done,
+                            "first": times["first"],
+                            "matches": times["matches"],
+                            "total": time() - started})
+        return results
+
+    def __radio(self):
+        """
+            Time similar artists radio start
+            @return [{}]
+        """
+        from lollypop.similars_spotify import SpotifySimilars
+        from lollypop.similars_deezer import DeezerSimilars
+        artist_ids = [artist[0] for artist in App().artists.get_randoms(
+            self.__RADIO_ARTISTS, StorageType.ALL)]
+        results = []
+        for (name, similars) in [("SPOTIFY", SpotifySimilars()),
+                                 ("DEEZER", DeezerSimilars())]:
+            times = {"first": None, "tracks": 0}
+            started = time()
+
+            def on_match_track(similars, track_id, storage_type):
+                if times["first"] is None:
+                    times["first"] = time() - started
+                times["tracks"] += 1
+
+            similars.connect("match-track", on_match_track)
+            try:
+                similars.load_similars(artist_ids, StorageType.EPHEMERAL,
+                                       self.__cancellable)
+            except Exception as e:
+                Logger.error("BenchmarkHelper::__radio(): %s", e)
+            # Signals are emitted in main loop, flush them
+            flushed = Event()
+            GLib.idle_add(flushed.set)
+            self.__wait(flushed)
+            results.append({"name": name, "artists": len(artist_ids),
+                            "first": times["first"],
+                            "tracks": times["tracks"],
+                            "total": time() - started})
+        return results
+
+    def __artwork(self):
+        """
+            Time artwork fill for random albums
+            @return [{}]
+        """
+        album_ids = App().albums.get_randoms_by_albums(StorageType.ALL, None,
+                                                       False,
+                                                       self.__ARTWORK_COUNT)
+        started = time()
+        futures = []
+        for album_id in album_ids:
+            future = App().art.cache_album_artwork(album_id)
+            if future is not None:
+                futures.append(future)
+        (done, not_done) = wait(futures, timeout=self.__TIMEOUT)
+        return [{"name": "albums", "albums": len(futures),
+                 "done": len(done), "total": time() - started}]
@@ -0,0 +1,236 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import GLib
+
+from os import scandir, remove
+from threading import Lock
+from time import time
+
+from lollypop.define import App, CACHE_PATH, ALBUMS_WEB_PATH, LYRICS_PATH
+from lollypop.define import HTTP_CACHE_PATH, AUDIO_CACHE_PATH, PREROLL_PATH
+from lollypop.define import PACK_PATH, ARTISTS_PATH
+from lollypop.logger import Logger
+
+
+class CacheQuotaHelper:
+    """
+        Keep disk caches under a size budget
+        Least recently used files are evicted first
+        Stores (saved album covers, user artist artwork) are never bounded
+    """
+
+    # Share of "cache-quota" for each directory, in percent
+    __SHARES = {
+        CACHE_PATH: 55,
+        HTTP_CACHE_PATH: 10,
+        ALBUMS_WEB_PATH: 20,
+        LYRICS_PATH: 10,
+        ARTISTS_PATH: 5
+    }
+    # Only files with those suffixes are handled for directory,
+    # artists directory also stores user artwork beside information
+    __SUFFIXES = {
+        ARTISTS_PATH: (".txt",)
+    }
+    # Directories with their own budget setting, in MiB
+    __BUDGETS = {
+        AUDIO_CACHE_PATH: "audio-cache-size"
+    }
+    # Evict down to this ratio of the budget to prevent thrashing
+    __LOW_WATERMARK = 0.9
+    # Check budgets every 30 minutes
+    __INTERVAL = 1800
+    # Never evict those files (databases)
+    __PROTECTED = (".db", ".db-journal", ".db-wal", ".db-shm", ".part")
+    # Counted but never evicted, packs are indexed in memory by ArtPack
+    __UNEVICTABLE_PATHS = (PACK_PATH,)
+    # Not counted, handled by their owner
+    __IGNORED_PATHS = (PREROLL_PATH,)
+
+    def __init__(self):
+        """
+            Init helper
+        """
+        self.__lock = Lock()
+        self.__timeout_id = None
+        self.__accessed = {}
+        self.__stats = {}
+        for path in list(self.__SHARES.keys()) + list(self.__BUDGETS.keys()):
+            self.__stats[path] = {"used": 0, "files": 0,
+                                  "evicted": 0, "evicted_files": 0}
+
+    def start(self):
+        """
+            Start checking budgets in background
+        """
+        if self.__timeout_id is None:
+            self.__timeout_id = GLib.timeout_add_seconds(
+                self.__INTERVAL, self.__on_timeout)
+            self.enforce()
+
+    def stop(self):
+        """
+            Stop checking budgets
+        """
+        if self.__timeout_id is not None:
+            GLib.source_remove(self.__timeout_id)
+            self.__timeout_id = None
+
+    def touch(self, path):
+        """
+            Mark path as recently used
+            @param path as str
+            @thread safe
+        """
+        self.__accessed[path] = time()
+
+    def enforce(self):
+        """
+            Evict files in background until budgets are respected
+        """
+        App().task_helper.run(self.clean)
+
+    def clean(self):
+        """
+            Evict files until budgets are respected
+            @thread safe
+        """
+        if not self.__lock.acquire(False):
+            return
+        try:
+            seen = set()
+            for path in self.__stats.keys():
+                seen |= self.__clean_path(path, self.get_budget(path))
+            # Forget removed files
+            for filepath in list(self.__accessed.keys()):
+                if filepath not in seen:
+                    self.__accessed.pop(filepath, None)
+        except Exception as e:
+            Logger.error("CacheQuotaHelper::clean(): %s", e)
+        finally:
+            self.__lock.release()
+
+    def get_budget(self, path):
+        """
+            Get budget for path
+            @param path as str
+            @return bytes as int (0 for unlimited)
+        """
+        if path in self.__BUDGETS.keys():
+            size = App().settings.get_value(self.__BUDGETS[path]).get_int32()
+            return size * 1024 * 1024
+        quota = App().settings.get_value("cache-quota").get_int32()
+        return quota * 1024 * 1024 * self.__SHARES.get(path, 0) // 100
+
+    @property
+    def stats(self):
+        """
+            Get stats for each cache directory
+            @return {path: {"used": int, "files": int,
+                            "evicted": int, "evicted_files": int}}
+        """
+        stats = {}
+        for path in self.__stats.keys():
+            stats[path] = dict(self.__stats[path])
+        return stats
+
+#######################
+# PRIVATE             #
+#######################
+    def __scan(self, path, evictable=True):
+        """
+            Get files at path, recursively
+            Sub directories with their own budget are skipped
+            @param path as str
+            @param evictable as bool
+            @return [(os.DirEntry, bool)] as file, evictable
+        """
+        files = []
+        try:
+            with scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.path in self.__stats.keys() or\
+                                entry.path in self.__IGNORED_PATHS:
+                            continue
+                        files += self.__scan(
+                            entry.path,
+                            evictable and
+                            entry.path not in self.__UNEVICTABLE_PATHS)
+                    elif entry.is_file(follow_symlinks=False):
+                        files.append((entry, evictable))
+        except FileNotFoundError:
+            pass
+        return files
+
+    def __clean_path(self, path, budget):
+        """
+            Evict least recently used files at path down to budget
+            @param path as str
+            @param budget as int (0 for unlimited)
+            @return {str} as scanned files
+        """
+        entries = []
+        used = 0
+        seen = set()
+        suffixes = self.__SUFFIXES.get(path, None)
+        for (entry, evictable) in self.__scan(path):
+            if entry.name.endswith(self.__PROTECTED) or\
+                    (suffixes is not None and
+                     not entry.name.endswith(suffixes)):
+                continue
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            used += stat.st_size
+            seen.add(entry.path)
+            if not evictable:
+                continue
+            # atime is not reliable (noatime, relatime)
+            last_used = max(stat.st_atime, stat.st_mtime,
+                            self.__accessed.get(entry.path, 0))
+            entries.append((last_used, stat.st_size, entry.path))
+        stats = self.__stats[path]
+        files = len(seen)
+        if budget > 0 and used > budget:
+            target = budget * self.__LOW_WATERMARK
+            entries.sort()
+            for (last_used, size, filepath) in entries:
+                if used <= target:
+                    break
+                try:
+                    remove(filepath)
+                    self.__accessed.pop(filepath, None)
+                    used -= size
+                    stats["evicted"] += size
+                    stats["evicted_files"] += 1
+                    files -= 1
+                except Exception as e:
+                    Logger.warning("CacheQuotaHelper::__clean_path(): %s", e)
+        stats["used"] = used
+        stats["files"] = files
+        if budget > 0 and used > budget:
+            Logger.warning("Cache %s: unevictable files over budget", path)
+        Logger.info("Cache %s: %s MiB used, %s MiB budget, %s MiB evicted",
+                    path, used // 1048576, budget // 1048576,
+                    stats["evicted"] // 1048576)
+        return seen
+
+    def __on_timeout(self):
+        """
+            Check budgets
+            @return bool
+        """
+        self.enforce()
+        return True
@@ -0,0 +1,275 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from email.utils import parsedate_to_datetime
+from hashlib import sha1
+from os import replace
+from threading import Event, Lock
+from urllib.parse import urlparse, parse_qs
+from time import time
+import json
+
+from lollypop.define import App, HTTP_CACHE_PATH
+from lollypop.utils_file import create_dir
+from lollypop.logger import Logger
+
+
+class HttpCacheHelper:
+    """
+        On disk cache for web services responses
+        Uses Cache-Control, Expires, ETag and Last-Modified, but a per host
+        minimal freshness wins over shorter lifetimes, no-cache included
+        Only no-store responses and uris with credentials or per user data
+        are never stored
+        Stale entries are served when loading fails
+        Disk usage is bounded by CacheQuotaHelper
+    """
+
+    # Cached hosts with minimal freshness in seconds, used even if response
+    # asks for less: those APIs often send no-cache for data changing on a
+    # daily basis
+    __HOSTS = {
+        "api.spotify.com": 86400,
+        "api.deezer.com": 86400,
+        "ws.audioscrobbler.com": 86400,
+        "musicbrainz.org": 604800,
+        "theaudiodb.com": 604800,
+        "webservice.fanart.tv": 604800,
+        "wikipedia.org": 604800
+    }
+    # Uris with those query parameters carry credentials, never cached
+    __PRIVATE_PARAMS = ("api_sig", "sk", "token")
+    # Authentication and per user API methods, never cached
+    __PRIVATE_METHODS = ("auth.", "user.")
+    # Seconds to wait for another thread loading same uri
+    __COALESCE_TIMEOUT = 30
+    # Log hit rate every N lookups
+    __LOG_INTERVAL = 100
+
+    def __init__(self):
+        """
+            Init helper
+        """
+        self.__lock = Lock()
+        self.__in_flight = {}
+        self.__stats = {"hits": 0, "revalidated": 0, "coalesced": 0,
+                        "stale": 0, "misses": 0}
+        create_dir(HTTP_CACHE_PATH)
+
+    def get_ttl_for_uri(self, uri):
+        """
+            Get minimal freshness for uri
+            @param uri as str
+            @return int/None if not cacheable
+        """
+        parsed = urlparse(uri)
+        params = parse_qs(parsed.query, keep_blank_values=True)
+        for param in self.__PRIVATE_PARAMS:
+            if param in params.keys():
+                return None
+        for method in params.get("method", []):
+            if method.lower().startswith(self.__PRIVATE_METHODS):
+                return None
+        host = parsed.netloc
+        for (suffix, ttl) in self.__HOSTS.items():
+            if host == suffix or host.endswith("." + suffix):
+                return ttl
+        return None
+
+    def load(self, uri, headers, cancellable, loader):
+        """
+            Load uri from cache or with loader
+            @param uri as str
+            @param headers as [(str, str)]
+            @param cancellable as Gio.Cancellable
+            @param loader as function
+            @loader (uri, headers, cancellable) ->
+                    (status as int, headers as Soup.MessageHeaders,
+                     content as bytes)/None
+            @return (loaded as bool, content as bytes)
+            @thread safe
+        """
+        path = self.__get_path(uri)
+        entry = self.__read(path)
+        if entry is not None and entry[0]["expires"] > time():
+            self.__count("hits")
+            App().cache_quota.touch(path)
+            return (True, entry[1])
+        # Wait for another thread already loading this uri
+        with self.__lock:
+            event = self.__in_flight.get(uri)
+            owner = event is None
+            if owner:
+                event = Event()
+                self.__in_flight[uri] = event
+        if not owner:
+            event.wait(self.__COALESCE_TIMEOUT)
+            coalesced = self.__read(path)
+            if coalesced is not None and coalesced[0]["expires"] > time():
+                self.__count("coalesced")
+                return (True, coalesced[1])
+        try:
+            validators = []
+            if entry is not None:
+                if entry[0]["etag"]:
+                    validators.append(("If-None-Match", entry[0]["etag"]))
+                if entry[0]["last_modified"]:
+                    validators.append(("If-Modified-Since",
+                                       entry[0]["last_modified"]))
+            response = loader(uri, headers + validators, cancellable)
+            # Cancelled, rate limited, transport or server error
+            if response is None or response[0] < 100 or response[0] >= 500:
+                # Better than nothing
+                if entry is not None:
+                    self.__count("stale")
+                    return (True, entry[1])
+                elif response is None or response[0] < 100:
+                    return (False, b"")
+            (status, response_headers, content) = response
+            if status == 304 and entry is not None:
+                self.__count("revalidated")
+                self.__write(path, uri, response_headers, entry[1], entry[0])
+                return (True, entry[1])
+            self.__count("misses")
+            if 200 <= status < 300:
+                self.__write(path, uri, response_headers, content)
+            return (True, content)
+        finally:
+            if owner:
+                with self.__lock:
+                    del self.__in_flight[uri]
+                event.set()
+
+    def log_stats(self):
+        """
+            Log cache hit rate
+        """
+        stats = self.stats
+        total = sum(stats.values())
+        if total:
+            served = total - stats["misses"]
+            Logger.info("HTTP cache: %s%% hit rate, %s",
+                        served * 100 // total, stats)
+
+    @property
+    def stats(self):
+        """
+            Get lookup counters
+            @return {str: int}
+        """
+        with self.__lock:
+            return dict(self.__stats)
+
+#######################
+# PRIVATE             #
+#######################
+    def __count(self, key):
+        """
+            Increment counter for key, log hit rate at interval
+            @param key as str
+        """
+        with self.__lock:
+            self.__stats[key] += 1
+            log = sum(self.__stats.values()) % self.__LOG_INTERVAL == 0
+        if log:
+            self.log_stats()
+
+    def __get_path(self, uri):
+        """
+            Get cache path for uri
+            @param uri as str
+            @return str
+        """
+        return "%s/%s" % (HTTP_CACHE_PATH,
+                          sha1(uri.encode("utf-8")).hexdigest())
+
+    def __get_freshness(self, uri, response_headers):
+        """
+            Get freshness lifetime from response headers
+            Host minimal freshness wins over a shorter lifetime
+            @param uri as str
+            @param response_headers as Soup.MessageHeaders
+            @return int/None if response must not be stored
+        """
+        ttl = 0
+        cache_control = response_headers.get_one("Cache-Control") or ""
+        directives = [d.strip().lower() for d in cache_control.split(",")]
+        if "no-store" in directives:
+            return None
+        if "no-cache" not in directives:
+            for directive in directives:
+                if directive.startswith("max-age="):
+                    try:
+                        ttl = int(directive[8:])
+                    except ValueError:
+                        pass
+                    break
+            else:
+                expires = response_headers.get_one("Expires")
+                if expires:
+                    try:
+                        ttl = parsedate_to_datetime(
+                            expires).timestamp() - time()
+                    except Exception:
+                        pass
+        return max(ttl, self.get_ttl_for_uri(uri) or 0)
+
+    def __read(self, path):
+        """
+            Read entry at path
+            @param path as str
+            @return (metadata as {}, content as bytes)/None
+        """
+        try:
+            with open(path, "rb") as f:
+                metadata = json.loads(f.readline().decode("utf-8"))
+                return (metadata, f.read())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            Logger.warning("HttpCacheHelper::__read(): %s", e)
+        return None
+
+    def __write(self, path, uri, response_headers, content, previous=None):
+        """
+            Write entry at path
+            @param path as str
+            @param uri as str
+            @param response_headers as Soup.MessageHeaders
+            @param content as bytes
+            @param previous as {}, metadata to update on revalidation
+        """
+        try:
+            ttl = self.__get_freshness(uri, response_headers)
+            if ttl is None:
+                return
+            metadata = {"uri": uri, "etag": None, "last_modified": None}
+            if previous is not None:
+                metadata.update(previous)
+            etag = response_headers.get_one("ETag")
+            last_modified = response_headers.get_one("Last-Modified")
+            if etag:
+                metadata["etag"] = etag
+            if last_modified:
+                metadata["last_modified"] = last_modified
+            # Nothing to gain from storing it
+            if ttl <= 0 and not metadata["etag"] and\
+                    not metadata["last_modified"]:
+                return
+            metadata["expires"] = time() + ttl
+            tmp_path = "%s.tmp" % path
+            with open(tmp_path, "wb") as f:
+                f.write(json.dumps(metadata).encode("utf-8") + b"\n")
+                f.write(content)
+            replace(tmp_path, path)
+        except Exception as e:
+            Logger.warning("HttpCacheHelper::__write(): %s", e)
@@ -0,0 +1,247 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import gi
+gi.require_version("Soup", "2.4")
+from gi.repository import Gio, Soup
+
+from threading import Lock, Semaphore
+from urllib.parse import urlparse
+from time import time
+
+from lollypop.define import App
+from lollypop.logger import Logger
+
+
+class HttpPoolHelper:
+    """
+        Shared keep-alive Soup sessions
+        Connections, TLS sessions and DNS results are reused between requests
+        One session is used by threads, another one by the main loop
+    """
+
+    __MAX_CONNS = 24
+    __MAX_CONNS_PER_HOST = 4
+    # Hosts asking clients to be gentle
+    __HOST_LIMITS = {
+        "musicbrainz.org": 1,
+        "coverartarchive.org": 2
+    }
+    # Close idle connections after this many seconds
+    __IDLE_TIMEOUT = 60
+    __TIMEOUT = 30
+    # Log stats every N requests
+    __LOG_INTERVAL = 200
+
+    def __init__(self):
+        """
+            Init helper
+        """
+        self.__sync_session = None
+        self.__async_session = None
+        self.__lock = Lock()
+        self.__hosts = {}
+        self.__stats = {}
+        self.__count = 0
+        self.__rewrite = None
+
+    def set_uri_rewrite(self, rewrite):
+        """
+            Rewrite uris before sending messages, None to disable
+            @param rewrite as function/None
+            @rewrite (uri as str) -> str, rewritten uris must be kept as is
+        """
+        self.__rewrite = rewrite
+
+    def send_message(self, message):
+        """
+            Send message and wait for the whole response
+            @param message as Soup.Message
+            @return status code as int
+            @thread safe
+        """
+        (host, started) = self.__track(message)
+        with self.__get_host_semaphore(host):
+            status = self.__get_sync_session().send_message(message)
+        self.__record(message, host, started)
+        return status
+
+    def send(self, message, cancellable):
+        """
+            Send message and get response stream
+            @param message as Soup.Message
+            @param cancellable as Gio.Cancellable
+            @return Gio.InputStream
+            @thread safe
+        """
+        (host, started) = self.__track(message)
+        with self.__get_host_semaphore(host):
+            stream = self.__get_sync_session().send(message, cancellable)
+        self.__record(message, host, started)
+        return stream
+
+    def send_async(self, message, cancellable, callback, *args):
+        """
+            Send message async, must be called from main loop
+            @param message as Soup.Message
+            @param cancellable as Gio.Cancellable
+            @param callback as function
+            @callback (session as Soup.Session, result as Gio.AsyncResult,
+                       args)
+        """
+        (host, started) = self.__track(message)
+        self.__get_async_session().send_async(message, cancellable,
+                                              self.__on_send_async,
+                                              message, host, started,
+                                              callback, *args)
+
+    def log_stats(self):
+        """
+            Log stats for each host
+        """
+        for (host, stats) in self.stats.items():
+            Logger.info("HTTP %s: %s requests, %s%% reused connections, "
+                        "%s ms average latency",
+                        host, stats["requests"],
+                        stats["reused"] * 100 // stats["requests"],
+                        stats["latency"] * 1000 // stats["requests"])
+
+    @property
+    def stats(self):
+        """
+            Get stats for each host
+            @return {host: {"requests": int, "connections": int,
+                            "reused": int, "latency": float}}
+        """
+        with self.__lock:
+            stats = {}
+            for host in self.__stats.keys():
+                stats[host] = dict(self.__stats[host])
+            return stats
+
+#######################
+# PRIVATE             #
+#######################
+    def __new_session(self):
+        """
+            Get a new session with keep-alive settings
+            @return Soup.Session
+        """
+        session = Soup.Session.new()
+        session.set_property("accept-language-auto", True)
+        session.set_property(
+            "user-agent",
+            "Lollypop/%s (cedric.bellegarde@adishatz.org)" % App().version)
+        session.set_property("max-conns", self.__MAX_CONNS)
+        session.set_property("max-conns-per-host", self.__MAX_CONNS_PER_HOST)
+        session.set_property("idle-timeout", self.__IDLE_TIMEOUT)
+        session.set_property("timeout", self.__TIMEOUT)
+        return session
+
+    def __get_sync_session(self):
+        """
+            Get session for threads
+            @return Soup.Session
+        """
+        with self.__lock:
+            if self.__sync_session is None:
+                self.__sync_session = self.__new_session()
+            return self.__sync_session
+
+    def __get_async_session(self):
+        """
+            Get session for main loop
+            @return Soup.Session
+        """
+        if self.__async_session is None:
+            self.__async_session = self.__new_session()
+        return self.__async_session
+
+    def __get_host_semaphore(self, host):
+        """
+            Get semaphore limiting concurrent requests to host
+            @param host as str
+            @return Semaphore
+        """
+        with self.__lock:
+            if host not in self.__hosts.keys():
+                limit = self.__MAX_CONNS_PER_HOST
+                for (suffix, value) in self.__HOST_LIMITS.items():
+                    if host == suffix or host.endswith("." + suffix):
+                        limit = value
+                        break
+                self.__hosts[host] = Semaphore(limit)
+            return self.__hosts[host]
+
+    def __track(self, message):
+        """
+            Rewrite message uri and watch message for new connections
+            @param message as Soup.Message
+            @return (host as str, started as float)
+        """
+        uri = message.get_uri().to_string(False)
+        host = urlparse(uri).netloc
+        if self.__rewrite is not None:
+            rewritten = self.__rewrite(uri)
+            if rewritten != uri:
+                message.set_uri(Soup.URI.new(rewritten))
+        message.connect("network-event", self.__on_network_event)
+        return (host, time())
+
+    def __record(self, message, host, started):
+        """
+            Update stats for message
+            @param message as Soup.Message
+            @param host as str
+            @param started as float
+        """
+        # No network event means an existing connection was used
+        reused = getattr(message, "lollypop_new_connection", False) is False
+        with self.__lock:
+            if host not in self.__stats.keys():
+                self.__stats[host] = {"requests": 0, "connections": 0,
+                                      "reused": 0, "latency": 0.0}
+            stats = self.__stats[host]
+            stats["requests"] += 1
+            stats["latency"] += time() - started
+            if reused:
+                stats["reused"] += 1
+            else:
+                stats["connections"] += 1
+            self.__count += 1
+            log = self.__count % self.__LOG_INTERVAL == 0
+        if log:
+            self.log_stats()
+
+    def __on_network_event(self, message, event, connection):
+        """
+            Remember message opened a new connection
+            @param message as Soup.Message
+            @param event as Gio.SocketClientEvent
+            @param connection as Gio.IOStream
+        """
+        if event == Gio.SocketClientEvent.CONNECTED:
+            message.lollypop_new_connection = True
+
+    def __on_send_async(self, session, result, message, host, started,
+                        callback, *args):
+        """
+            Update stats and pass result to callback
+            @param session as Soup.Session
+            @param result as Gio.AsyncResult
+            @param message as Soup.Message
+            @param host as str
+            @param started as float
+            @param callback as function
+        """
+        self.__record(message, host, started)
+        callback(session, result, *args)
@@ -0,0 +1,264 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import GLib
+
+from heapq import heappush, heappop, heapify
+from itertools import count
+from threading import Condition, Event, Thread, get_ident
+from urllib.parse import urlparse
+from time import time
+
+from lollypop.define import HttpPriority
+from lollypop.logger import Logger
+
+
+class HttpSchedulerHelper:
+    """
+        Pace requests to web services with per host token buckets
+        Waiting requests are served by priority, then fairly between
+        threads (start time fair queuing)
+    """
+
+    # Requests per second, burst
+    __RATES = {
+        "musicbrainz.org": (1, 1),
+        "coverartarchive.org": (2, 4),
+        "api.spotify.com": (5, 10),
+        "api.deezer.com": (8, 16),
+        "ws.audioscrobbler.com": (5, 5),
+        "theaudiodb.com": (2, 4),
+        "webservice.fanart.tv": (5, 10),
+        "wikipedia.org": (10, 20)
+    }
+    # Seconds between cancellation checks for sync waiters
+    __POLL_INTERVAL = 1
+    # Log stats every N paced requests
+    __LOG_INTERVAL = 200
+
+    def __init__(self):
+        """
+            Init helper
+        """
+        self.__condition = Condition()
+        self.__queues = {}
+        self.__sequence = count()
+        self.__served = 0
+        self.__thread = None
+
+    def acquire(self, uri, priority=HttpPriority.BACKGROUND,
+                cancellable=None):
+        """
+            Wait for a slot to send a request to uri
+            @param uri as str
+            @param priority as HttpPriority
+            @param cancellable as Gio.Cancellable
+            @return True if request can be sent
+            @thread safe
+        """
+        event = Event()
+        request = self.__enqueue(uri, priority, event, None, ())
+        if request is None:
+            return True
+        while not event.wait(self.__POLL_INTERVAL):
+            if cancellable is not None and cancellable.is_cancelled():
+                with self.__condition:
+                    # Granted meanwhile, token is lost anyway
+                    if event.is_set():
+                        return False
+                    self.__cancel(request)
+                return False
+        return True
+
+    def schedule(self, uri, priority, callback, *args):
+        """
+            Run callback in main loop when a request to uri can be sent
+            Callback is run at once if host is not paced
+            @param uri as str
+            @param priority as HttpPriority
+            @param callback as function
+            @param *args as callback arguments
+        """
+        request = self.__enqueue(uri, priority, None, callback, args)
+        if request is None:
+            callback(*args)
+
+    def log_stats(self):
+        """
+            Log queue stats for each paced host
+        """
+        for (host, stats) in self.stats.items():
+            if stats["served"]:
+                Logger.info("HTTP queue %s: %s served, %s waiting, "
+                            "%s ms average wait, %s ms max wait, "
+                            "%s max waiting",
+                            host, stats["served"], stats["waiting"],
+                            int(stats["wait"] * 1000 // stats["served"]),
+                            int(stats["max_wait"] * 1000),
+                            stats["max_waiting"])
+
+    @property
+    def stats(self):
+        """
+            Get queue stats for each paced host
+            @return {host: {"served": int, "waiting": int,
+                            "waiting_by_priority": {int: int},
+                            "wait": float, "max_wait": float,
+                            "max_waiting": int}}
+        """
+        stats = {}
+        with self.__condition:
+            for (host, queue) in self.__queues.items():
+                by_priority = {}
+                for item in queue["waiting"]:
+                    by_priority[item[0]] = by_priority.get(item[0], 0) + 1
+                stats[host] = dict(queue["stats"])
+                stats[host]["waiting"] = len(queue["waiting"])
+                stats[host]["waiting_by_priority"] = by_priority
+        return stats
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_rate(self, host):
+        """
+            Get rate for host
+            @param host as str
+            @return (rate as float, burst as int)/None
+        """
+        for (suffix, rate) in self.__RATES.items():
+            if host == suffix or host.endswith("." + suffix):
+                return rate
+        return None
+
+    def __get_queue(self, host, rate):
+        """
+            Get queue for host, create it if needed
+            @param host as str
+            @param rate as (float, int)
+            @return {}
+        """
+        if host not in self.__queues.keys():
+            self.__queues[host] = {
+                "rate": rate[0],
+                "burst": rate[1],
+                "tokens": rate[1],
+                "updated": time(),
+                "waiting": [],
+                "vtime": 0,
+                "flows": {},
+                "stats": {"served": 0, "wait": 0.0,
+                          "max_wait": 0.0, "max_waiting": 0}
+            }
+        return self.__queues[host]
+
+    def __enqueue(self, uri, priority, event, callback, args):
+        """
+            Add a request to host queue
+            @param uri as str
+            @param priority as HttpPriority
+            @param event as Event/None
+            @param callback as function/None
+            @param args as ()
+            @return request as {}/None if host is not paced
+        """
+        host = urlparse(uri).netloc
+        rate = self.__get_rate(host)
+        if rate is None:
+            return None
+        with self.__condition:
+            queue = self.__get_queue(host, rate)
+            # A flow sending many requests falls behind newcomers
+            flow = get_ident()
+            tag = max(queue["vtime"], queue["flows"].get(flow, 0)) + 1
+            queue["flows"][flow] = tag
+            request = {"host": host, "event": event, "callback": callback,
+                       "args": args, "queued": time()}
+            heappush(queue["waiting"],
+                     (priority, tag, next(self.__sequence), request))
+            queue["stats"]["max_waiting"] = max(queue["stats"]["max_waiting"],
+                                                len(queue["waiting"]))
+            if self.__thread is None:
+                self.__thread = Thread(target=self.__dispatch)
+                self.__thread.daemon = True
+                self.__thread.start()
+            self.__condition.notify()
+        return request
+
+    def __cancel(self, request):
+        """
+            Remove request from its queue, condition must be held
+            @param request as {}
+        """
+        queue = self.__queues[request["host"]]
+        queue["waiting"] = [item for item in queue["waiting"]
+                            if item[3] is not request]
+        heapify(queue["waiting"])
+
+    def __take_token(self, queue, now):
+        """
+            Take a token from queue bucket
+            @param queue as {}
+            @param now as float
+            @return seconds before a token is available, 0 if taken
+        """
+        queue["tokens"] = min(queue["burst"],
+                              queue["tokens"] +
+                              (now - queue["updated"]) * queue["rate"])
+        queue["updated"] = now
+        if queue["tokens"] >= 1:
+            queue["tokens"] -= 1
+            return 0
+        return (1 - queue["tokens"]) / queue["rate"]
+
+    def __grant(self, queue, request, now):
+        """
+            Let request be sent, condition must be held
+            @param queue as {}
+            @param request as {}
+            @param now as float
+        """
+        stats = queue["stats"]
+        wait = now - request["queued"]
+        stats["served"] += 1
+        stats["wait"] += wait
+        stats["max_wait"] = max(stats["max_wait"], wait)
+        if request["event"] is not None:
+            request["event"].set()
+        else:
+            GLib.idle_add(request["callback"], *request["args"])
+        self.__served += 1
+        if self.__served % self.__LOG_INTERVAL == 0:
+            GLib.idle_add(self.log_stats)
+
+    def __dispatch(self):
+        """
+            Grant tokens to waiting requests
+        """
+        with self.__condition:
+            while True:
+                timeout = None
+                now = time()
+                for queue in self.__queues.values():
+                    waiting = queue["waiting"]
+                    while waiting:
+                        wait = self.__take_token(queue, now)
+                        if wait > 0:
+                            if timeout is None or wait < timeout:
+                                timeout = wait
+                            break
+                        (priority, tag, seq, request) = heappop(waiting)
+                        queue["vtime"] = tag
+                        self.__grant(queue, request, now)
+                    if not waiting:
+                        queue["flows"] = {}
+                self.__condition.wait(timeout)
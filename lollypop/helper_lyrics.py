@@ -10,25 +10,45 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from gi.repository import Gio, GLib
+from gi.repository import Gio, GLib, Soup
+
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from hashlib import md5
+from threading import Lock
+from time import time
 
 from lollypop.logger import Logger
 from lollypop.helper_task import TaskHelper
 from lollypop.utils import escape, get_network_available
-from lollypop.utils_file import create_dir
-from lollypop.define import LYRICS_PATH
+from lollypop.utils_file import create_dir, get_mtime
+from lollypop.define import App, LYRICS_PATH
 
 
 class LyricsHelper:
     """
         Sync lyrics helper
+        Parsed lyrics are shared by helpers and kept until files change
+        Web lyrics are kept on disk
     """
 
+    # Parsed tracks kept in memory
+    __MAX_PARSED = 20
+    # {uri: (stamp, times, lines, text)}
+    __PARSED = OrderedDict()
+    __LOCK = Lock()
+    # Web lyrics lifetime in seconds, shorter when nothing was found
+    __WEB_TTL = 30 * 24 * 3600
+    __WEB_MISS_TTL = 24 * 3600
+
     def __init__(self):
         """
             Init helper
         """
-        self.__timestamps = {}
+        self.__times = array("q")
+        self.__lines = []
+        self.__text = ""
         self.__cancellable = Gio.Cancellable.new()
         create_dir(LYRICS_PATH)
 
@@ -37,24 +57,15 @@ class LyricsHelper:
             Load lyrics for track
             @param track as Track
         """
-        self.__track = track
-        self.__timestamps = {}
-        uri_no_ext = ".".join(track.uri.split(".")[:-1])
-        self.__lrc_file = Gio.File.new_for_uri(uri_no_ext + ".lrc")
-        if self.__lrc_file.query_exists():
-            self.__get_timestamps()
-        else:
-            from lollypop.tagreader import Discoverer, TagReader
-            discoverer = Discoverer()
-            tagreader = TagReader()
-            try:
-                info = discoverer.get_info(track.uri)
-            except:
-                info = None
-            if info is not None:
-                tags = info.get_tags()
-                for (lyrics, timestamp) in tagreader.get_synced_lyrics(tags):
-                    self.__timestamps[timestamp] = lyrics
+        (self.__times, self.__lines, self.__text) = self.__parse(track)
+
+    def prefetch(self, track):
+        """
+            Prepare lyrics for track in background
+            @param track as Track
+        """
+        App().task_helper.run(self.__parse, track,
+                              callback=(self.__on_prefetched, track))
 
     def get_lyrics_for_timestamp(self, timestamp):
         """
@@ -62,23 +73,14 @@ class LyricsHelper:
             @param timestamp as int
             @return ([str], str, [str])
         """
-        previous = []
-        next = []
-        current = None
-        for key in self.__timestamps.keys():
-            if timestamp > key and current is None:
-                if len(previous) == 5:
-                    previous.pop(0)
-                previous.append(self.__timestamps[key])
-            elif current is None and previous:
-                current = previous.pop(-1)
-                next.append(self.__timestamps[key])
-            elif timestamp < key and len(next) != 5:
-                next.append(self.__timestamps[key])
-            else:
-                break
-        if current is None:
+        index = bisect_left(self.__times, timestamp)
+        if index == 0:
             current = ""
+            previous = []
+        else:
+            current = self.__lines[index - 1]
+            previous = self.__lines[max(0, index - 5):index - 1]
+        next = self.__lines[index:index + 5]
         return (previous, [" ", current, " "], next)
 
     def get_lyrics_from_web(self, track, callback, *args):
@@ -88,16 +90,29 @@ class LyricsHelper:
             @param callback as function
         """
         self.__cancellable = Gio.Cancellable.new()
+        lyrics = self.__get_from_disk(track)
+        if lyrics is not None:
+            callback(lyrics, *args)
+            return
         methods = []
         if get_network_available("WIKIA"):
             methods.append(self.__download_wikia_lyrics)
         if get_network_available("GENIUS"):
             methods.append(self.__download_genius_lyrics)
         if methods:
-            self.__get_lyrics_from_web(track, methods, callback, *args)
+            self.__get_lyrics_from_web(track, methods, False,
+                                       callback, *args)
         else:
             callback(None, *args)
 
+    def get_lyrics_from_disk(self, track):
+        """
+            Get web lyrics saved on disk, even expired
+            @param track as Track
+            @return str/None, "" if not found on web
+        """
+        return self.__get_from_disk(track, False)
+
     def cancel(self):
         """
             Cancel current loading
@@ -110,60 +125,219 @@ class LyricsHelper:
             True if lyrics available
             @return bool
         """
-        return len(self.__timestamps.keys()) != 0
+        return len(self.__times) != 0
+
+    @property
+    def text(self):
+        """
+            Get lyrics embedded in track tags
+            @return str
+        """
+        return self.__text
 
 ############
 # PRIVATE  #
 ############
+    def __parse(self, track):
+        """
+            Get lyrics for track, parse files if changed
+            @param track as Track
+            @return (array, [str], str) as sorted times, lines, text
+            @thread safe
+        """
+        f = Gio.File.new_for_uri(track.uri)
+        if not f.is_native():
+            return (array("q"), [], "")
+        uri_no_ext = ".".join(track.uri.split(".")[:-1])
+        lrc_file = Gio.File.new_for_uri(uri_no_ext + ".lrc")
+        stamp = (self.__get_mtime(f), self.__get_mtime(lrc_file))
+        with self.__LOCK:
+            parsed = self.__PARSED.get(track.uri, None)
+            if parsed is not None and parsed[0] == stamp:
+                self.__PARSED.move_to_end(track.uri)
+                return parsed[1:]
+        text = ""
+        if stamp[1] != 0:
+            timestamps = self.__get_timestamps(lrc_file)
+        else:
+            timestamps = []
+            from lollypop.tagreader import Discoverer, TagReader
+            discoverer = Discoverer()
+            tagreader = TagReader()
+            try:
+                info = discoverer.get_info(track.uri)
+            except:
+                info = None
+            if info is not None:
+                tags = info.get_tags()
+                for (lyrics, timestamp) in tagreader.get_synced_lyrics(tags):
+                    timestamps.append((timestamp, lyrics))
+                if not timestamps:
+                    text = tagreader.get_lyrics(tags)
+        # Stable, lines with same time keep file order
+        timestamps.sort(key=lambda item: item[0])
+        times = array("q", [timestamp for (timestamp, lyrics) in timestamps])
+        lines = [lyrics for (timestamp, lyrics) in timestamps]
+        with self.__LOCK:
+            self.__PARSED[track.uri] = (stamp, times, lines, text)
+            self.__PARSED.move_to_end(track.uri)
+            while len(self.__PARSED) > self.__MAX_PARSED:
+                self.__PARSED.popitem(last=False)
+        return (times, lines, text)
+
+    def __get_mtime(self, f):
+        """
+            Get file modification time
+            @param f as Gio.File
+            @return int, 0 if file does not exist
+        """
+        try:
+            info = f.query_info("time::modified",
+                                Gio.FileQueryInfoFlags.NONE, None)
+            return get_mtime(info)
+        except:
+            return 0
+
     def __str_to_timestamp(self, srt_timestamp):
         """
             Convert timestamp to time
             @timestamp as str [00:00.00]
             @return int
         """
-        timestamp = int(srt_timestamp.split(".")[-1])
-        seconds = int(srt_timestamp.split(".")[-2].split(":")[-1])
-        minutes = int(srt_timestamp.split(".")[-2].split(":")[0])
-        timestamp += seconds * 1000
-        timestamp += minutes * 60000
+        (minutes, seconds) = srt_timestamp.split(":")
+        if "." in seconds:
+            (seconds, fraction) = seconds.split(".")
+        else:
+            fraction = "0"
+        timestamp = int(fraction.ljust(3, "0")[:3])
+        timestamp += int(seconds) * 1000
+        timestamp += int(minutes) * 60000
         return timestamp
 
-    def __get_timestamps(self):
+    def __get_timestamps(self, lrc_file):
         """
             Get timestamps from file
+            @param lrc_file as Gio.File
+            @return [(int, str)]
         """
+        timestamps = []
         try:
-            status = False
-            if self.__lrc_file.query_exists():
-                (status, content, tag) = self.__lrc_file.load_contents()
+            (status, content, tag) = lrc_file.load_contents()
             if status:
                 data = content.decode("utf-8").split("\n")
                 for line in data:
-                    if line.find("length") != -1:
-                        continue
-                    try:
-                        str_timestamp = line.split("]")[0].split("[")[1]
-                        timestamp = self.__str_to_timestamp(str_timestamp)
-                        lyrics = " ".join(line.split("]")[1:])
-                        self.__timestamps[timestamp] = lyrics
-                    except:
-                        continue
+                    # A line may have many timestamps: [00:01.00][00:20.00]
+                    line_timestamps = []
+                    while line.startswith("["):
+                        try:
+                            str_timestamp = line[1:line.index("]")]
+                            line_timestamps.append(
+                                self.__str_to_timestamp(str_timestamp))
+                            line = line[line.index("]") + 1:]
+                        except:
+                            # Tags like [ar:Artist]
+                            line_timestamps = []
+                            break
+                    lyrics = line.strip()
+                    for timestamp in line_timestamps:
+                        timestamps.append((timestamp, lyrics))
         except Exception as e:
             Logger.error("SyncLyricsHelper::__get_timestamps(): %s", e)
+        return timestamps
 
-    def __get_lyrics_from_web(self, track, methods, callback, *args):
+    def __get_web_path(self, track):
+        """
+            Get web lyrics path for track
+            @param track as Track
+            @return str
+        """
+        name = "%s\n%s" % (self.__get_artist(track), self.__get_title(track))
+        return "%s/%s.txt" % (LYRICS_PATH,
+                              md5(name.encode("utf-8")).hexdigest())
+
+    def __get_from_disk(self, track, expire=True):
+        """
+            Get web lyrics from disk if not expired
+            @param track as Track
+            @param expire as bool
+            @return str/None, "" if not found on web
+        """
+        try:
+            filepath = self.__get_web_path(track)
+            f = Gio.File.new_for_path(filepath)
+            mtime = self.__get_mtime(f)
+            if mtime == 0:
+                return None
+            (status, content, tag) = f.load_contents()
+            ttl = self.__WEB_TTL if content else self.__WEB_MISS_TTL
+            if not status or (expire and mtime + ttl < time()):
+                return None
+            App().cache_quota.touch(filepath)
+            return content.decode("utf-8")
+        except Exception as e:
+            Logger.error("LyricsHelper::__get_from_disk(): %s", e)
+        return None
+
+    def __save_to_disk(self, track, lyrics):
+        """
+            Save web lyrics on disk
+            @param track as Track
+            @param lyrics as str, "" if not found on web
+        """
+        try:
+            f = Gio.File.new_for_path(self.__get_web_path(track))
+            f.replace_contents(lyrics.encode("utf-8"), None, False,
+                               Gio.FileCreateFlags.REPLACE_DESTINATION,
+                               None)
+        except Exception as e:
+            Logger.error("LyricsHelper::__save_to_disk(): %s", e)
+
+    def __get_lyrics_from_web(self, track, methods, failed, callback, *args):
         """
             Get lyrics from web for track
             @param track as Track
             @param methods as []
+            @param failed as bool, True if a previous method failed
             @param callback as function
         """
         if methods:
             method = methods.pop(0)
-            method(track, methods, callback, *args)
+            method(track, methods, failed, callback, *args)
         else:
+            # Only remember providers answering without lyrics
+            if not failed:
+                self.__save_to_disk(track, "")
             callback("", *args)
 
+    def __download_lyrics(self, uri, cls, separator, track, methods, failed,
+                          callback, *args):
+        """
+            Download lyrics page
+            @param uri as str
+            @param cls as str
+            @param separator as str
+            @param track as Track
+            @param methods as []
+            @param failed as bool
+            @param callback as function
+        """
+        msg = Soup.Message.new("GET", uri)
+        if msg is None:
+            self.__get_lyrics_from_web(track, methods, True, callback, *args)
+            return
+        helper = TaskHelper()
+        helper.send_message(msg,
+                            self.__cancellable,
+                            self.__on_lyrics_downloaded,
+                            msg,
+                            cls,
+                            separator,
+                            track,
+                            methods,
+                            failed,
+                            callback,
+                            *args)
+
     def __get_title(self, track, escape=False):
         """
             Get track title for lyrics
@@ -194,33 +368,29 @@ class LyricsHelper:
         else:
             return artist
 
-    def __download_wikia_lyrics(self, track, methods, callback, *args):
+    def __download_wikia_lyrics(self, track, methods, failed,
+                                callback, *args):
         """
             Downloas lyrics from wikia
             @param track as Track
             @param methods as []
+            @param failed as bool
             @param callback as function
         """
         title = self.__get_title(track, False)
         artist = self.__get_artist(track, False).lower()
         string = "%s:%s" % (artist, title)
         uri = "https://lyrics.wikia.com/wiki/%s" % string.replace(" ", "_")
-        helper = TaskHelper()
-        helper.load_uri_content(uri,
-                                self.__cancellable,
-                                self.__on_lyrics_downloaded,
-                                "lyricbox",
-                                "\n",
-                                track,
-                                methods,
-                                callback,
-                                *args)
+        self.__download_lyrics(uri, "lyricbox", "\n", track, methods, failed,
+                               callback, *args)
 
-    def __download_genius_lyrics(self, track, methods, callback, *args):
+    def __download_genius_lyrics(self, track, methods, failed,
+                                 callback, *args):
         """
             Download lyrics from genius
             @param track as Track
             @param methods as []
+            @param failed as bool
             @param callback as function
         """
         title = self.__get_title(track, False)
@@ -229,38 +399,48 @@ class LyricsHelper:
                         ignore=["_", "-", " ", ".", "/"]).replace(".", "")
         string = string.replace("/", " ")
         uri = "https://genius.com/%s-lyrics" % string.replace(" ", "-")
-        helper = TaskHelper()
-        helper.load_uri_content(uri,
-                                self.__cancellable,
-                                self.__on_lyrics_downloaded,
-                                "song_body-lyrics",
-                                "",
-                                track,
-                                methods,
-                                callback,
-                                *args)
+        self.__download_lyrics(uri, "song_body-lyrics", "", track, methods,
+                               failed, callback, *args)
 
-    def __on_lyrics_downloaded(self, uri, status, data, cls, separator,
-                               track, methods, callback, *args):
+    def __on_lyrics_downloaded(self, uri, status, data, msg, cls, separator,
+                               track, methods, failed, callback, *args):
         """
             Search lyrics and pass to callback
             @param uri as str
             @param status as bool
             @param data as bytes
+            @param msg as Soup.Message
             @param cls as str
             @param separator as str
             @param track as Track
             @param methods as []
+            @param failed as bool
             @param callback as function
         """
-        if status:
+        status_code = msg.get_property("status-code")
+        # Not found is an answer, other errors are failures
+        if not status or (status_code != 404 and
+                          not 200 <= status_code < 300):
+            failed = True
+        elif status_code != 404:
             try:
                 from bs4 import BeautifulSoup
                 soup = BeautifulSoup(data, 'html.parser')
                 lyrics = soup.find_all(
                     "div", class_=cls)[0].get_text(separator=separator)
+                self.__save_to_disk(track, lyrics)
                 callback(lyrics, *args)
                 return
             except Exception as e:
                 Logger.warning("LyricsView::__on_lyrics_downloaded(): %s", e)
-        self.__get_lyrics_from_web(track, methods, callback, *args)
+        self.__get_lyrics_from_web(track, methods, failed, callback, *args)
+
+    def __on_prefetched(self, lyrics, track):
+        """
+            Download web lyrics if track has none
+            @param lyrics as (array, [str], str)
+            @param track as Track
+        """
+        (times, lines, text) = lyrics
+        if not times and not text and get_network_available():
+            self.get_lyrics_from_web(track, lambda *ignore: None)
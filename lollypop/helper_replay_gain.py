@@ -0,0 +1,260 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import Gst, GLib, Gio
+
+from math import log10
+from multiprocessing import cpu_count
+from time import time
+
+from lollypop.define import App, ReplayGain
+from lollypop.logger import Logger
+
+
+class ReplayGainHelper:
+    """
+        Analyze collection loudness in background, opt-in with
+        "replay-gain-analysis"
+        Tracks are decoded by a pool of rganalysis pipelines, gains are
+        stored in DB and used when files miss ReplayGain tags
+        Album gain is computed once all album tracks are analyzed
+    """
+
+    __MAX_JOBS = max(1, min(4, cpu_count() // 2))
+    # Jobs allowed while playing
+    __PLAYING_JOBS = 1
+    __PIPELINE = "uridecodebin name=decoder ! audioconvert !\
+                  audioresample ! rganalysis name=analysis forced=false !\
+                  fakesink sync=false"
+
+    def __init__(self):
+        """
+            Init helper
+        """
+        self.__pending = []
+        # {track id: Gst.Pipeline}
+        self.__jobs = {}
+        # Tracks not analyzable, retried on next start
+        self.__failed = set()
+        App().settings.connect("changed::replay-gain-analysis",
+                               self.__on_setting_changed)
+        App().settings.connect("changed::replay-gain",
+                               self.__on_setting_changed)
+        App().scanner.connect("scan-finished", self.__on_scan_finished)
+        App().player.connect("status-changed", self.__on_status_changed)
+
+    def start(self):
+        """
+            Analyze tracks without gain, resume where previous run stopped
+        """
+        if not self.enabled:
+            return
+        App().task_helper.run(self.__load_pending)
+
+    def stop(self):
+        """
+            Stop running analysis
+        """
+        self.__pending = []
+        for (track_id, pipeline) in list(self.__jobs.items()):
+            self.__stop_job(track_id, pipeline)
+
+    @property
+    def enabled(self):
+        """
+            True if analysis is enabled
+            @return bool
+        """
+        return App().settings.get_value("replay-gain-analysis") and\
+            App().settings.get_enum("replay-gain") != ReplayGain.NONE
+
+#######################
+# PRIVATE             #
+#######################
+    def __load_pending(self):
+        """
+            Load tracks to analyze
+            @thread safe
+        """
+        track_ids = App().tracks.get_ids_without_replay_gain()
+        GLib.idle_add(self.__set_pending, track_ids)
+
+    def __set_pending(self, track_ids):
+        """
+            Set tracks to analyze and start jobs
+            @param track_ids as [int]
+        """
+        self.__pending = [track_id for track_id in track_ids
+                          if track_id not in self.__failed and
+                          track_id not in self.__jobs.keys()]
+        if self.__pending:
+            Logger.info("ReplayGainHelper: %s tracks to analyze",
+                        len(self.__pending))
+        self.__run_jobs()
+
+    def __run_jobs(self):
+        """
+            Start jobs until pool is full, smaller pool while playing
+        """
+        if not self.enabled or App().scanner.is_locked():
+            return
+        if App().player.is_playing:
+            max_jobs = self.__PLAYING_JOBS
+        else:
+            max_jobs = self.__MAX_JOBS
+        while self.__pending and len(self.__jobs) < max_jobs:
+            track_id = self.__pending.pop(0)
+            uri = App().tracks.get_uri(track_id)
+            if not uri.startswith("file:"):
+                continue
+            try:
+                pipeline = Gst.parse_launch(self.__PIPELINE)
+                pipeline.get_by_name("decoder").set_property("uri", uri)
+                bus = pipeline.get_bus()
+                bus.add_signal_watch()
+                bus.connect("message", self.__on_bus_message,
+                            track_id, pipeline)
+                self.__jobs[track_id] = pipeline
+                pipeline.set_state(Gst.State.PLAYING)
+            except Exception as e:
+                Logger.error("ReplayGainHelper::__run_jobs(): %s", e)
+                self.__failed.add(track_id)
+
+    def __stop_job(self, track_id, pipeline):
+        """
+            Stop job pipeline
+            @param track_id as int
+            @param pipeline as Gst.Pipeline
+        """
+        pipeline.set_state(Gst.State.NULL)
+        pipeline.get_bus().remove_signal_watch()
+        if track_id in self.__jobs.keys():
+            del self.__jobs[track_id]
+
+    def __save(self, track_id, gain, peak):
+        """
+            Save track gain and update album gain if complete
+            @param track_id as int
+            @param gain as float
+            @param peak as float
+            @thread safe
+        """
+        App().tracks.set_replay_gain(track_id, gain, peak)
+        album_id = App().tracks.get_album_id(track_id)
+        rows = App().tracks.get_replay_gains_for_album(album_id)
+        if any(row[2] is None for row in rows):
+            return
+        # Album loudness is the duration weighted energy of its tracks
+        durations = [max(1, row[1] or 0) for row in rows]
+        energy = sum(duration * 10 ** (-row[2] / 10)
+                     for (duration, row) in zip(durations, rows))
+        album_gain = -10 * log10(energy / sum(durations))
+        album_peak = max(row[3] for row in rows)
+        App().tracks.set_album_replay_gain(album_id, album_gain, album_peak)
+        if App().settings.get_value("save-to-tags"):
+            GLib.idle_add(self.__write_tags, rows, album_gain, album_peak)
+
+    def __write_tags(self, rows, album_gain, album_peak):
+        """
+            Write gains to album tracks tags with kid3-cli
+            @param rows as [(int, int, float, float)]
+            @param album_gain as float
+            @param album_peak as float
+        """
+        if App().scanner.inotify is not None:
+            App().scanner.inotify.disable()
+        for (track_id, duration, gain, peak) in rows:
+            f = Gio.File.new_for_uri(App().tracks.get_uri(track_id))
+            if not f.query_exists():
+                continue
+            commands = []
+            for (tag, value) in [
+                    ("REPLAYGAIN_TRACK_GAIN", "%.2f dB" % gain),
+                    ("REPLAYGAIN_TRACK_PEAK", "%.6f" % peak),
+                    ("REPLAYGAIN_ALBUM_GAIN", "%.2f dB" % album_gain),
+                    ("REPLAYGAIN_ALBUM_PEAK", "%.6f" % album_peak)]:
+                commands += ["-c", "set %s '%s'" % (tag, value)]
+            arguments = [["kid3-cli"] + commands + [f.get_path()],
+                         ["flatpak-spawn", "--host", "kid3-cli"] +
+                         commands + [f.get_path()]]
+            for argv in arguments:
+                try:
+                    (pid, stdin, stdout, stderr) = GLib.spawn_async(
+                        argv, flags=GLib.SpawnFlags.SEARCH_PATH |
+                        GLib.SpawnFlags.STDOUT_TO_DEV_NULL,
+                        standard_input=False,
+                        standard_output=False,
+                        standard_error=False
+                    )
+                    GLib.spawn_close_pid(pid)
+                    # Force mtime update to not run a collection update
+                    App().tracks.set_mtime(track_id, int(time()) + 10)
+                    break
+                except Exception as e:
+                    Logger.error("ReplayGainHelper::__write_tags(): %s", e)
+
+    def __on_bus_message(self, bus, message, track_id, pipeline):
+        """
+            Get analysis result
+            Tagged files are not analyzed, their tags are used
+            @param bus as Gst.Bus
+            @param message as Gst.Message
+            @param track_id as int
+            @param pipeline as Gst.Pipeline
+        """
+        if track_id not in self.__jobs.keys():
+            return
+        if message.type == Gst.MessageType.TAG:
+            tags = message.parse_tag()
+            (exists, gain) = tags.get_double("replaygain-track-gain")
+            if not exists:
+                return
+            (exists, peak) = tags.get_double("replaygain-track-peak")
+            if not exists:
+                peak = 1.0
+            self.__stop_job(track_id, pipeline)
+            App().task_helper.run(self.__save, track_id, gain, peak)
+        elif message.type in [Gst.MessageType.EOS, Gst.MessageType.ERROR]:
+            if message.type == Gst.MessageType.ERROR:
+                Logger.warning("ReplayGainHelper: %s",
+                               message.parse_error()[0])
+            self.__failed.add(track_id)
+            self.__stop_job(track_id, pipeline)
+        else:
+            return
+        self.__run_jobs()
+
+    def __on_setting_changed(self, settings, value):
+        """
+            Start or stop analysis
+            @param settings as Gio.Settings
+            @param value as GLib.Variant
+        """
+        if self.enabled:
+            self.start()
+        else:
+            self.stop()
+
+    def __on_scan_finished(self, scanner, modifications):
+        """
+            Analyze new tracks
+            @param scanner as CollectionScanner
+            @param modifications as bool
+        """
+        self.start()
+
+    def __on_status_changed(self, player):
+        """
+            Use more jobs when not playing
+            @param player as Player
+        """
+        self.__run_jobs()
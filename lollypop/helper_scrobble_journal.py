@@ -0,0 +1,201 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import Gio, GLib
+
+from os import fsync, replace
+from threading import Lock
+import json
+
+from lollypop.define import App, LOLLYPOP_DATA_PATH
+from lollypop.utils import get_network_available
+from lollypop.logger import Logger
+
+
+class ScrobbleJournalHelper:
+    """
+        Disk backed queue of listens submitted in batches
+        Failed batches are retried with an exponential backoff
+    """
+
+    __MIN_DELAY = 30
+    __MAX_DELAY = 3600
+
+    def __init__(self, name, batch_size, submit):
+        """
+            Init journal
+            @param name as str
+            @param batch_size as int
+            @param submit as function
+            @submit (entries as [{}], cancellable as Gio.Cancellable) ->
+                    bool, False to retry later
+        """
+        self.__path = "%s/%s_journal.json" % (LOLLYPOP_DATA_PATH, name)
+        self.__batch_size = batch_size
+        self.__submit = submit
+        self.__lock = Lock()
+        self.__entries = []
+        self.__draining = False
+        self.__failures = 0
+        self.__timeout_id = None
+        self.__signal_id = None
+        self.__cancellable = Gio.Cancellable()
+        self.__load()
+
+    def start(self):
+        """
+            Submit pending listens, again when network comes back
+        """
+        self.__cancellable = Gio.Cancellable()
+        if self.__signal_id is None:
+            monitor = Gio.NetworkMonitor.get_default()
+            self.__signal_id = monitor.connect("network-changed",
+                                               self.__on_network_changed)
+        self.drain()
+
+    def stop(self):
+        """
+            Stop submitting listens, journal stays on disk
+        """
+        self.__cancellable.cancel()
+        if self.__signal_id is not None:
+            Gio.NetworkMonitor.get_default().disconnect(self.__signal_id)
+            self.__signal_id = None
+        if self.__timeout_id is not None:
+            GLib.source_remove(self.__timeout_id)
+            self.__timeout_id = None
+
+    def append(self, entry):
+        """
+            Add entry to journal
+            @param entry as {}
+            @thread safe
+        """
+        with self.__lock:
+            self.__entries.append(entry)
+            try:
+                with open(self.__path, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+                    f.flush()
+                    fsync(f.fileno())
+            except Exception as e:
+                Logger.error("ScrobbleJournalHelper::append(): %s", e)
+
+    def drain(self):
+        """
+            Submit pending listens in background
+        """
+        if App().settings.get_value("disable-scrobbling") or\
+                not get_network_available():
+            return
+        with self.__lock:
+            if not self.__entries or self.__draining or\
+                    self.__timeout_id is not None:
+                return
+            self.__draining = True
+        App().task_helper.run(self.__drain)
+
+    @property
+    def count(self):
+        """
+            Get pending listens count
+            @return int
+        """
+        return len(self.__entries)
+
+#######################
+# PRIVATE             #
+#######################
+    def __load(self):
+        """
+            Load journal from disk, skip truncated lines
+        """
+        try:
+            with open(self.__path, "r") as f:
+                for line in f:
+                    try:
+                        self.__entries.append(json.loads(line))
+                    except ValueError:
+                        Logger.warning("ScrobbleJournalHelper::__load(): "
+                                       "invalid entry %s", line)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            Logger.error("ScrobbleJournalHelper::__load(): %s", e)
+
+    def __save(self):
+        """
+            Rewrite journal on disk
+        """
+        tmp_path = "%s.tmp" % self.__path
+        with open(tmp_path, "w") as f:
+            for entry in self.__entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            fsync(f.fileno())
+        replace(tmp_path, self.__path)
+
+    def __drain(self):
+        """
+            Submit batches until journal is empty or a batch fails
+        """
+        try:
+            while not self.__cancellable.is_cancelled():
+                with self.__lock:
+                    batch = self.__entries[:self.__batch_size]
+                if not batch:
+                    break
+                if not self.__submit(batch, self.__cancellable):
+                    self.__failures += 1
+                    delay = min(self.__MIN_DELAY * 2 ** (self.__failures - 1),
+                                self.__MAX_DELAY)
+                    Logger.info("%s: %s listens pending, retry in %ss",
+                                self.__path, len(self.__entries), delay)
+                    GLib.idle_add(self.__schedule_retry, delay)
+                    break
+                self.__failures = 0
+                with self.__lock:
+                    del self.__entries[:len(batch)]
+                    self.__save()
+        except Exception as e:
+            Logger.error("ScrobbleJournalHelper::__drain(): %s", e)
+        finally:
+            self.__draining = False
+
+    def __schedule_retry(self, delay):
+        """
+            Drain journal after delay
+            @param delay as int
+        """
+        if self.__timeout_id is None and\
+                not self.__cancellable.is_cancelled():
+            self.__timeout_id = GLib.timeout_add_seconds(delay,
+                                                         self.__on_retry)
+
+    def __on_retry(self):
+        """
+            Drain journal
+        """
+        self.__timeout_id = None
+        self.drain()
+
+    def __on_network_changed(self, monitor, available):
+        """
+            Drain journal when network is back
+            @param monitor as Gio.NetworkMonitor
+            @param available as bool
+        """
+        if available:
+            if self.__timeout_id is not None:
+                GLib.source_remove(self.__timeout_id)
+                self.__timeout_id = None
+            self.drain()
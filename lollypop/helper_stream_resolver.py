@@ -0,0 +1,173 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import Gio
+
+from urllib.parse import urlparse, parse_qs
+from time import time
+
+from lollypop.helper_youtube_dl import YoutubeDLHelper
+from lollypop.define import App
+from lollypop.utils import get_network_available
+from lollypop.logger import Logger
+
+
+class StreamResolverHelper:
+    """
+        Resolve stream uris of upcoming web tracks in background
+        Resolved uris are kept until they expire
+    """
+
+    # Tracks waiting for resolution
+    __MAX_PENDING = 5
+    # Stream uris without expiry are kept this many seconds
+    __DEFAULT_TTL = 3600
+    # Seconds before expiry a stream uri is considered stale
+    __MARGIN = 300
+
+    def __init__(self):
+        """
+            Init helper
+        """
+        self.__uris = {}
+        self.__pending = []
+        self.__loading = None
+        self.__cancellable = Gio.Cancellable()
+        self.__youtube_dl = YoutubeDLHelper()
+
+    def get(self, track):
+        """
+            Get resolved stream uri for track
+            @param track as Track
+            @return str/None
+        """
+        if track.id not in self.__uris.keys():
+            return None
+        (uri, expires) = self.__uris[track.id]
+        if expires - self.__MARGIN < time():
+            del self.__uris[track.id]
+            return None
+        return uri
+
+    def add(self, track, uri):
+        """
+            Remember stream uri for track
+            @param track as Track
+            @param uri as str
+        """
+        now = time()
+        self.__uris = {track_id: item
+                       for (track_id, item) in self.__uris.items()
+                       if item[1] > now}
+        self.__uris[track.id] = (uri, self.__get_expiry(uri))
+
+    def invalidate(self, track):
+        """
+            Forget stream uri for track
+            @param track as Track
+        """
+        if track.id in self.__uris.keys():
+            del self.__uris[track.id]
+
+    def prefetch(self, tracks, first=False):
+        """
+            Resolve web tracks in background
+            @param tracks as [Track]
+            @param first as bool, resolve before other pending tracks
+        """
+        wanted = []
+        track_ids = []
+        for track in tracks:
+            if track.id is not None and track.is_web and\
+                    track.id != self.__loading and\
+                    track.id not in track_ids and\
+                    self.get(track) is None:
+                wanted.append(track)
+                track_ids.append(track.id)
+        if not wanted:
+            return
+        pending = [track for track in self.__pending
+                   if track.id not in track_ids]
+        if first:
+            self.__pending = wanted + pending
+        else:
+            self.__pending = pending + wanted
+        del self.__pending[self.__MAX_PENDING:]
+        self.__youtube_dl.start()
+        self.__resolve_next()
+
+    def stop(self):
+        """
+            Stop resolving tracks
+        """
+        self.__cancellable.cancel()
+        self.__cancellable = Gio.Cancellable()
+        self.__pending = []
+        self.__loading = None
+        self.__youtube_dl.stop()
+
+    @property
+    def youtube_dl(self):
+        """
+            Get youtube-dl helper
+            @return YoutubeDLHelper
+        """
+        return self.__youtube_dl
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_expiry(self, uri):
+        """
+            Get stream uri expiry
+            @param uri as str
+            @return timestamp as float
+        """
+        try:
+            # YouTube and Invidious stream uris
+            query = parse_qs(urlparse(uri).query)
+            if "expire" in query.keys():
+                return float(query["expire"][0])
+        except Exception as e:
+            Logger.warning("StreamResolverHelper::__get_expiry(): %s", e)
+        return time() + self.__DEFAULT_TTL
+
+    def __resolve_next(self):
+        """
+            Resolve next pending track, one at a time
+        """
+        if self.__loading is not None or not self.__pending or\
+                not get_network_available("YOUTUBE"):
+            return
+        track = self.__pending.pop(0)
+        self.__loading = track.id
+        from lollypop.helper_web import WebHelper
+        helper = WebHelper(track, self.__cancellable)
+        helper.connect("loaded", self.__on_loaded, track, self.__cancellable)
+        helper.load()
+
+    def __on_loaded(self, helper, uri, track, cancellable):
+        """
+            Store stream uri and resolve next track
+            @param helper as WebHelper
+            @param uri as str
+            @param track as Track
+            @param cancellable as Gio.Cancellable
+        """
+        if cancellable.is_cancelled():
+            return
+        self.__loading = None
+        if uri:
+            Logger.debug("StreamResolverHelper: %s resolved", track.uri)
+            self.add(track, uri)
+            App().audio_cache.cache(track, uri)
+        self.__resolve_next()
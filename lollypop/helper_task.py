@@ -18,8 +18,11 @@ from threading import Thread
 from urllib.parse import urlparse
 from time import time, sleep
 
-from lollypop.define import App
 from lollypop.logger import Logger
+from lollypop.helper_http_pool import HttpPoolHelper
+from lollypop.helper_http_cache import HttpCacheHelper
+from lollypop.helper_http_scheduler import HttpSchedulerHelper
+from lollypop.define import HttpPriority
 
 
 class TaskHelper:
@@ -33,6 +36,15 @@ class TaskHelper:
         """
         self.__ratelimit = {}
         self.__retries = {}
+        self.__http_pool = HttpPoolHelper()
+        self.__http_cache = HttpCacheHelper()
+        self.__http_scheduler = HttpSchedulerHelper()
+        mock_uri = GLib.environ_getenv(GLib.get_environ(),
+                                       "LOLLYPOP_MOCK_URI")
+        if mock_uri is not None:
+            Logger.info("Web services redirected to %s", mock_uri)
+            self.set_uri_rewrite(
+                lambda uri: self.__get_mock_uri(mock_uri.rstrip("/"), uri))
 
     def run(self, command, *args, **kwargs):
         """
@@ -48,25 +60,30 @@ class TaskHelper:
         thread.start()
         return thread
 
-    def load_uri_content(self, uri, cancellable, callback, *args):
+    def load_uri_content(self, uri, cancellable, callback, *args,
+                         priority=HttpPriority.INTERACTIVE):
         """
             Load uri content async
             @param uri as str
             @param cancellable as Gio.Cancellable
             @param callback as a function
+            @param priority as HttpPriority
             @callback (uri as str, status as bool, content as bytes, args)
         """
         self.load_uri_content_with_headers(uri, [], cancellable,
-                                           callback, *args)
+                                           callback, *args,
+                                           priority=priority)
 
     def load_uri_content_with_headers(self, uri, headers, cancellable,
-                                      callback, *args):
+                                      callback, *args,
+                                      priority=HttpPriority.INTERACTIVE):
         """
             Load uri content async with headers
             @param uri as str
             @param headers as []
             @param cancellable as Gio.Cancellable
             @param callback as a function
+            @param priority as HttpPriority
             @callback (uri as str, status as bool, content as bytes, args)
         """
         if cancellable is not None and cancellable.is_cancelled():
@@ -75,124 +92,107 @@ class TaskHelper:
             delay = self.__get_delay_for_uri(uri)
             if delay > 0:
                 GLib.timeout_add_seconds(
-                                 delay,
-                                 self.load_uri_content_with_headers,
-                                 uri, headers, cancellable,
-                                 callback, *args)
+                    delay,
+                    lambda: self.load_uri_content_with_headers(
+                        uri, headers, cancellable, callback, *args,
+                        priority=priority))
                 return
 
-            session = Soup.Session.new()
-            session.set_property('accept-language-auto', True)
-            session.set_property(
-                "user-agent",
-                "Lollypop/%s (cedric.bellegarde@adishatz.org)" % App().version)
             msg = Soup.Message.new("GET", uri)
             if headers:
-                headers = msg.get_property("request-headers")
+                request_headers = msg.get_property("request-headers")
                 for header in headers:
-                    headers.append(header[0],
-                                   header[1])
-            session.send_async(msg, cancellable,
-                               self.__on_load_uri_content, msg, headers,
-                               callback, cancellable, uri, *args)
+                    request_headers.append(header[0], header[1])
+            self.__http_scheduler.schedule(uri, priority,
+                                           self.__http_pool.send_async,
+                                           msg, cancellable,
+                                           self.__on_load_uri_content, msg,
+                                           headers, callback, cancellable,
+                                           uri, *args)
         except Exception as e:
             Logger.warning(
                 "HelperTask::load_uri_content_with_headers(): %s" % e)
             callback(uri, False, b"", *args)
 
-    def load_uri_content_sync(self, uri, cancellable=None):
+    def load_uri_content_sync(self, uri, cancellable=None,
+                              priority=HttpPriority.BACKGROUND):
         """
             Load uri
             @param uri as str
             @param cancellable as Gio.Cancellable
+            @param priority as HttpPriority
             @return (loaded as bool, content as bytes)
         """
-        return self.load_uri_content_sync_with_headers(uri, [], cancellable)
+        return self.load_uri_content_sync_with_headers(uri, [], cancellable,
+                                                       priority)
 
     def load_uri_content_sync_with_headers(self, uri, headers,
-                                           cancellable=None):
+                                           cancellable=None,
+                                           priority=HttpPriority.BACKGROUND):
         """
             Load uri
             @param uri as str
             @param headers as []
             @param cancellable as Gio.Cancellable
+            @param priority as HttpPriority
             @return (loaded as bool, content as bytes)
         """
         try:
-            delay = self.__get_delay_for_uri(uri)
-            if delay > 0:
-                sleep(delay)
-                if cancellable is not None and cancellable.is_cancelled():
-                    return (False, b"")
-
-            session = Soup.Session.new()
-            session.set_property('accept-language-auto', True)
-            session.set_property(
-                "user-agent",
-                "Lollypop/%s (cedric.bellegarde@adishatz.org)" % App().version)
-            msg = Soup.Message.new("GET", uri)
-            if headers:
-                request_headers = msg.get_property("request-headers")
-                for header in headers:
-                    request_headers.append(header[0], header[1])
-            session.send_message(msg)
-            response_headers = msg.get_property("response-headers")
-            wait = self.__handle_ratelimit(response_headers, uri)
-            if wait is None:
-                if uri in self.__retries.keys():
-                    del self.__retries[uri]
-                body = msg.get_property("response-body")
-                bytes = body.flatten().get_data()
-                return (True, bytes)
-            else:
-                retries = self.__get_retries_for_uri(uri)
-                if retries < 5:
-                    parsed = urlparse(uri)
-                    self.__ratelimit[parsed.netloc] = wait
-                    return self.load_uri_content_sync_with_headers(
-                        uri, headers, cancellable)
-                else:
-                    del self.__retries[uri]
+            if self.__http_cache.get_ttl_for_uri(uri) is not None:
+                return self.__http_cache.load(
+                    uri, headers, cancellable,
+                    lambda u, h, c: self.__get_sync(u, h, c, priority))
+            response = self.__get_sync(uri, headers, cancellable, priority)
+            if response is None:
+                return (False, b"")
+            return (True, response[2])
         except Exception as e:
             Logger.warning(
                 "TaskHelper::load_uri_content_sync_with_headers(): %s" % e)
             return (False, b"")
 
-    def send_message(self, message, cancellable, callback, *args):
+    def send_message(self, message, cancellable, callback, *args,
+                     priority=HttpPriority.INTERACTIVE):
         """
             Send message async
             @param message as Soup.Message
             @param cancellable as Gio.Cancellable
             @param callback as a function
+            @param priority as HttpPriority
             @callback (uri as str, status as bool, content as bytes, args)
         """
         try:
             uri = message.get_uri().to_string(False)
             delay = self.__get_delay_for_uri(uri)
             if delay > 0:
-                GLib.timeout_add_seconds(delay,
-                                         self.send_message,
-                                         message, cancellable,
-                                         callback, *args)
+                GLib.timeout_add_seconds(
+                    delay,
+                    lambda: self.send_message(message, cancellable,
+                                              callback, *args,
+                                              priority=priority))
                 return
 
-            session = Soup.Session.new()
-            session.send_async(message,
-                               cancellable,
-                               self.__on_message_send_async,
-                               message,
-                               callback,
-                               cancellable,
-                               uri,
-                               *args)
+            self.__http_scheduler.schedule(uri,
+                                           priority,
+                                           self.__http_pool.send_async,
+                                           message,
+                                           cancellable,
+                                           self.__on_message_send_async,
+                                           message,
+                                           callback,
+                                           cancellable,
+                                           uri,
+                                           *args)
         except Exception as e:
             Logger.warning("TaskHelper::send_message(): %s" % e)
 
-    def send_message_sync(self, message, cancellable):
+    def send_message_sync(self, message, cancellable,
+                          priority=HttpPriority.BACKGROUND):
         """
             Send message sync
             @param message as Soup.Message
             @param cancellable as Gio.Cancellable
+            @param priority as HttpPriority
             @return bytes
         """
         try:
@@ -202,9 +202,10 @@ class TaskHelper:
                 sleep(delay)
                 if cancellable is not None and cancellable.is_cancelled():
                     return None
+            if not self.__http_scheduler.acquire(uri, priority, cancellable):
+                return None
 
-            session = Soup.Session.new()
-            stream = session.send(message, cancellable)
+            stream = self.__http_pool.send(message, cancellable)
             response_headers = message.get_property("response-headers")
             wait = self.__handle_ratelimit(response_headers, uri)
             if wait is None:
@@ -220,16 +221,105 @@ class TaskHelper:
                 if retries < 5:
                     parsed = urlparse(uri)
                     self.__ratelimit[parsed.netloc] = wait
-                    return self.send_message_sync(message, cancellable)
+                    return self.send_message_sync(message, cancellable,
+                                                  priority)
                 else:
                     del self.__retries[uri]
         except Exception as e:
             Logger.warning("TaskHelper::send_message_sync(): %s" % e)
         return None
 
+    def set_uri_rewrite(self, rewrite):
+        """
+            Rewrite uris before sending requests, None to disable
+            Rate limits and cache still use original uris
+            @param rewrite as function/None
+            @rewrite (uri as str) -> str, rewritten uris must be kept as is
+        """
+        self.__http_pool.set_uri_rewrite(rewrite)
+
+    @property
+    def http_pool(self):
+        """
+            Get shared HTTP sessions
+            @return HttpPoolHelper
+        """
+        return self.__http_pool
+
+    @property
+    def http_cache(self):
+        """
+            Get web services responses cache
+            @return HttpCacheHelper
+        """
+        return self.__http_cache
+
+    @property
+    def http_scheduler(self):
+        """
+            Get requests scheduler
+            @return HttpSchedulerHelper
+        """
+        return self.__http_scheduler
+
 #######################
 # PRIVATE             #
 #######################
+    def __get_mock_uri(self, mock_uri, uri):
+        """
+            Get uri on mock server: https://host/path -> mock_uri/host/path
+            @param mock_uri as str
+            @param uri as str
+            @return str
+        """
+        if uri.startswith(mock_uri):
+            return uri
+        parsed = urlparse(uri)
+        prefix = "%s://%s" % (parsed.scheme, parsed.netloc)
+        return "%s/%s%s" % (mock_uri, parsed.netloc, uri[len(prefix):])
+
+    def __get_sync(self, uri, headers, cancellable, priority):
+        """
+            Send a GET request for uri, wait for rate limits
+            @param uri as str
+            @param headers as []
+            @param cancellable as Gio.Cancellable
+            @param priority as HttpPriority
+            @return (status as int, headers as Soup.MessageHeaders,
+                     content as bytes)/None
+        """
+        delay = self.__get_delay_for_uri(uri)
+        if delay > 0:
+            sleep(delay)
+        if cancellable is not None and cancellable.is_cancelled():
+            return None
+        if not self.__http_scheduler.acquire(uri, priority, cancellable):
+            return None
+
+        msg = Soup.Message.new("GET", uri)
+        if headers:
+            request_headers = msg.get_property("request-headers")
+            for header in headers:
+                request_headers.append(header[0], header[1])
+        status = self.__http_pool.send_message(msg)
+        response_headers = msg.get_property("response-headers")
+        wait = self.__handle_ratelimit(response_headers, uri)
+        if wait is None:
+            if uri in self.__retries.keys():
+                del self.__retries[uri]
+            body = msg.get_property("response-body")
+            return (status, response_headers, body.flatten().get_data())
+        else:
+            retries = self.__get_retries_for_uri(uri)
+            if retries < 5:
+                self.__retries[uri] += 1
+                parsed = urlparse(uri)
+                self.__ratelimit[parsed.netloc] = wait
+                return self.__get_sync(uri, headers, cancellable, priority)
+            else:
+                del self.__retries[uri]
+        return None
+
     def __get_delay_for_uri(self, uri):
         """
             Get delay for last ratelimit
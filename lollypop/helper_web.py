@@ -68,6 +68,7 @@ class WebHelper(GObject.Object):
                 "%s/%s" % (CACHE_PATH, self.__track.mb_track_id))
             if f.query_exists():
                 (stats, content, tag) = f.load_contents()
+                App().cache_quota.touch(f.get_path())
                 return content.decode("utf-8")
         except Exception as e:
             Logger.error("WebHelper::__load_from_cache(): %s", e)
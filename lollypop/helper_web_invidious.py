@@ -13,7 +13,7 @@
 import json
 
 from lollypop.helper_web_base import BaseWebHelper
-from lollypop.define import App
+from lollypop.define import App, HttpPriority
 from lollypop.utils import emit_signal
 from lollypop.logger import Logger
 
@@ -48,7 +48,8 @@ class InvidiousWebHelper(BaseWebHelper):
         uri = "%s/%s" % (self.__server, video)
         App().task_helper.load_uri_content(uri,
                                            cancellable,
-                                           self.__on_uri_content)
+                                           self.__on_uri_content,
+                                           priority=HttpPriority.PLAYBACK)
 
 #######################
 # PRIVATE             #
@@ -123,7 +123,7 @@ class LastFMWebHelper:
         """
             Get artist biography
             @param artist as str
-            @return content as bytes/None
+            @return content as bytes/None if failed, empty if not found
         """
         if not get_network_available("LASTFM"):
             return None
@@ -136,6 +136,9 @@ class LastFMWebHelper:
             (status, data) = App().task_helper.load_uri_content_sync(uri, None)
             if status:
                 content = json.loads(data.decode("utf-8"))
+                # Error 6: artist not found
+                if content.get("error") == 6:
+                    return b""
                 bio = content["artist"]["bio"]["content"]
                 bio = re.sub(r"<.*Last.fm.*>.", "", bio)
                 return bio.encode(encoding="UTF-8")
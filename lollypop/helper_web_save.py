@@ -16,6 +16,7 @@ from time import time
 import json
 
 from lollypop.logger import Logger
+from lollypop.sqlcursor import SqlCursor
 from lollypop.utils import emit_signal
 from lollypop.utils import get_lollypop_album_id, get_lollypop_track_id
 from lollypop.objects_album import Album
@@ -34,6 +35,8 @@ class SaveWebHelper(GObject.Object):
         "match-artist": (GObject.SignalFlags.RUN_FIRST, None, (int, int)),
         "finished": (GObject.SignalFlags.RUN_FIRST, None, ()),
     }
+    # Parallel requests when fetching many payloads
+    MAX_WORKERS = 4
 
     def __init__(self):
         """
@@ -81,12 +84,68 @@ class SaveWebHelper(GObject.Object):
         item = self.__save_album(payload, storage_type)
         album = Album(item.album_id)
         if notify:
+            # Show album now, widgets are updated when artwork is saved
+            emit_signal(self, "match-album", album.id, storage_type)
             self.save_artwork(album,
                               payload["artwork-uri"],
                               cancellable)
-            emit_signal(self, "match-album", album.id, storage_type)
         return item
 
+    def save_payloads_to_db(self, payloads, storage_type,
+                            notify, cancellable):
+        """
+            Save albums and tracks to DB in one transaction
+            Artwork is downloaded for new albums or albums without stored
+            artwork and signals are emitted once committed
+            @param payloads as [({}, {}/None)] as [(album, track)]
+            @param storage_type as StorageType
+            @param notify as bool
+            @param cancellable as Gio.Cancellable
+        """
+        saved = []
+        SqlCursor.add(App().db)
+        try:
+            for (album_payload, track_payload) in payloads:
+                if cancellable.is_cancelled():
+                    break
+                lp_album_id = get_lollypop_album_id(album_payload["name"],
+                                                    album_payload["artists"])
+                exists = App().albums.get_id_for_lp_album_id(lp_album_id) >= 0
+                item = self.save_album_payload_to_db(album_payload,
+                                                     storage_type,
+                                                     False,
+                                                     cancellable)
+                track_id = None
+                if track_payload is not None:
+                    self.save_track_payload_to_db(track_payload,
+                                                  item,
+                                                  storage_type,
+                                                  False,
+                                                  cancellable)
+                    track_id = item.track_id
+                saved.append((album_payload, item.album_id,
+                              track_id, exists))
+        finally:
+            SqlCursor.remove(App().db)
+        if not notify:
+            return
+        album_ids = []
+        for (album_payload, album_id, track_id, exists) in saved:
+            if cancellable.is_cancelled():
+                break
+            if album_id not in album_ids:
+                album_ids.append(album_id)
+                album = Album(album_id)
+                # Do not download artwork again for known albums
+                if not exists or\
+                        App().art.get_album_artwork_uri(album) is None:
+                    self.save_artwork(album,
+                                      album_payload["artwork-uri"],
+                                      cancellable)
+                emit_signal(self, "match-album", album_id, storage_type)
+            if track_id is not None:
+                emit_signal(self, "match-track", track_id, storage_type)
+
     def save_artwork(self, obj, cover_uri, cancellable):
         """
             Save artwork for obj
@@ -85,11 +85,10 @@ class SpotifyWebHelper:
             Get top tracks for spotify id
             @param spotify_id as str
             @param cancellable as Gio.Cancellable
-            @return str
+            @return [{}] as track payloads
         """
         try:
             locale = getdefaultlocale()[0][0:2]
-            track_ids = []
             token = App().ws_director.token_ws.get_token("SPOTIFY",
                                                          cancellable)
             bearer = "Bearer %s" % token
@@ -102,11 +101,10 @@ class SpotifyWebHelper:
                     uri, headers, cancellable)
             if status:
                 decode = json.loads(data.decode("utf-8"))
-                for item in decode["tracks"]:
-                    track_ids.append(item["id"])
+                return decode["tracks"]
         except Exception as e:
             Logger.error("SpotifyWebHelper::get_artist_top_tracks(): %s", e)
-        return track_ids
+        return []
 
     def lollypop_album_payload(self, payload):
         """
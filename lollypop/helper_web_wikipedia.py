@@ -41,12 +41,14 @@ class WikipediaHelper:
         """
             Get content for term
             @param term as str
-            @return bytes/None
+            @return bytes/None if search failed, empty if no page found
         """
         try:
             (locale, page_id) = self.__search_term(term)
-            if page_id is None:
+            if locale is None:
                 return None
+            elif page_id is None:
+                return b""
             uri = self.__API_INFO % (locale, page_id)
             (status, data) = App().task_helper.load_uri_content_sync(uri)
             if status:
@@ -101,23 +103,26 @@ class WikipediaHelper:
         """
             Search term on Wikipdia
             @param term as str
-            @return pageid as str
+            @return (locale as str, pageid as str)
+                    (None, None) if search failed, ("", None) if not found
         """
         try:
             for locale in [self.__locale, "en"]:
                 uri = self.__API_SEARCH % (locale, term)
                 (status, data) = App().task_helper.load_uri_content_sync(uri)
-                if status:
-                    decode = json.loads(data.decode("utf-8"))
-                    for item in decode["query"]["search"]:
-                        if escape(item["title"].lower()) ==\
-                                escape(term.lower()):
-                            return (locale, item["pageid"])
-                        else:
-                            for word in [_("band"), _("singer"),
-                                         "band", "singer"]:
-                                if item["snippet"].lower().find(word) != -1:
-                                    return (locale, item["pageid"])
+                if not status:
+                    return (None, None)
+                decode = json.loads(data.decode("utf-8"))
+                for item in decode["query"]["search"]:
+                    if escape(item["title"].lower()) ==\
+                            escape(term.lower()):
+                        return (locale, item["pageid"])
+                    else:
+                        for word in [_("band"), _("singer"),
+                                     "band", "singer"]:
+                            if item["snippet"].lower().find(word) != -1:
+                                return (locale, item["pageid"])
+            return ("", None)
         except Exception as e:
             print("Wikipedia::__search_term(): %s", e)
-        return ("", None)
+        return (None, None)
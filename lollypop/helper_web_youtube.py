@@ -10,13 +10,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from gi.repository import GLib, Gio
-
-from re import sub
-
 from lollypop.helper_web_base import BaseWebHelper
+from lollypop.define import App
 from lollypop.utils import emit_signal
-from lollypop.utils_file import get_youtube_dl
 from lollypop.logger import Logger
 
 
@@ -41,45 +37,18 @@ class YouTubeWebHelper(BaseWebHelper):
             @return content uri as str/None
         """
         Logger.info("Loading %s with YouTube", uri)
-        try:
-            proxy = GLib.environ_getenv(GLib.get_environ(), "all_proxy")
-            if proxy is not None and proxy.startswith("socks://"):
-                proxy = proxy.replace("socks://", "socks4://")
-            (path, env) = get_youtube_dl()
-            # Remove playlist args
-            uri = sub("list=.*", "", uri)
-            argv = [path, "--no-cache-dir", "-g", "-f", "bestaudio", uri]
-            if proxy is not None:
-                argv += ["--proxy", proxy, None]
-            else:
-                argv.append(None)
-            process = Gio.Subprocess.new(argv, Gio.SubprocessFlags.STDOUT_PIPE)
-            process.wait_async(cancellable, self.__on_youtube_dl, cancellable)
-        except Exception as e:
-            Logger.error("YouTubeWebHelper::get_uri_content(): %s", e)
+        # Warm youtube-dl process, see StreamResolverHelper
+        App().task_helper.run(
+            App().stream_resolver.youtube_dl.get_stream_uri,
+            uri, cancellable,
+            callback=(self.__on_stream_uri,))
 
 #######################
 # PRIVATE             #
 #######################
-    def __on_youtube_dl(self, process, result, cancellable):
+    def __on_stream_uri(self, content):
         """
             Emit signal for content
-            @param process as Gio.Subprocess.
-            @param result as Gio.AsyncResult
-            @param cancellable as Gio.Cancellable
+            @param content as str/None
         """
-        try:
-            content = ""
-            status = process.wait_check_finish(result)
-            if status:
-                stream = process.get_stdout_pipe()
-                bytes = bytearray(0)
-                buf = stream.read_bytes(1024, cancellable).get_data()
-                while buf:
-                    bytes += buf
-                    buf = stream.read_bytes(1024, cancellable).get_data()
-                stream.close()
-                content = bytes.decode("utf-8")
-        except Exception as e:
-            Logger.warning("YouTubeWebHelper::__on_youtube_dl(): %s", e)
-        emit_signal(self, "uri-content-loaded", content)
+        emit_signal(self, "uri-content-loaded", content or "")
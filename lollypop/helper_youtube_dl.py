@@ -0,0 +1,233 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import GLib
+
+from re import sub
+from select import select
+from subprocess import Popen, PIPE, DEVNULL, run
+from threading import Lock
+from time import time
+import json
+import os
+import sys
+
+from lollypop.define import App
+from lollypop.utils_file import get_youtube_dl
+from lollypop.logger import Logger
+
+
+class YoutubeDLHelper:
+    """
+        Get stream uris with a warm youtube-dl process
+        youtube_dl module is imported once, uris are sent on stdin
+        Falls back to one youtube-dl process per uri, also used when
+        worker is busy so playback never waits for a prefetch
+    """
+
+    # Seconds before giving up on an uri
+    __TIMEOUT = 30
+    # Seconds before starting worker again after a failure, doubled on
+    # each failure
+    __RETRY_DELAY = 60
+    __MAX_RETRY_DELAY = 3600
+    __WORKER = """
+import json
+import sys
+from youtube_dl import YoutubeDL
+options = {"format": "bestaudio", "quiet": True, "no_warnings": True,
+           "cachedir": False, "noplaylist": True}
+if len(sys.argv) > 1:
+    options["proxy"] = sys.argv[1]
+ydl = YoutubeDL(options)
+sys.stdout.write("ready\\n")
+sys.stdout.flush()
+for line in sys.stdin:
+    try:
+        url = ydl.extract_info(line.strip(), download=False).get("url", "")
+    except Exception:
+        url = ""
+    sys.stdout.write(json.dumps(url) + "\\n")
+    sys.stdout.flush()
+"""
+
+    def __init__(self):
+        """
+            Init helper
+        """
+        self.__lock = Lock()
+        self.__process = None
+        self.__retry_time = 0
+        self.__retry_delay = self.__RETRY_DELAY
+
+    def start(self):
+        """
+            Start worker in background
+        """
+        App().task_helper.run(self.__start_locked)
+
+    def stop(self):
+        """
+            Stop worker
+        """
+        if self.__process is not None:
+            self.__process.kill()
+            self.__process = None
+
+    def get_stream_uri(self, uri, cancellable):
+        """
+            Get stream uri for uri
+            @param uri as str
+            @param cancellable as Gio.Cancellable
+            @return str, empty if not found
+            @thread safe
+        """
+        # Remove playlist args
+        uri = sub("list=.*", "", uri)
+        # Worker busy (starting or resolving another uri): do not wait
+        if self.__lock.acquire(False):
+            try:
+                if cancellable.is_cancelled():
+                    return ""
+                if self.__start():
+                    stream_uri = self.__get_from_worker(uri)
+                    if stream_uri is not None:
+                        return stream_uri
+            finally:
+                self.__lock.release()
+        elif cancellable.is_cancelled():
+            return ""
+        return self.__get_from_process(uri)
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_proxy(self):
+        """
+            Get proxy from environment
+            @return str/None
+        """
+        proxy = GLib.environ_getenv(GLib.get_environ(), "all_proxy")
+        if proxy is not None and proxy.startswith("socks://"):
+            proxy = proxy.replace("socks://", "socks4://")
+        return proxy
+
+    def __get_environ(self, env):
+        """
+            Get process environment
+            @param env as [str], "KEY=value" items
+            @return {}
+        """
+        environ = dict(os.environ)
+        for item in env:
+            (key, value) = item.split("=", 1)
+            environ[key] = value
+        return environ
+
+    def __start_locked(self):
+        """
+            Start worker, take lock
+        """
+        with self.__lock:
+            self.__start()
+
+    def __start(self):
+        """
+            Start worker if needed, lock must be held
+            @return True if worker is running
+        """
+        if self.__process is not None and self.__process.poll() is None:
+            return True
+        if time() < self.__retry_time:
+            return False
+        try:
+            (path, env) = get_youtube_dl()
+            if path is None:
+                raise Exception("youtube-dl not found")
+            argv = [sys.executable, "-c", self.__WORKER]
+            proxy = self.__get_proxy()
+            if proxy is not None:
+                argv.append(proxy)
+            self.__process = Popen(argv, stdin=PIPE, stdout=PIPE,
+                                   stderr=DEVNULL,
+                                   env=self.__get_environ(env),
+                                   universal_newlines=True, bufsize=1)
+            if self.__readline() == "ready":
+                Logger.info("youtube-dl worker started")
+                self.__retry_delay = self.__RETRY_DELAY
+                return True
+        except Exception as e:
+            Logger.warning("YoutubeDLHelper::__start(): %s", e)
+        # youtube_dl module not importable or slow import, use youtube-dl
+        # command until next try
+        self.__retry_time = time() + self.__retry_delay
+        self.__retry_delay = min(self.__retry_delay * 2,
+                                 self.__MAX_RETRY_DELAY)
+        self.stop()
+        return False
+
+    def __readline(self):
+        """
+            Read a line from worker, kill it on timeout
+            @return str/None
+        """
+        (ready, w, x) = select([self.__process.stdout], [], [],
+                               self.__TIMEOUT)
+        if not ready:
+            Logger.warning("YoutubeDLHelper::__readline(): timeout")
+            self.stop()
+            return None
+        line = self.__process.stdout.readline()
+        if not line:
+            self.stop()
+            return None
+        return line.strip()
+
+    def __get_from_worker(self, uri):
+        """
+            Get stream uri from worker, lock must be held
+            @param uri as str
+            @return str/None if worker failed
+        """
+        try:
+            self.__process.stdin.write(uri + "\n")
+            self.__process.stdin.flush()
+            line = self.__readline()
+            if line is not None:
+                return json.loads(line)
+        except Exception as e:
+            Logger.warning("YoutubeDLHelper::__get_from_worker(): %s", e)
+            self.stop()
+        return None
+
+    def __get_from_process(self, uri):
+        """
+            Get stream uri with a youtube-dl process
+            @param uri as str
+            @return str
+        """
+        try:
+            (path, env) = get_youtube_dl()
+            if path is None:
+                return ""
+            argv = [path, "--no-cache-dir", "-g", "-f", "bestaudio", uri]
+            proxy = self.__get_proxy()
+            if proxy is not None:
+                argv += ["--proxy", proxy]
+            result = run(argv, stdout=PIPE, stderr=DEVNULL,
+                         env=self.__get_environ(env),
+                         timeout=self.__TIMEOUT, universal_newlines=True)
+            if result.returncode == 0:
+                return result.stdout.strip()
+        except Exception as e:
+            Logger.warning("YoutubeDLHelper::__get_from_process(): %s", e)
+        return ""
@@ -49,7 +49,7 @@ class InformationDownloader:
         """
             Get artist info from audiodb
             @param artist as str
-            @return info as bytes
+            @return info as bytes/None if failed, empty if not found
         """
         if not get_network_available("AUDIODB"):
             return None
@@ -61,12 +61,13 @@ class InformationDownloader:
             if status:
                 decode = json.loads(data.decode("utf-8"))
                 language = getdefaultlocale()[0][-2:]
-                for item in decode["artists"]:
+                for item in decode["artists"] or []:
                     for key in ["strBiography%s" % language,
                                 "strBiographyEN"]:
                         info = item[key]
                         if info is not None:
                             return info.encode("utf-8")
+                return b""
         except Exception as e:
             Logger.error("InfoDownloader::_get_audiodb_artist_info: %s, %s" %
                          (e, artist))
@@ -74,9 +75,9 @@ class InformationDownloader:
 
     def _get_lastfm_artist_info(self, artist):
         """
-            Get artist info from audiodb
+            Get artist info from Last.fm
             @param artist as str
-            @return info as bytes
+            @return info as bytes/None if failed, empty if not found
         """
         if get_network_available("LASTFM"):
             from lollypop.helper_web_lastfm import LastFMWebHelper
@@ -87,6 +88,16 @@ class InformationDownloader:
 #######################
 # PRIVATE             #
 #######################
+    def __get_wikipedia_artist_info(self, artist):
+        """
+            Get artist info from Wikipedia
+            @param artist as str
+            @return info as bytes/None if failed, empty if not found
+        """
+        from lollypop.helper_web_wikipedia import WikipediaHelper
+        wikipedia = WikipediaHelper()
+        return wikipedia.get_content_for_term(artist)
+
     def __get_information(self, artist, callback, *args):
         """
             Get information for artist
@@ -96,16 +107,24 @@ class InformationDownloader:
         content = None
         try:
             # Try from Wikipedia first
-            if get_network_available("WIKIPEDIA"):
-                from lollypop.helper_web_wikipedia import WikipediaHelper
-                wikipedia = WikipediaHelper()
-                content = wikipedia.get_content_for_term(artist)
-            if content is None:
-                for method in [self._get_audiodb_artist_info,
-                               self._get_lastfm_artist_info]:
-                    content = method(artist)
-                    if content is not None:
-                        break
-            callback(content, *args)
+            methods = [("Wikipedia", self.__get_wikipedia_artist_info),
+                       ("AudioDB", self._get_audiodb_artist_info),
+                       ("Last.fm", self._get_lastfm_artist_info)]
+            for (api, method) in methods:
+                if not get_network_available(api.upper().replace(".", "")):
+                    continue
+                provider = "info:%s" % api
+                if App().cache.is_negative(provider, artist):
+                    continue
+                content = method(artist)
+                # Failed, retry next time
+                if content is None:
+                    continue
+                elif not content:
+                    App().cache.add_negative(provider, artist)
+                else:
+                    App().cache.clear_negative(provider, artist)
+                    break
+            callback(content or None, *args)
         except Exception as e:
             Logger.info("InfoDownloader::__get_information(): %s" % e)
@@ -14,6 +14,7 @@ from gi.repository import Gio, GObject
 
 from hashlib import md5
 
+from lollypop.define import App
 from lollypop.logger import Logger
 from lollypop.information_downloader import InformationDownloader
 
@@ -44,6 +45,7 @@ class InformationStore(GObject.Object, InformationDownloader):
             f = Gio.File.new_for_path(filepath)
             if f.query_exists():
                 (status, content, tag) = f.load_contents()
+                App().cache_quota.touch(filepath)
         except Exception as e:
             Logger.error("InformationStore::get_information(): %s", e)
         return content
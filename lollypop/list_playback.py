@@ -0,0 +1,255 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from array import array
+
+from lollypop.define import App, Type
+
+
+class PlaybackList:
+    """
+        Albums in playback
+        Album ids are kept in an array, Album objects are created on demand
+        Behaves like a list of albums
+    """
+
+    def __init__(self, albums=[]):
+        """
+            Init list
+            @param albums as [Album]
+        """
+        self.__ids = array("q")
+        # Album, None if not loaded or
+        # [genre ids, artist ids, track ids, Album/None]
+        # if not loaded with a tracks subset, shared with copies
+        self.__albums = []
+        # Albums created on demand, shared with copies
+        self.__loaded = {}
+        self.__skipped = True
+        # {album id: [index]}, None if needs rebuild
+        self.__positions = None
+        for album in albums:
+            self.append(album)
+
+    def set_ids(self, album_ids, skipped):
+        """
+            Set album ids, albums are created on demand
+            @param album_ids as [int]
+            @param skipped as bool
+        """
+        self.__ids = array("q", album_ids)
+        self.__albums = [None] * len(self.__ids)
+        self.__loaded = {}
+        self.__skipped = skipped
+        self.__positions = None
+
+    def set_album_tracks(self, index, genre_ids, artist_ids, track_ids):
+        """
+            Restrict album at index to tracks, album is created on demand
+            @param index as int
+            @param genre_ids as [int]
+            @param artist_ids as [int]
+            @param track_ids as [int]
+        """
+        self.__albums[index] = [genre_ids, artist_ids, track_ids, None]
+
+    def append(self, album):
+        """
+            Append album
+            @param album as Album
+        """
+        album_id = Type.NONE if album.id is None else album.id
+        if self.__positions is not None:
+            self.__positions.setdefault(album_id, []).append(len(self.__ids))
+        self.__ids.append(album_id)
+        self.__albums.append(album)
+
+    def remove(self, album):
+        """
+            Remove album
+            @param album as Album
+        """
+        self.pop(self.index(album))
+
+    def pop(self, index=-1):
+        """
+            Remove album at index
+            @param index as int
+            @return Album
+        """
+        album = self[index]
+        del self.__ids[index]
+        del self.__albums[index]
+        self.__positions = None
+        return album
+
+    def index(self, album):
+        """
+            Get album index
+            @param album as Album
+            @return int
+            @raise ValueError
+        """
+        album_id = Type.NONE if album.id is None else album.id
+        for index in self.__get_positions().get(album_id, []):
+            if self[index] is album:
+                return index
+        raise ValueError("album not in playback")
+
+    def get_albums_for_id(self, album_id):
+        """
+            Get albums for id
+            @param album_id as int
+            @return [Album]
+        """
+        return [self[index]
+                for index in self.__get_positions().get(album_id, [])]
+
+    def has_album_id(self, album_id):
+        """
+            True if album id in playback
+            @param album_id as int
+            @return bool
+        """
+        return album_id in self.__get_positions().keys()
+
+    def copy(self):
+        """
+            Get a shallow copy, albums created on demand are shared
+            @return PlaybackList
+        """
+        playback = PlaybackList()
+        playback.__ids = array("q", self.__ids)
+        playback.__albums = list(self.__albums)
+        playback.__loaded = self.__loaded
+        playback.__skipped = self.__skipped
+        return playback
+
+    @property
+    def state(self):
+        """
+            Get compact state, albums are not created
+            Only albums restricted to a tracks subset are saved with tracks,
+            genres and artists
+            @return {}
+        """
+        subsets = []
+        for (index, album) in enumerate(self.__albums):
+            if isinstance(album, list):
+                if album[3] is None:
+                    subsets.append([index] + album[:3])
+                    continue
+                album = album[3]
+            if album is not None:
+                track_ids = album.track_ids
+                # Full albums are restored from DB with their current tracks
+                if track_ids != self.__get_album_track_ids(album.id):
+                    subsets.append([index, album.genre_ids,
+                                    album.artist_ids, track_ids])
+        return {"ids": self.__ids.tolist(),
+                "skipped": self.__skipped,
+                "subsets": subsets}
+
+    def set_state(self, state):
+        """
+            Restore state, albums are created on demand
+            @param state as {}
+        """
+        self.set_ids(state["ids"], state["skipped"])
+        for (index, genre_ids, artist_ids, track_ids) in state["subsets"]:
+            self.set_album_tracks(index, genre_ids, artist_ids, track_ids)
+
+    @property
+    def ids(self):
+        """
+            Get album ids
+            @return [int]
+        """
+        return self.__ids.tolist()
+
+    @property
+    def track_ids(self):
+        """
+            Get track ids for all albums, without creating albums
+            @return [int]
+        """
+        album_ids = []
+        track_ids = []
+        for (album_id, album) in zip(self.__ids, self.__albums):
+            if isinstance(album, list):
+                track_ids += album[2]
+                continue
+            if album is None:
+                album = self.__loaded.get(album_id, None)
+            if album is None:
+                album_ids.append(album_id)
+            else:
+                track_ids += album.track_ids
+        track_ids += App().albums.get_track_ids_for_ids(album_ids,
+                                                        self.__skipped)
+        return track_ids
+
+    def __len__(self):
+        return len(self.__ids)
+
+    def __getitem__(self, index):
+        album = self.__albums[index]
+        if isinstance(album, list):
+            if album[3] is None:
+                from lollypop.objects_album import Album
+                album[3] = Album(self.__ids[index], album[0], album[1],
+                                 self.__skipped)
+                album[3].set_track_ids(album[2])
+            album = album[3]
+        elif album is None:
+            album_id = self.__ids[index]
+            album = self.__loaded.get(album_id, None)
+            if album is None:
+                from lollypop.objects_album import Album
+                album = Album(album_id, [], [], self.__skipped)
+                self.__loaded[album_id] = album
+            self.__albums[index] = album
+        return album
+
+    def __iter__(self):
+        for index in range(0, len(self.__ids)):
+            yield self[index]
+
+    def __contains__(self, album):
+        try:
+            self.index(album)
+            return True
+        except ValueError:
+            return False
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_album_track_ids(self, album_id):
+        """
+            Get all tracks for album, without genres/artists filters
+            @param album_id as int
+            @return [int]
+        """
+        from lollypop.objects_album import Album
+        return Album(album_id, [], [], self.__skipped).track_ids
+
+    def __get_positions(self):
+        """
+            Get album ids positions, rebuild index if needed
+            @return {int: [int]}
+        """
+        if self.__positions is None:
+            self.__positions = {}
+            for (index, album_id) in enumerate(self.__ids):
+                self.__positions.setdefault(album_id, []).append(index)
+        return self.__positions
@@ -0,0 +1,109 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+from itertools import islice
+
+
+class QueueList:
+    """
+        Ordered set of track ids
+        Membership, append, prepend and remove are O(1)
+        Positions are cached until an id is moved or removed
+    """
+
+    def __init__(self, track_ids=[]):
+        """
+            Init list
+            @param track_ids as [int]
+        """
+        self.__ids = OrderedDict.fromkeys(track_ids)
+        # {track id: index}, None if needs rebuild
+        self.__positions = None
+
+    def append(self, track_id):
+        """
+            Append id, move it if already present
+            @param track_id as int
+        """
+        if track_id in self.__ids.keys():
+            self.__ids.move_to_end(track_id)
+            self.__positions = None
+        else:
+            self.__ids[track_id] = None
+            # Appending does not move other ids
+            if self.__positions is not None:
+                self.__positions[track_id] = len(self.__ids) - 1
+
+    def insert(self, track_id, pos=0):
+        """
+            Insert id at position, move it if already present
+            @param track_id as int
+            @param pos as int
+        """
+        self.__ids.pop(track_id, None)
+        if pos == 0:
+            self.__ids[track_id] = None
+            self.__ids.move_to_end(track_id, last=False)
+        else:
+            track_ids = list(self.__ids.keys())
+            track_ids.insert(pos, track_id)
+            self.__ids = OrderedDict.fromkeys(track_ids)
+        self.__positions = None
+
+    def remove(self, track_id):
+        """
+            Remove id if present
+            @param track_id as int
+            @return True if removed
+        """
+        if track_id not in self.__ids.keys():
+            return False
+        del self.__ids[track_id]
+        self.__positions = None
+        return True
+
+    def clear(self):
+        """
+            Remove all ids
+        """
+        self.__ids = OrderedDict()
+        self.__positions = None
+
+    def index(self, track_id):
+        """
+            Get id position
+            @param track_id as int
+            @return int
+            @raise KeyError
+        """
+        if self.__positions is None:
+            self.__positions = {track_id: index for (index, track_id)
+                                in enumerate(self.__ids.keys())}
+        return self.__positions[track_id]
+
+    def head(self, count):
+        """
+            Get first ids
+            @param count as int
+            @return [int]
+        """
+        return list(islice(self.__ids.keys(), count))
+
+    def __len__(self):
+        return len(self.__ids)
+
+    def __iter__(self):
+        return iter(self.__ids.keys())
+
+    def __contains__(self, track_id):
+        return track_id in self.__ids.keys()
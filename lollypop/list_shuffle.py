@@ -0,0 +1,218 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from array import array
+from random import randrange
+
+
+class ShuffleList:
+    """
+        Shuffled list of track ids with history
+        Ids before __drawn have been played, others are waiting:
+        permutation is built on demand (Fisher-Yates)
+        Played ids are kept in a bitset, even if removed from list
+    """
+
+    def __init__(self):
+        """
+            Init list
+        """
+        self.__ids = array("q")
+        # {track id: index in __ids}
+        self.__positions = {}
+        self.__drawn = 0
+        self.__played = bytearray()
+        self.__history = array("q")
+        self.__history_index = -1
+
+    def add(self, track_ids):
+        """
+            Add track ids, already present ids are ignored
+            @param track_ids as [int]
+        """
+        for track_id in track_ids:
+            if track_id in self.__positions.keys():
+                continue
+            self.__positions[track_id] = len(self.__ids)
+            self.__ids.append(track_id)
+            if self.is_played(track_id):
+                self.__swap(len(self.__ids) - 1, self.__drawn)
+                self.__drawn += 1
+
+    def remove(self, track_ids):
+        """
+            Remove track ids
+            @param track_ids as [int]
+        """
+        for track_id in track_ids:
+            index = self.__positions.get(track_id, None)
+            if index is None:
+                continue
+            # Keep played ids contiguous
+            if index < self.__drawn:
+                self.__drawn -= 1
+                self.__swap(index, self.__drawn)
+                index = self.__drawn
+            self.__swap(index, len(self.__ids) - 1)
+            self.__ids.pop()
+            del self.__positions[track_id]
+
+    def clear(self):
+        """
+            Remove all ids and played state, keep history
+        """
+        self.__ids = array("q")
+        self.__positions = {}
+        self.__drawn = 0
+        self.__played = bytearray()
+
+    def reset(self):
+        """
+            Mark all ids as not played and clear history
+        """
+        self.__drawn = 0
+        self.__played = bytearray()
+        self.__history = array("q")
+        self.__history_index = -1
+
+    def draw(self):
+        """
+            Get a random not played id, id is not marked as played
+            @return int/None
+        """
+        if self.__drawn >= len(self.__ids):
+            return None
+        index = randrange(self.__drawn, len(self.__ids))
+        self.__swap(index, self.__drawn)
+        return self.__ids[self.__drawn]
+
+    def set_played(self, track_id):
+        """
+            Mark id as played
+            @param track_id as int
+        """
+        (byte, bit) = self.__get_bit(track_id)
+        if byte >= len(self.__played):
+            self.__played.extend(bytes(byte - len(self.__played) + 1))
+        self.__played[byte] |= bit
+        index = self.__positions.get(track_id, None)
+        if index is not None and index >= self.__drawn:
+            self.__swap(index, self.__drawn)
+            self.__drawn += 1
+
+    def is_played(self, track_id):
+        """
+            True if id has been played
+            @param track_id as int
+            @return bool
+        """
+        (byte, bit) = self.__get_bit(track_id)
+        return byte < len(self.__played) and\
+            self.__played[byte] & bit != 0
+
+    def push(self, track_id):
+        """
+            Move history to id, forward history is lost if id is new
+            @param track_id as int
+        """
+        if self.next_id == track_id:
+            self.__history_index += 1
+        elif self.prev_id == track_id:
+            self.__history_index -= 1
+        elif self.current_id != track_id:
+            del self.__history[self.__history_index + 1:]
+            self.__history.append(track_id)
+            self.__history_index += 1
+
+    def set_history(self, track_ids, index):
+        """
+            Set history, ids are marked as played
+            @param track_ids as [int]
+            @param index as int, current id index
+        """
+        self.__history = array("q", track_ids)
+        self.__history_index = min(index, len(self.__history) - 1)
+        for track_id in track_ids:
+            self.set_played(track_id)
+
+    @property
+    def history(self):
+        """
+            Get history
+            @return ([int], int) as ids and current id index
+        """
+        return (self.__history.tolist(), self.__history_index)
+
+    @property
+    def current_id(self):
+        """
+            Get current id in history
+            @return int/None
+        """
+        if self.__history_index < 0:
+            return None
+        return self.__history[self.__history_index]
+
+    @property
+    def next_id(self):
+        """
+            Get next id in history
+            @return int/None
+        """
+        if self.__history_index + 1 >= len(self.__history):
+            return None
+        return self.__history[self.__history_index + 1]
+
+    @property
+    def prev_id(self):
+        """
+            Get previous id in history
+            @return int/None
+        """
+        if self.__history_index < 1:
+            return None
+        return self.__history[self.__history_index - 1]
+
+    @property
+    def count(self):
+        """
+            Get ids count
+            @return int
+        """
+        return len(self.__ids)
+
+#######################
+# PRIVATE             #
+#######################
+    def __swap(self, i, j):
+        """
+            Swap ids at indexes i and j
+            @param i as int
+            @param j as int
+        """
+        if i == j:
+            return
+        (self.__ids[i], self.__ids[j]) = (self.__ids[j], self.__ids[i])
+        self.__positions[self.__ids[i]] = i
+        self.__positions[self.__ids[j]] = j
+
+    def __get_bit(self, track_id):
+        """
+            Get bitset position for id, negative ids are interleaved
+            @param track_id as int
+            @return (int, int) as byte index and bit mask
+        """
+        if track_id >= 0:
+            index = track_id << 1
+        else:
+            index = (-track_id << 1) - 1
+        return (index >> 3, 1 << (index & 7))
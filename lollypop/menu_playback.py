@@ -16,7 +16,7 @@ from gettext import gettext as _
 
 from lollypop.define import App, ViewType, Type
 from lollypop.utils_album import tracks_to_albums
-from lollypop.utils import get_default_storage_type, emit_signal
+from lollypop.utils import get_default_storage_type
 from lollypop.utils import get_network_available
 from lollypop.objects_track import Track
 from lollypop.objects_album import Album
@@ -592,10 +592,9 @@ class TrackPlaybackMenu(PlaybackMenu):
             True if current object in player
             return bool
         """
-        for album in App().player.albums:
-            if self.__track.album.id == album.id:
-                if self.__track.id in album.track_ids:
-                    return True
+        for album in App().player.get_albums_for_id(self.__track.album.id):
+            if self.__track.id in album.track_ids:
+                return True
         return False
 
 #######################
@@ -621,13 +620,12 @@ class TrackPlaybackMenu(PlaybackMenu):
             @param Gio.SimpleAction
             @param GLib.Variant
         """
-        for album in App().player.albums:
-            if album.id == self.__track.album.id:
-                if self.__track.id in album.track_ids:
-                    index = album.track_ids.index(self.__track.id)
-                    track = album.tracks[index]
-                    App().player.remove_track_from_album(track, album)
-                    break
+        for album in App().player.get_albums_for_id(self.__track.album.id):
+            if self.__track.id in album.track_ids:
+                index = album.track_ids.index(self.__track.id)
+                track = album.tracks[index]
+                App().player.remove_track_from_album(track, album)
+                break
 
 #######################
 # PRIVATE             #
@@ -636,7 +634,7 @@ class TrackPlaybackMenu(PlaybackMenu):
         """
             Set queue actions
         """
-        if self.__track.id not in App().player.queue:
+        if not App().player.is_in_queue(self.__track.id):
             append_queue_action = Gio.SimpleAction(name="append_queue_action")
             App().add_action(append_queue_action)
             append_queue_action.connect("activate",
@@ -682,8 +680,7 @@ class TrackPlaybackMenu(PlaybackMenu):
             @param Gio.SimpleAction
             @param GLib.Variant
         """
-        App().player.append_to_queue(self.__track.id, False)
-        emit_signal(App().player, "queue-changed")
+        App().player.append_to_queue(self.__track.id)
 
     def __remove_from_queue(self, action, variant):
         """
@@ -691,5 +688,4 @@ class TrackPlaybackMenu(PlaybackMenu):
             @param Gio.SimpleAction
             @param GLib.Variant
         """
-        App().player.remove_from_queue(self.__track.id, False)
-        emit_signal(App().player, "queue-changed")
+        App().player.remove_from_queue(self.__track.id)
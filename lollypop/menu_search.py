@@ -31,52 +31,45 @@ class SearchMenu(Gio.Menu):
         if header:
             from lollypop.menu_header import MenuHeader
             self.append_item(MenuHeader(_("Search"), "edit-find-symbolic"))
-        search_action = Gio.SimpleAction.new_stateful(
-            "web_search",
-            GLib.VariantType.new("s"),
-            GLib.Variant("s", "NONE"))
-        App().add_action(search_action)
         section = Gio.Menu()
         self.append_section(_("Search on the Web"), section)
-        menu_item = Gio.MenuItem.new(_("Disabled"),
-                                     "app.web_search('NONE')")
-        section.append_item(menu_item)
-
         if not get_network_available("YOUTUBE"):
             return
 
-        web_search = App().settings.get_value("web-search")
-        if web_search.get_string() != "NONE":
-            if get_network_available(web_search.get_string()):
-                search_action.set_state(web_search)
-        search_action.connect("change-state",
-                              self.__on_search_change_state)
-
-        if get_network_available("DEEZER"):
-            menu_item = Gio.MenuItem.new(_("Deezer"),
-                                         "app.web_search('DEEZER')")
-            section.append_item(menu_item)
-        if get_network_available("LASTFM"):
-            menu_item = Gio.MenuItem.new(_("Last.fm"),
-                                         "app.web_search('LASTFM')")
-            section.append_item(menu_item)
-        if get_network_available("MUSICBRAINZ"):
-            menu_item = Gio.MenuItem.new(_("MusicBrainz"),
-                                         "app.web_search('MUSICBRAINZ')")
-            section.append_item(menu_item)
-        if get_network_available("SPOTIFY"):
-            menu_item = Gio.MenuItem.new(_("Spotify"),
-                                         "app.web_search('SPOTIFY')")
+        # Checked web searches are queried at once
+        names = App().settings.get_value("web-search").get_string().split(",")
+        for (name, label) in [("DEEZER", _("Deezer")),
+                              ("LASTFM", _("Last.fm")),
+                              ("MUSICBRAINZ", _("MusicBrainz")),
+                              ("SPOTIFY", _("Spotify"))]:
+            if not get_network_available(name):
+                continue
+            action_name = "web_search_%s" % name.lower()
+            search_action = Gio.SimpleAction.new_stateful(
+                action_name,
+                None,
+                GLib.Variant("b", name in names))
+            search_action.connect("change-state",
+                                  self.__on_search_change_state,
+                                  name)
+            App().add_action(search_action)
+            menu_item = Gio.MenuItem.new(label, "app.%s" % action_name)
             section.append_item(menu_item)
 
 #######################
 # PRIVATE             #
 #######################
-    def __on_search_change_state(self, action, value):
+    def __on_search_change_state(self, action, value, name):
         """
-            Update search setting
+            Add/remove web search from setting
             @param action as Gio.SimpleAction
-            @param value as bool
+            @param value as GLib.Variant
+            @param name as str
         """
-        App().settings.set_value("web-search", value)
+        web_search = App().settings.get_value("web-search").get_string()
+        names = [n for n in web_search.split(",") if n not in ["NONE", name]]
+        if value:
+            names.append(name)
+        App().settings.set_value("web-search",
+                                 GLib.Variant("s", ",".join(names) or "NONE"))
         action.set_state(value)
@@ -194,6 +194,13 @@ class Album(Base):
             new_album._tracks = new_tracks
             self._tracks = tracks
 
+    def set_track_ids(self, track_ids):
+        """
+            Set album tracks from ids
+            @param track_ids as [int]
+        """
+        self._tracks = [Track(track_id, self) for track_id in track_ids]
+
     def append_track(self, track, clone=True):
         """
             Append track to album, do not disable clone if you know self is
@@ -390,10 +397,16 @@ class Album(Base):
     @property
     def track_ids(self):
         """
-            Get album track ids
+            Get album track ids, tracks are not loaded
             @return [int]
         """
-        return [track.id for track in self.tracks]
+        if not self._tracks and self.id is not None:
+            return self.db.get_track_ids(self.id,
+                                         self.genre_ids,
+                                         self.artist_ids,
+                                         self.__tracks_storage_type,
+                                         self.__skipped)
+        return [track.id for track in self._tracks]
 
     @property
     def track_uris(self):
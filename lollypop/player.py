@@ -12,8 +12,9 @@
 
 from gi.repository import GLib, GObject
 
-from pickle import load
+from os import fsync, replace
 from time import time
+import json
 
 from lollypop.player_albums import AlbumsPlayer
 from lollypop.player_auto_random import AutoRandomPlayer
@@ -23,9 +24,10 @@ from lollypop.player_queue import QueuePlayer
 from lollypop.player_linear import LinearPlayer
 from lollypop.player_shuffle import ShufflePlayer
 from lollypop.player_transitions import TransitionsPlayer
+from lollypop.list_playback import PlaybackList
 from lollypop.logger import Logger
 from lollypop.objects_track import Track
-from lollypop.define import App, Type, LOLLYPOP_DATA_PATH
+from lollypop.define import App, Type, StorageType, LOLLYPOP_DATA_PATH
 from lollypop.utils import emit_signal
 
 
@@ -46,7 +48,8 @@ class Player(GObject.GObject, AlbumsPlayer, BinPlayer, AutoRandomPlayer,
         "seeked": (GObject.SignalFlags.RUN_FIRST, None, (int,)),
         "status-changed": (GObject.SignalFlags.RUN_FIRST, None, ()),
         "volume-changed": (GObject.SignalFlags.RUN_FIRST, None, ()),
-        "queue-changed": (GObject.SignalFlags.RUN_FIRST, None, ()),
+        "queue-changed": (GObject.SignalFlags.RUN_FIRST, None,
+                          (GObject.TYPE_PYOBJECT,)),
         "playback-added": (GObject.SignalFlags.RUN_FIRST, None,
                            (GObject.TYPE_PYOBJECT,)),
         "playback-updated": (GObject.SignalFlags.RUN_FIRST, None,
@@ -57,6 +60,10 @@ class Player(GObject.GObject, AlbumsPlayer, BinPlayer, AutoRandomPlayer,
                              (GObject.TYPE_PYOBJECT,)),
         "rate-changed": (GObject.SignalFlags.RUN_FIRST, None, (int, int))
     }
+    # Queued web tracks resolved ahead of time
+    __PREFETCH_COUNT = 2
+    __STATE_PATH = "%s/state.json" % LOLLYPOP_DATA_PATH
+    __STATE_VERSION = 2
 
     def __init__(self):
         """
@@ -127,45 +134,82 @@ class Player(GObject.GObject, AlbumsPlayer, BinPlayer, AutoRandomPlayer,
             artists = ", ".join(self._current_track.album_artists)
         return artists
 
+    def save_state(self):
+        """
+            Save player state in one versioned snapshot
+        """
+        try:
+            if self._current_track.id is None or\
+                    self._current_track.storage_type &\
+                    StorageType.EPHEMERAL:
+                state = {"version": self.__STATE_VERSION, "track_id": None}
+            else:
+                try:
+                    album_index = self._albums.index(
+                        self._current_track.album)
+                except ValueError:
+                    album_index = None
+                (track_ids, index) = self.shuffle_history
+                state = {"version": self.__STATE_VERSION,
+                         "track_id": self._current_track.id,
+                         "album_index": album_index,
+                         "position": self.position,
+                         "playing": self.is_playing,
+                         "party": self.is_party,
+                         "albums": self._albums.state,
+                         "shuffle": {"ids": track_ids, "index": index}}
+            state["queue"] = self.queue
+            tmp_path = "%s.tmp" % self.__STATE_PATH
+            with open(tmp_path, "w") as f:
+                f.write(json.dumps(state))
+                f.flush()
+                fsync(f.fileno())
+            replace(tmp_path, self.__STATE_PATH)
+        except Exception as e:
+            Logger.error("Player::save_state(): %s", e)
+
     def restore_state(self):
         """
             Restore player state
         """
         try:
-            if App().settings.get_value("save-state"):
-                self._current_track = Track(
-                    load(open(LOLLYPOP_DATA_PATH + "/track_id.bin", "rb")))
-                self.set_queue(load(open(LOLLYPOP_DATA_PATH +
-                                         "/queue.bin", "rb")))
-                albums = load(open(LOLLYPOP_DATA_PATH + "/Albums.bin", "rb"))
-                (is_playing, was_party) = load(open(LOLLYPOP_DATA_PATH +
-                                                    "/player.bin", "rb"))
-                if self._current_track.uri:
-                    if albums:
-                        if was_party:
-                            # Tips: prevents player from loading albums
-                            self._is_party = True
-                            App().lookup_action("party").change_state(
-                                GLib.Variant("b", True))
-                        self.set_albums(albums)
-                        # Load track from player albums
-                        index = self.album_ids.index(
-                            self._current_track.album.id)
-                        for track in self._albums[index].tracks:
-                            if track.id == self._current_track.id:
-                                self._load_track(track)
-                                break
-                    if is_playing:
-                        self.play()
-                    else:
-                        self.pause()
-                    position = load(open(LOLLYPOP_DATA_PATH + "/position.bin",
-                                    "rb"))
-                    self.seek(position)
-                else:
-                    Logger.debug("Player::restore_state(): track missing")
+            if not App().settings.get_value("save-state"):
+                return
+            with open(self.__STATE_PATH, "r") as f:
+                state = json.loads(f.read())
+            if state.get("version", None) != self.__STATE_VERSION:
+                Logger.debug("Player::restore_state(): unknown version")
+                return
+            self.set_queue(state["queue"])
+            if state["track_id"] is None:
+                return
+            if state["party"]:
+                # Tips: prevents player from loading albums
+                self._is_party = True
+                App().lookup_action("party").change_state(
+                    GLib.Variant("b", True))
+            self._albums = PlaybackList()
+            self._albums.set_state(state["albums"])
+            emit_signal(self, "playback-setted", self._albums.copy())
+            self.set_shuffle_history(state["shuffle"]["ids"],
+                                     state["shuffle"]["index"])
+            track = None
+            album_index = state["album_index"]
+            if album_index is not None and album_index < len(self._albums):
+                for album_track in self._albums[album_index].tracks:
+                    if album_track.id == state["track_id"]:
+                        track = album_track
+                        break
+            if track is None:
+                track = Track(state["track_id"])
+            if track.uri:
+                self.load_at(track, state["position"], state["playing"])
+            else:
+                Logger.debug("Player::restore_state(): track missing")
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            Logger.error("Player::restore_state(): %s" % e)
+            Logger.error("Player::restore_state(): %s", e)
 
     def set_party(self, party):
         """
@@ -218,6 +262,11 @@ class Player(GObject.GObject, AlbumsPlayer, BinPlayer, AutoRandomPlayer,
                     self._current_track = diverge_current_track
                     self._queue_current_track = None
             self._next_track = next_track
+            # Resolve upcoming web tracks ahead of time
+            track_ids = self.get_queue_head(self.__PREFETCH_COUNT)
+            upcoming = [next_track] + [Track(track_id)
+                                       for track_id in track_ids]
+            App().stream_resolver.prefetch(upcoming, True)
             emit_signal(self, "next-changed")
         except Exception as e:
             Logger.error("Player::set_next(): %s" % e)
@@ -291,6 +340,7 @@ class Player(GObject.GObject, AlbumsPlayer, BinPlayer, AutoRandomPlayer,
         ShufflePlayer._on_stream_start(self, bus, message)
         BinPlayer._on_stream_start(self, bus, message)
         AutoSimilarPlayer._on_stream_start(self, bus, message)
+        TransitionsPlayer._on_stream_start(self, bus, message)
         self.set_next()
         self.set_prev()
 
@@ -17,6 +17,7 @@ from gettext import gettext as _
 
 from lollypop.logger import Logger
 from lollypop.objects_album import Album
+from lollypop.list_playback import PlaybackList
 from lollypop.player_auto_similar import AutoSimilarPlayer
 from lollypop.player_auto_random import AutoRandomPlayer
 from lollypop.define import App, Repeat
@@ -33,7 +34,7 @@ class AlbumsPlayer:
             Init player
         """
         # Albums in current playlist
-        self._albums = []
+        self._albums = PlaybackList()
 
     def add_album(self, album):
         """
@@ -101,10 +102,9 @@ class AlbumsPlayer:
         """
         try:
             for album_id in album_ids:
-                for album in self._albums:
-                    if album.id == album_id:
-                        self.remove_album(album)
-                        emit_signal(self, "playback-removed", album)
+                for album in self._albums.get_albums_for_id(album_id):
+                    self.remove_album(album)
+                    emit_signal(self, "playback-removed", album)
             self.update_next_prev()
         except Exception as e:
             Logger.error("Player::remove_album_by_ids(): %s" % e)
@@ -155,9 +155,9 @@ class AlbumsPlayer:
         """
         if self.is_party:
             App().lookup_action("party").change_state(GLib.Variant("b", False))
-        self._albums = albums
+        self._albums = PlaybackList(albums)
         self.load(track)
-        emit_signal(self, "playback-setted", list(albums))
+        emit_signal(self, "playback-setted", self._albums.copy())
 
     def play_album_for_albums(self, album, albums):
         """
@@ -184,16 +184,16 @@ class AlbumsPlayer:
         if not albums:
             App().notify.send(_("No album available"))
             return
-        self._albums = albums
+        self._albums = PlaybackList(albums)
         if signal:
-            emit_signal(self, "playback-setted", list(albums))
+            emit_signal(self, "playback-setted", self._albums.copy())
         self.update_next_prev()
 
     def clear_albums(self):
         """
             Clear all albums
         """
-        self._albums = []
+        self._albums = PlaybackList()
         emit_signal(self, "playback-setted", [])
         self.update_next_prev()
 
@@ -237,11 +237,10 @@ class AlbumsPlayer:
             @param track as Track
             @return Track/None
         """
-        for album in self._albums:
-            if album.id == track.album.id:
-                for _track in album.tracks:
-                    if track.id == _track.id:
-                        return _track
+        for album in self._albums.get_albums_for_id(track.album.id):
+            for _track in album.tracks:
+                if track.id == _track.id:
+                    return _track
         return None
 
     def get_albums_for_id(self, album_id):
@@ -250,15 +249,15 @@ class AlbumsPlayer:
             @param album_id as int
             @return [Album]
         """
-        return [album for album in self._albums if album.id == album_id]
+        return self._albums.get_albums_for_id(album_id)
 
     @property
     def albums(self):
         """
             Return albums
-            @return albums as [Album]
+            @return albums as PlaybackList
         """
-        return list(self._albums)
+        return self._albums.copy()
 
     @property
     def album_ids(self):
@@ -266,7 +265,7 @@ class AlbumsPlayer:
             Return albums ids
             @return albums ids as [int]
         """
-        return [album.id for album in self._albums]
+        return self._albums.ids
 
 #######################
 # PRIVATE             #
@@ -283,8 +282,8 @@ class AlbumsPlayer:
             track = choice(album.tracks)
         else:
             track = None
-        self._albums = albums
-        emit_signal(self, "playback-setted", list(albums))
+        self._albums = PlaybackList(albums)
+        emit_signal(self, "playback-setted", self._albums.copy())
         if track is not None:
             self.load(track)
         else:
@@ -302,8 +301,8 @@ class AlbumsPlayer:
             track = album.tracks[0]
         else:
             track = None
-        self._albums = albums
-        emit_signal(self, "playback-setted", list(albums))
+        self._albums = PlaybackList(albums)
+        emit_signal(self, "playback-setted", self._albums.copy())
         if track is not None:
             self.load(track)
         else:
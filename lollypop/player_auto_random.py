@@ -13,18 +13,28 @@
 
 from lollypop.define import App, Repeat
 from lollypop.objects_album import Album
+from lollypop.logger import Logger
 from lollypop.utils import get_default_storage_type
 
 
 class AutoRandomPlayer:
     """
         Manage playback for AUTO_RANDOM when going to the end
+        Next albums are picked in background
     """
 
+    # Next albums kept ready
+    __CANDIDATES = 3
+
     def __init__(self):
         """
             Init player
         """
+        self.__candidates = []
+        self.__loading_candidates = False
+        # Playback is waiting for a candidate
+        self.__wanted = False
+        self.connect("current-changed", self.__on_current_changed)
         self.connect("next-changed", self.__on_next_changed)
 
     def next_album(self):
@@ -32,6 +42,9 @@ class AutoRandomPlayer:
             Get next album to add
             @return Album
         """
+        album_id = self.__pop_candidate()
+        if album_id is not None:
+            return Album(album_id)
         storage_type = get_default_storage_type()
         for album_id in App().albums.get_randoms(storage_type, None, False, 2):
             if album_id != self.current_track.album.id:
@@ -41,15 +54,91 @@ class AutoRandomPlayer:
 #######################
 # PRIVATE             #
 #######################
-    def __on_next_changed(self, player):
+    def __pop_candidate(self):
         """
-            Add a new album if playback finished and wanted by user
+            Get next candidate not in playback, load more if needed
+            @return int/None
+        """
+        album_ids = self.album_ids
+        album_id = None
+        while self.__candidates and album_id is None:
+            candidate_id = self.__candidates.pop(0)
+            if candidate_id not in album_ids and\
+                    candidate_id != self.current_track.album.id:
+                album_id = candidate_id
+        self.__load_candidates()
+        return album_id
+
+    def __load_candidates(self):
+        """
+            Fill candidates in background
+        """
+        if self.__loading_candidates or\
+                len(self.__candidates) >= self.__CANDIDATES or\
+                App().settings.get_enum("repeat") != Repeat.AUTO_RANDOM:
+            return
+        self.__loading_candidates = True
+        App().task_helper.run(self.__get_candidates,
+                              get_default_storage_type(),
+                              callback=(self.__on_candidates,))
+
+    def __get_candidates(self, storage_type):
+        """
+            Get random albums
+            @param storage_type as StorageType
+            @return [int]
+            @thread safe
+        """
+        try:
+            return App().albums.get_randoms(storage_type, None, False,
+                                            self.__CANDIDATES)
+        except Exception as e:
+            Logger.error("AutoRandomPlayer::__get_candidates(): %s", e)
+            return []
+        finally:
+            self.__loading_candidates = False
+
+    def __add_candidate(self):
         """
+            Add a candidate to playback if it reaches its end
+        """
+        self.__wanted = False
         if not self._albums:
             return
         if App().settings.get_enum("repeat") != Repeat.AUTO_RANDOM or\
-                player.next_track.id is not None:
+                self.next_track.id is not None:
             return
-        album = self.next_album()
-        if album:
-            self.add_album(album)
+        album_id = self.__pop_candidate()
+        if album_id is None:
+            self.__wanted = True
+        else:
+            self.add_album(Album(album_id))
+
+    def __on_candidates(self, album_ids):
+        """
+            Store candidates not in playback, add one if playback is waiting
+            @param album_ids as [int]
+        """
+        excluded_ids = self.album_ids + self.__candidates +\
+            [self.current_track.album.id]
+        album_ids = [album_id for album_id in album_ids
+                     if album_id not in excluded_ids]
+        self.__candidates += album_ids
+        # Do not retry if all random albums are already in playback
+        if self.__wanted and album_ids:
+            self.__add_candidate()
+        else:
+            self.__wanted = False
+
+    def __on_current_changed(self, player):
+        """
+            Prepare candidates
+            @param player as Player
+        """
+        self.__load_candidates()
+
+    def __on_next_changed(self, player):
+        """
+            Add a new album if playback finished and wanted by user
+        """
+        self.__add_candidate()
@@ -16,6 +16,7 @@ from random import shuffle
 
 from lollypop.objects_album import Album
 from lollypop.objects_track import Track
+from lollypop.similars_local import LocalSimilars
 from lollypop.logger import Logger
 from lollypop.define import App, Repeat, StorageType
 from lollypop.utils import sql_escape, get_network_available
@@ -28,12 +29,24 @@ class AutoSimilarPlayer:
         Manage playback when going to end
     """
 
+    # Similar artists in a collection radio
+    __RADIO_ARTISTS = 20
+    # Next albums kept ready
+    __CANDIDATES = 3
+
     def __init__(self):
         """
             Init player
         """
-        self.__next_cancellable = Gio.Cancellable()
         self.__radio_cancellable = Gio.Cancellable()
+        # Next albums, loaded in background for current album
+        self.__candidates = []
+        self.__candidates_album_id = None
+        self.__candidates_cancellable = Gio.Cancellable()
+        self.__loading_candidates = False
+        # Playback is waiting for a candidate
+        self.__wanted = False
+        self.connect("current-changed", self.__on_current_changed)
         self.connect("next-changed", self.__on_next_changed)
 
     def next_album(self):
@@ -41,10 +54,14 @@ class AutoSimilarPlayer:
             Get next album to add
             @return Album
         """
+        album_id = self.__pop_candidate()
+        if album_id is not None:
+            return Album(album_id, [], [], False)
         genre_ids = App().artists.get_genre_ids(self.current_track.artist_ids,
                                                 StorageType.COLLECTION)
         track_ids = App().tracks.get_randoms(genre_ids,
                                              StorageType.COLLECTION,
+                                             False,
                                              1)
         if track_ids:
             return Track(track_ids[0]).album
@@ -55,15 +72,27 @@ class AutoSimilarPlayer:
             Play a radio from collection for artist ids
             @param artist_ids as [int]
         """
-        genre_ids = App().artists.get_genre_ids(artist_ids,
-                                                StorageType.COLLECTION)
-        track_ids = App().tracks.get_randoms(genre_ids,
-                                             StorageType.COLLECTION,
-                                             False,
-                                             100)
-        albums = tracks_to_albums(
-            [Track(track_id) for track_id in track_ids], False)
-        self.play_albums(albums)
+        def get_track_ids():
+            similar_artist_ids = LocalSimilars().get_similar_artist_ids(
+                artist_ids, self.__RADIO_ARTISTS)
+            if similar_artist_ids:
+                return App().tracks.get_randoms_for_artists(
+                    artist_ids + similar_artist_ids, StorageType.COLLECTION,
+                    False, 100)
+            # No neighbours, play artists genres
+            genre_ids = App().artists.get_genre_ids(artist_ids,
+                                                    StorageType.COLLECTION)
+            return App().tracks.get_randoms(genre_ids,
+                                            StorageType.COLLECTION,
+                                            False,
+                                            100)
+
+        def on_track_ids(track_ids):
+            albums = tracks_to_albums(
+                [Track(track_id) for track_id in track_ids], False)
+            self.play_albums(albums)
+
+        App().task_helper.run(get_track_ids, callback=(on_track_ids,))
 
     def play_radio_from_spotify(self, artist_ids):
         """
@@ -168,32 +197,81 @@ class AutoSimilarPlayer:
         self.__radio_cancellable.cancel()
         self.__radio_cancellable = Gio.Cancellable()
 
-    def __get_album_from_artists(self,  similar_artist_ids):
+    def __pop_candidate(self):
+        """
+            Get next candidate not in playback
+            @return int/None
+        """
+        album_ids = self.album_ids
+        while self.__candidates:
+            album_id = self.__candidates.pop(0)
+            if album_id not in album_ids:
+                if not self.__candidates:
+                    self.__load_candidates()
+                return album_id
+        return None
+
+    def __load_candidates(self):
         """
-            Add a new album to playback
-            @param similar_artist_ids as [int]
-            @return Album
+            Load candidates for current album in background
         """
-        # Get an album
-        storage_type = get_default_storage_type()
-        album_ids = App().albums.get_ids(
-            [], similar_artist_ids, storage_type, False)
-        shuffle(album_ids)
-        while album_ids:
-            album_id = album_ids.pop(0)
-            if album_id not in self.album_ids:
-                return Album(album_id, [], [], False)
-        return None
+        if self.__loading_candidates:
+            return
+        self.__loading_candidates = True
+        self.__candidates_album_id = self.current_track.album.id
+        App().task_helper.run(self.__get_candidates,
+                              self.current_track.artist_ids,
+                              self.album_ids,
+                              get_default_storage_type(),
+                              self.__candidates_cancellable,
+                              callback=(self.__on_candidates,
+                                        self.__candidates_cancellable))
 
-    def __get_artist_ids(self, artists):
+    def __get_candidates(self, artist_ids, excluded_ids, storage_type,
+                         cancellable):
+        """
+            Get albums from similar artists
+            Web similars are tried first, then local index
+            @param artist_ids as [int]
+            @param excluded_ids as [int]
+            @param storage_type as StorageType
+            @param cancellable as Gio.Cancellable
+            @return [int]
+            @thread safe
+        """
+        try:
+            from lollypop.similars import Similars
+            artists = Similars().get_similar_artists(artist_ids, cancellable)
+            similar_artist_ids = self.__get_artist_ids(artists, cancellable)
+            if not similar_artist_ids and not cancellable.is_cancelled():
+                similar_artist_ids = LocalSimilars().get_similar_artist_ids(
+                    artist_ids)
+            if not similar_artist_ids or cancellable.is_cancelled():
+                return []
+            album_ids = [album_id for album_id in App().albums.get_ids(
+                            [], similar_artist_ids, storage_type, False)
+                         if album_id not in excluded_ids]
+            shuffle(album_ids)
+            return album_ids[:self.__CANDIDATES]
+        except Exception as e:
+            Logger.error("AutoSimilarPlayer::__get_candidates(): %s", e)
+            return []
+        finally:
+            # A new load may already be running for another album
+            if not cancellable.is_cancelled():
+                self.__loading_candidates = False
+
+    def __get_artist_ids(self, artists, cancellable):
         """
             Get valid artist ids from list
             @param artists as []
+            @param cancellable as Gio.Cancellable
             @return [int]
+            @thread safe
         """
         similar_artist_ids = []
         for (artist, cover_uri) in artists:
-            if self.__next_cancellable.is_cancelled():
+            if cancellable.is_cancelled():
                 return []
             similar_artist_id = App().artists.get_id_for_escaped_string(
                 sql_escape(artist.lower()))
@@ -202,71 +280,66 @@ class AutoSimilarPlayer:
                     similar_artist_ids.append(similar_artist_id)
         return similar_artist_ids
 
-    def __on_get_artist_ids(self, similar_artist_ids, remote):
+    def __add_candidate(self):
         """
-            Get one albums from artist ids
-            @param similar_artist_ids as [int]
-            @param remote as bool
+            Add a candidate to playback if it reaches its end
         """
-        if self.__next_cancellable.is_cancelled():
+        self.__wanted = False
+        # Do not load an album if a radio is loading
+        if not self.__radio_cancellable.is_cancelled() or not self._albums:
             return
-        album = None
-        if similar_artist_ids:
-            album = self.__get_album_from_artists(similar_artist_ids)
-        if album is not None:
-            Logger.info("Found a similar album")
-            self.add_album(album)
-        elif remote:
-            from lollypop.similars_local import LocalSimilars
-            similars = LocalSimilars()
-            App().task_helper.run(
-                similars.get_similar_artists,
-                App().player.current_track.artist_ids,
-                self.__next_cancellable,
-                callback=(self.__on_get_local_similar_artists,))
+        if App().settings.get_enum("repeat") == Repeat.AUTO_SIMILAR and\
+                self.next_track.id is None and\
+                self.current_track.id is not None and\
+                self.current_track.id >= 0 and\
+                self.current_track.artist_ids:
+            album_id = self.__pop_candidate()
+            if album_id is None:
+                self.__wanted = True
+                self.__load_candidates()
+            else:
+                Logger.info("Found a similar album")
+                self.add_album(Album(album_id, [], [], False))
 
-    def __on_get_local_similar_artists(self, artists):
+    def __on_candidates(self, album_ids, cancellable):
         """
-            Add one album from artists to player
-            @param artists as []
+            Store candidates, add one if playback is waiting
+            @param album_ids as [int]
+            @param cancellable as Gio.Cancellable
         """
-        if self.__next_cancellable.is_cancelled():
+        if cancellable.is_cancelled():
             return
-        App().task_helper.run(self.__get_artist_ids, artists,
-                              callback=(self.__on_get_artist_ids, False))
+        album_ids = [album_id for album_id in album_ids
+                     if album_id not in self.album_ids]
+        self.__candidates = album_ids
+        # Do not retry if all similar albums are already in playback
+        if self.__wanted and album_ids:
+            self.__add_candidate()
+        else:
+            self.__wanted = False
 
-    def __on_get_similar_artists(self, artists):
+    def __on_current_changed(self, player):
         """
-            Add one album from artists to player
-            @param artists as []
+            Prepare candidates when a new album starts
+            @param player as Player
         """
-        if self.__next_cancellable.is_cancelled():
+        if App().settings.get_enum("repeat") != Repeat.AUTO_SIMILAR or\
+                self.current_track.id is None or\
+                self.current_track.id < 0 or\
+                not self.current_track.artist_ids or\
+                self.current_track.album.id == self.__candidates_album_id:
             return
-        App().task_helper.run(self.__get_artist_ids, artists,
-                              callback=(self.__on_get_artist_ids, True))
+        self.__candidates_cancellable.cancel()
+        self.__candidates_cancellable = Gio.Cancellable()
+        self.__loading_candidates = False
+        self.__candidates = []
+        self.__load_candidates()
 
     def __on_next_changed(self, player):
         """
             Add a new album if playback finished and wanted by user
         """
-        self.__next_cancellable.cancel()
-        # Do not load an album if a radio is loading
-        if not self.__radio_cancellable.is_cancelled() or not self._albums:
-            return
-        self.__next_cancellable = Gio.Cancellable()
-        # Check if we need to add a new album
-        if App().settings.get_enum("repeat") == Repeat.AUTO_SIMILAR and\
-                player.next_track.id is None and\
-                player.current_track.id is not None and\
-                player.current_track.id >= 0 and\
-                player.current_track.artist_ids:
-            from lollypop.similars import Similars
-            similars = Similars()
-            App().task_helper.run(
-                similars.get_similar_artists,
-                player.current_track.artist_ids,
-                self.__next_cancellable,
-                callback=(self.__on_get_similar_artists,))
+        self.__add_candidate()
 
     def __on_match_track(self, similars, track_id, storage_type):
         """
@@ -277,6 +350,7 @@ class AutoSimilarPlayer:
         """
         track = Track(track_id)
         album = track.album
+        App().stream_resolver.prefetch([track])
         if self.albums:
             self.add_album(album)
         else:
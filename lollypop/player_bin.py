@@ -12,16 +12,20 @@
 
 from gi.repository import Gst, GstAudio, GstPbutils, GLib, Gio
 
+from hashlib import sha1
+from os import posix_fadvise, POSIX_FADV_WILLNEED, O_RDONLY
+from os import open as os_open, close, remove, scandir
 from time import time
 from gettext import gettext as _
 
 from lollypop.tagreader import TagReader, Discoverer
 from lollypop.player_plugins import PluginsPlayer
-from lollypop.define import GstPlayFlags, App, StorageType
+from lollypop.define import GstPlayFlags, App, StorageType, PREROLL_PATH
 from lollypop.codecs import Codecs
 from lollypop.logger import Logger
 from lollypop.objects_track import Track
 from lollypop.utils import emit_signal, get_network_available
+from lollypop.utils_file import create_dir
 
 
 class BinPlayer:
@@ -29,6 +33,11 @@ class BinPlayer:
         Gstreamer bin player
     """
 
+    # Warm next track this many ms before current track ends
+    __PREROLL_THRESHOLD = 20000
+    # Remote files bigger than this are not copied locally
+    __PREROLL_MAX_SIZE = 200 << 20
+
     def __init__(self):
         """
             Init playbin
@@ -38,6 +47,13 @@ class BinPlayer:
         self.__track_in_pipe = False
         self.__cancellable = Gio.Cancellable()
         self.__codecs = Codecs()
+        self.__preroll_id = None
+        self.__preroll_track_id = None
+        self.__preroll_cancellable = Gio.Cancellable()
+        # {remote uri: local uri}
+        self.__prerolled = {}
+        # (track id, position, play) applied once track is prerolled
+        self.__start_position = None
         self._current_track = Track()
         self._next_track = Track()
         self._prev_track = Track()
@@ -61,6 +77,7 @@ class BinPlayer:
             bus.connect("message::eos", self._on_bus_eos)
             bus.connect("message::element", self._on_bus_element)
             bus.connect("message::stream-start", self._on_stream_start)
+            bus.connect("message::async-done", self.__on_bus_async_done)
             bus.connect("message::tag", self._on_bus_message_tag)
         self._start_time = 0
 
@@ -73,6 +90,18 @@ class BinPlayer:
         if self._load_track(track):
             self.play()
 
+    def load_at(self, track, position, play):
+        """
+            Load track and start at position, no sound before seeking
+            @param track as Track
+            @param position as int (ms)
+            @param play as bool, play after seeking
+        """
+        self._playbin.set_state(Gst.State.NULL)
+        self.__start_position = (track.id, position, play)
+        if self._load_track(track):
+            self._playbin.set_state(Gst.State.PAUSED)
+
     def play(self):
         """
             Change player state to PLAYING
@@ -106,6 +135,9 @@ class BinPlayer:
         emit_signal(self, "next-changed")
         self._playbin.set_state(Gst.State.NULL)
         emit_signal(self, "status-changed")
+        if self.__preroll_id is not None:
+            GLib.source_remove(self.__preroll_id)
+            self.__preroll_id = None
 
     def stop_all(self):
         """
@@ -251,11 +283,24 @@ class BinPlayer:
             # See Player.set_next()
             track_uri = App().tracks.get_uri(track.id)
             if track.is_web and track.uri == track_uri:
-                emit_signal(self, "loading-changed", True, track)
-                self.__load_from_web(track)
-                return False
-            else:
-                self._playbin.set_property("uri", track.uri)
+                uri = App().audio_cache.get_uri(track)
+                if uri is None:
+                    # Resolved ahead of time, see Player.set_next()
+                    uri = App().stream_resolver.get(track)
+                    if uri is None:
+                        emit_signal(self, "loading-changed", True, track)
+                        self.__load_from_web(track)
+                        return False
+                    App().audio_cache.cache(track, uri)
+                    App().task_helper.run(self.__update_current_duration,
+                                          track)
+                track.set_uri(uri)
+            self._plugins.set_replay_gain(
+                App().tracks.get_replay_gain(track.id))
+            # Remote file may have been copied locally, see __preroll()
+            self._playbin.set_property("uri",
+                                       self.__prerolled.get(track.uri,
+                                                            track.uri))
         except Exception as e:  # Gstreamer error
             Logger.error("BinPlayer::_load_track(): %s" % e)
             return False
@@ -271,6 +316,11 @@ class BinPlayer:
         self.__track_in_pipe = False
         emit_signal(self, "loading-changed", False, self._current_track)
         self._start_time = time()
+        # Next track may be the same again (repeat, queue), warm it again
+        self.__preroll_track_id = None
+        if self.__preroll_id is None:
+            self.__preroll_id = GLib.timeout_add_seconds(
+                1, self.__on_preroll_timeout)
         Logger.debug("Player::_on_stream_start(): %s" %
                      self._current_track.uri)
         emit_signal(self, "current-changed")
@@ -310,6 +360,9 @@ class BinPlayer:
             @param message as Gst.Message
         """
         if self._current_track.is_web:
+            # Stream uri may have expired, cached file may be broken
+            App().stream_resolver.invalidate(self._current_track)
+            App().audio_cache.remove(self._current_track)
             emit_signal(self, "loading-changed", False,
                         self._current_track)
         Logger.info("Player::_on_bus_error(): %s" % message.parse_error()[1])
@@ -372,6 +425,57 @@ class BinPlayer:
         else:
             self.skip_album()
 
+    def __preroll(self, uri, keep, cancellable):
+        """
+            Warm uri so next track starts without gap
+            Local files are read ahead in page cache,
+            GVfs files (smb, sftp, ...) are copied locally
+            @param uri as str
+            @param keep as [str], local copies still in use
+            @param cancellable as Gio.Cancellable
+            @thread safe
+        """
+        self.__remove_prerolled(keep)
+        try:
+            f = Gio.File.new_for_uri(uri)
+            if f.has_uri_scheme("file"):
+                fd = os_open(f.get_path(), O_RDONLY)
+                try:
+                    posix_fadvise(fd, 0, 0, POSIX_FADV_WILLNEED)
+                finally:
+                    close(fd)
+                return
+            info = f.query_info("standard::size",
+                                Gio.FileQueryInfoFlags.NONE,
+                                cancellable)
+            if info.get_size() > self.__PREROLL_MAX_SIZE:
+                return
+            create_dir(PREROLL_PATH)
+            filepath = "%s/%s" % (PREROLL_PATH,
+                                  sha1(uri.encode("utf-8")).hexdigest())
+            f.copy(Gio.File.new_for_path(filepath),
+                   Gio.FileCopyFlags.OVERWRITE, cancellable, None, None)
+            GLib.idle_add(self.__on_prerolled, uri,
+                          GLib.filename_to_uri(filepath), cancellable)
+        except Exception as e:
+            Logger.warning("BinPlayer::__preroll(): %s", e)
+
+    def __remove_prerolled(self, keep):
+        """
+            Remove local copies not in keep
+            @param keep as [str]
+            @thread safe
+        """
+        try:
+            with scandir(PREROLL_PATH) as it:
+                for entry in it:
+                    if GLib.filename_to_uri(entry.path) not in keep:
+                        remove(entry.path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            Logger.warning("BinPlayer::__remove_prerolled(): %s", e)
+
     def __get_bin_position(self, playbin):
         """
             Get position for playbin
@@ -395,6 +499,42 @@ class BinPlayer:
         except Exception as e:
             Logger.error("BinPlayer::__update_current_duration(): %s" % e)
 
+    def __on_preroll_timeout(self):
+        """
+            Warm next track when current track is about to end
+            @return bool
+        """
+        track = self._next_track
+        if track.id is None or track.id == self.__preroll_track_id or\
+                self._current_track.duration <= 0 or\
+                self.remaining > self.__PREROLL_THRESHOLD:
+            return True
+        self.__preroll_track_id = track.id
+        if track.is_web:
+            App().stream_resolver.prefetch([track], True)
+        else:
+            self.__preroll_cancellable.cancel()
+            self.__preroll_cancellable = Gio.Cancellable()
+            # Only keep current track copy
+            current_uri = self.__prerolled.get(self._current_track.uri)
+            self.__prerolled = {}
+            if current_uri is not None:
+                self.__prerolled[self._current_track.uri] = current_uri
+            App().task_helper.run(self.__preroll, track.uri,
+                                  list(self.__prerolled.values()),
+                                  self.__preroll_cancellable)
+        return True
+
+    def __on_prerolled(self, uri, local_uri, cancellable):
+        """
+            Use local copy for uri
+            @param uri as str
+            @param local_uri as str
+            @param cancellable as Gio.Cancellable
+        """
+        if not cancellable.is_cancelled():
+            self.__prerolled[uri] = local_uri
+
     def __on_volume_changed(self, playbin, sink):
         """
             Emit volume-changed signal
@@ -404,6 +544,29 @@ class BinPlayer:
         App().settings.set_value("volume-rate", GLib.Variant("d", self.volume))
         emit_signal(self, "volume-changed")
 
+    def __on_bus_async_done(self, bus, message):
+        """
+            Apply start position once track is prerolled
+            @param bus as Gst.Bus
+            @param message as Gst.Message
+        """
+        if self.__start_position is None or self._playbin.get_bus() != bus:
+            return
+        (track_id, position, play) = self.__start_position
+        self.__start_position = None
+        if track_id != self._current_track.id:
+            return
+        if 0 < position < self._current_track.duration:
+            self._playbin.seek_simple(Gst.Format.TIME,
+                                      Gst.SeekFlags.FLUSH |
+                                      Gst.SeekFlags.KEY_UNIT,
+                                      position * Gst.MSECOND)
+            emit_signal(self, "seeked", position)
+        if play:
+            self.play()
+        else:
+            self.pause()
+
     def __on_web_helper_loaded(self, helper, uri, track, cancellable):
         """
             Play track URI
@@ -415,6 +578,8 @@ class BinPlayer:
         if cancellable.is_cancelled():
             return
         if uri:
+            App().stream_resolver.add(track, uri)
+            App().audio_cache.cache(track, uri)
             track.set_uri(uri)
             self.load(track)
             App().task_helper.run(self.__update_current_duration, track)
@@ -11,7 +11,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from gi.repository import Gst
+from gi.repository import Gst, GstController
+
+from math import log10
 
 from lollypop.define import App, ReplayGain
 from lollypop.logger import Logger
@@ -32,6 +34,9 @@ class PluginsPlayer:
             @param playbin as Gst.bin
         """
         self.__equalizer = None
+        self.__rgvolume = None
+        self.__fade = None
+        self.__fade_binding = None
         self.__playbin = playbin
         self.build_audiofilter()
 
@@ -40,6 +45,7 @@ class PluginsPlayer:
             Build audio filter
             audioconvert ! (rgvolume ! rglimiter ! audioconvert) !
             (equalizer) ! volume ! audioconvert ! audiosink
+            volume is driven by a fade envelope when crossfading
         """
         try:
             audiobin = Gst.ElementFactory.make("bin", None)
@@ -48,6 +54,7 @@ class PluginsPlayer:
             # Replay gain
             replay_gain = App().settings.get_enum(
                 "replay-gain") != ReplayGain.NONE
+            self.__rgvolume = None
             if replay_gain:
                 rgvolume = Gst.ElementFactory.make("rgvolume", None)
                 rglimiter = Gst.ElementFactory.make("rglimiter", None)
@@ -66,6 +73,7 @@ class PluginsPlayer:
                     "replay-gain-db").get_double()
                 rglimiter.props.enabled = App().settings.get_value(
                     "replay-gain-limiter")
+                self.__rgvolume = rgvolume
 
             # Equalizer
             self.__equalizer = None
@@ -83,6 +91,15 @@ class PluginsPlayer:
             self.volume = Gst.ElementFactory.make("volume", None)
             self.volume.props.volume = 1.0
             audiobin.add(self.volume)
+            # Fade envelope, interpolated per sample on stream time
+            self.__fade = GstController.InterpolationControlSource.new()
+            self.__fade.set_property("mode",
+                                     GstController.InterpolationMode.LINEAR)
+            self.__fade_binding =\
+                GstController.DirectControlBinding.new_absolute(
+                    self.volume, "volume", self.__fade)
+            self.__fade_binding.set_disabled(True)
+            self.volume.add_control_binding(self.__fade_binding)
             if self.__equalizer is not None:
                 self.__equalizer.link(self.volume)
             elif replay_gain:
@@ -102,6 +119,53 @@ class PluginsPlayer:
         except Exception as e:
             Logger.error("PluginsPlayer::init():", e)
 
+    def set_replay_gain(self, gains):
+        """
+            Set gain applied when track misses ReplayGain tags
+            @param gains as (float, float, float/None, float/None)/None as
+                   analyzed track gain, track peak, album gain, album peak
+        """
+        if self.__rgvolume is None:
+            return
+        gain = 0.0
+        if gains is not None:
+            (track_gain, track_peak, album_gain, album_peak) = gains
+            if self.__rgvolume.props.album_mode and album_gain is not None:
+                (gain, peak) = (album_gain, album_peak)
+            else:
+                (gain, peak) = (track_gain, track_peak)
+            # rgvolume adds pre-amp and applies headroom to fallback gain
+            # but knows nothing about peak, prevent clipping here
+            if peak:
+                gain = min(gain,
+                           self.__rgvolume.props.headroom - 20 * log10(peak))
+        self.__rgvolume.props.fallback_gain = gain
+
+    def set_fade(self, points):
+        """
+            Set volume envelope, replacing previous one
+            @param points as [(int, float)], position (ms) and volume,
+                   first point at 0
+            @thread safe
+        """
+        if self.__fade is None:
+            return
+        self.__fade.unset_all()
+        for (position, volume) in points:
+            self.__fade.set(position * Gst.MSECOND, volume)
+        self.__fade_binding.set_disabled(False)
+
+    def clear_fade(self):
+        """
+            Remove volume envelope
+            @thread safe
+        """
+        if self.__fade is None:
+            return
+        self.__fade_binding.set_disabled(True)
+        self.__fade.unset_all()
+        self.volume.props.volume = 1.0
+
     def update_equalizer(self):
         """
             Update equalizer based on current settings
@@ -10,20 +10,27 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+from gi.repository import GLib
+
 from lollypop.objects_track import Track
+from lollypop.list_queue import QueueList
 from lollypop.utils import emit_signal
 
 
 class QueuePlayer:
     """
         Manage queue
+        "queue-changed" is emitted once per main loop iteration with
+        changed track ids
     """
 
     def __init__(self):
         """
             Init queue
         """
-        self.__queue = []
+        self.__queue = QueueList()
+        self.__queue_changed = set()
+        self.__queue_changed_id = None
         self._queue_current_track = None
 
     def set_queue(self, queue):
@@ -31,7 +38,7 @@ class QueuePlayer:
             Set queue
             @param queue as [int]
         """
-        self.__queue = queue
+        self.__queue = QueueList(queue)
 
     def append_to_queue(self, track_id, notify=True):
         """
@@ -40,13 +47,21 @@ class QueuePlayer:
             @param track_id as int
             @param notify as bool
         """
-        if track_id in self.__queue:
-            self.__queue.remove(track_id)
-        self.__queue.append(track_id)
+        self.append_ids_to_queue([track_id], notify)
+
+    def append_ids_to_queue(self, track_ids, notify=True):
+        """
+            Append tracks to queue,
+            remove previous tracks if exist
+            @param track_ids as [int]
+            @param notify as bool
+        """
+        for track_id in track_ids:
+            self.__queue.append(track_id)
         self.set_next()
         self.set_prev()
         if notify:
-            emit_signal(self, "queue-changed")
+            self.__notify_queue_changed(track_ids)
 
     def insert_in_queue(self, track_id, pos=0, notify=True):
         """
@@ -56,13 +71,11 @@ class QueuePlayer:
             @param pos as int
             @param notify as bool
         """
-        if track_id in self.__queue:
-            self.__queue.remove(track_id)
-        self.__queue.insert(pos, track_id)
+        self.__queue.insert(track_id, pos)
         self.set_next()
         self.set_prev()
         if notify:
-            emit_signal(self, "queue-changed")
+            self.__notify_queue_changed([track_id])
 
     def remove_from_queue(self, track_id, notify=True):
         """
@@ -70,10 +83,9 @@ class QueuePlayer:
             @param track_id as int
             @param notify as bool
         """
-        if track_id in self.__queue:
-            self.__queue.remove(track_id)
+        self.__queue.remove(track_id)
         if notify:
-            emit_signal(self, "queue-changed")
+            self.__notify_queue_changed([track_id])
 
     def clear_queue(self, notify=True):
         """
@@ -81,9 +93,10 @@ class QueuePlayer:
             @param [ids as int]
             @param notify as bool
         """
-        self.__queue = []
+        track_ids = list(self.__queue)
+        self.__queue.clear()
         if notify:
-            emit_signal(self, "queue-changed")
+            self.__notify_queue_changed(track_ids)
 
     def is_in_queue(self, track_id):
         """
@@ -91,10 +104,7 @@ class QueuePlayer:
             @param track_id as int
             @return bool
         """
-        if self.__queue:
-            return track_id in self.__queue
-        else:
-            return False
+        return track_id in self.__queue
 
     def album_in_queue(self, album):
         """
@@ -103,8 +113,10 @@ class QueuePlayer:
             @return bool
         """
         if self.__queue:
-            union = set(self.__queue) & set(album.track_ids)
-            return len(union) == len(album.track_ids)
+            for track_id in album.track_ids:
+                if track_id not in self.__queue:
+                    return False
+            return True
         else:
             return False
 
@@ -116,6 +128,14 @@ class QueuePlayer:
         """
         return self.__queue.index(track_id) + 1
 
+    def get_queue_head(self, count):
+        """
+            Get first track ids in queue
+            @param count as int
+            @return [int]
+        """
+        return self.__queue.head(count)
+
     def next(self):
         """
             Get next track id
@@ -123,7 +143,7 @@ class QueuePlayer:
         """
         track_id = None
         if self.__queue:
-            track_id = self.__queue[0]
+            track_id = self.__queue.head(1)[0]
             if self._queue_current_track is None:
                 self._queue_current_track = self._current_track
         return Track(track_id)
@@ -134,8 +154,26 @@ class QueuePlayer:
             Return queue
             @return [ids as int]
         """
-        return self.__queue
+        return list(self.__queue)
 
 #######################
 # PRIVATE             #
 #######################
+    def __notify_queue_changed(self, track_ids):
+        """
+            Emit queue-changed in main loop, with all changed ids
+            @param track_ids as [int]
+        """
+        self.__queue_changed.update(track_ids)
+        if self.__queue_changed_id is None:
+            self.__queue_changed_id = GLib.idle_add(
+                self.__on_queue_changed_idle)
+
+    def __on_queue_changed_idle(self):
+        """
+            Emit queue-changed
+        """
+        self.__queue_changed_id = None
+        track_ids = self.__queue_changed
+        self.__queue_changed = set()
+        emit_signal(self, "queue-changed", track_ids)
@@ -10,12 +10,10 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from random import shuffle, random
-
 from lollypop.define import Repeat, App
 from lollypop.objects_track import Track
-from lollypop.objects_album import Album
-from lollypop.list import LinkedList
+from lollypop.list_shuffle import ShuffleList
+from lollypop.list_playback import PlaybackList
 from lollypop.utils import emit_signal, get_default_storage_type
 from lollypop.logger import Logger
 
@@ -24,24 +22,20 @@ class ShufflePlayer:
     """
         Shuffle player
         Manage shuffle tracks and party mode
+        Works on track ids, tracks are loaded when needed
     """
 
     def __init__(self):
         """
             Init shuffle player
         """
-        # Albums to play, different from _albums for a better shuffle
-        self.__to_play_albums = []
-        # Albums who never have been played
-        self.__not_played_albums = []
-        # Tracks already played
-        self.__history = []
-        # Tracks already played by albums
-        self.__already_played_tracks = {}
+        # Tracks to play and history
+        self.__shuffle = ShuffleList()
         # Party mode
         self._is_party = False
         App().settings.connect("changed::shuffle", self.__set_shuffle)
         self.connect("playback-added", self.__on_playback_added)
+        self.connect("playback-updated", self.__on_playback_added)
         self.connect("playback-setted", self.__on_playback_setted)
         self.connect("playback-removed", self.__on_playback_removed)
 
@@ -54,7 +48,7 @@ class ShufflePlayer:
         if repeat == Repeat.TRACK:
             return self._current_track
         if self.shuffle_has_next:
-            track = self.__history.next.value
+            track = self.__get_track(self.__shuffle.next_id)
         elif self._albums:
             track = self.__get_next()
         else:
@@ -70,7 +64,7 @@ class ShufflePlayer:
         if repeat == Repeat.TRACK:
             return self._current_track
         if self.shuffle_has_prev:
-            track = self.__history.prev.value
+            track = self.__get_track(self.__shuffle.prev_id)
         else:
             track = self._current_track
         return track
@@ -85,8 +79,9 @@ class ShufflePlayer:
             if self._albums:
                 # Start a new song if not playing
                 if self._current_track.id is None:
-                    track = self.__get_tracks_random()
-                    self.load(track)
+                    track = self.__get_next()
+                    if track.id is not None:
+                        self.load(track)
                 elif not self.is_playing:
                     self.play()
             emit_signal(self, "loading-changed", False, Track())
@@ -99,7 +94,7 @@ class ShufflePlayer:
             App().task_helper.run(self.set_party_ids, callback=(start_party,))
         else:
             # We want current album to continue playback
-            self._albums = [self._current_track.album]
+            self._albums = PlaybackList([self._current_track.album])
             emit_signal(self, "playback-setted", [])
             emit_signal(self, "playback-added",
                         self._current_track.album)
@@ -117,13 +112,28 @@ class ShufflePlayer:
         storage_type = get_default_storage_type()
         album_ids = App().albums.get_ids(party_ids, [], storage_type, False)
         emit_signal(self, "playback-setted", [])
-        self._albums = []
         if album_ids:
             emit_signal(self, "loading-changed", True, Track())
-        for album_id in album_ids:
-            album = Album(album_id, [], [], False)
-            self._albums.append(album)
-        emit_signal(self, "playback-setted", list(self._albums))
+        # Albums are created on demand
+        self._albums = PlaybackList()
+        self._albums.set_ids(album_ids, False)
+        emit_signal(self, "playback-setted", self._albums.copy())
+
+    def set_shuffle_history(self, track_ids, index):
+        """
+            Restore shuffle history
+            @param track_ids as [int]
+            @param index as int, current track index
+        """
+        self.__shuffle.set_history(track_ids, index)
+
+    @property
+    def shuffle_history(self):
+        """
+            Get shuffle history
+            @return ([int], int) as track ids and current track index
+        """
+        return self.__shuffle.history
 
     @property
     def is_party(self):
@@ -139,7 +149,7 @@ class ShufflePlayer:
             True if history provide a next track
             @return bool
         """
-        return self.__history and self.__history.has_next
+        return self.__shuffle.next_id is not None
 
     @property
     def shuffle_has_prev(self):
@@ -147,7 +157,7 @@ class ShufflePlayer:
             True if history provide a prev track
             @return bool
         """
-        return self.__history and self.__history.has_prev
+        return self.__shuffle.prev_id is not None
 
 #######################
 # PROTECTED           #
@@ -161,32 +171,8 @@ class ShufflePlayer:
             return
         # Add track to shuffle history if needed
         if App().settings.get_value("shuffle") or self._is_party:
-            self.__add_to_shuffle_history(self._current_track)
-            if self.__history:
-                next = self.__history.next
-                prev = self.__history.prev
-                # Remove next track
-                if next is not None and\
-                        self._current_track == next.value:
-                    next = self.__history.next
-                    next.set_prev(self.__history)
-                    self.__history = next
-                # Remove previous track
-                elif prev is not None and\
-                        self._current_track == prev.value:
-                    prev = self.__history.prev
-                    prev.set_next(self.__history)
-                    self.__history = prev
-                # Add a new track
-                elif self.__history.value != self._current_track:
-                    new_list = LinkedList(self._current_track,
-                                          None,
-                                          self.__history)
-                    self.__history = new_list
-            else:
-                # Initial history
-                new_list = LinkedList(self._current_track)
-                self.__history = new_list
+            self.__shuffle.set_played(self._current_track.id)
+            self.__shuffle.push(self._current_track.id)
 
 #######################
 # PRIVATE             #
@@ -209,66 +195,52 @@ class ShufflePlayer:
         try:
             if App().settings.get_value("shuffle") or self._is_party:
                 if self._albums:
-                    track = self.__get_tracks_random()
+                    track_id = self.__shuffle.draw()
                     # All tracks done
                     # Try to get another one track after reseting history
-                    if track.id is None:
-                        self.__to_play_albums = list(self._albums)
-                        shuffle(self.__to_play_albums)
+                    if track_id is None:
                         repeat = App().settings.get_enum("repeat")
                         # Do not reset history if a new album is going to
                         # be added
                         if repeat not in [Repeat.AUTO_SIMILAR,
                                           Repeat.AUTO_RANDOM]:
-                            self.__history = []
-                            self.__already_played_tracks = {}
+                            self.__shuffle.reset()
                         if repeat == Repeat.ALL:
-                            return self.__get_next()
-                    return track
+                            track_id = self.__shuffle.draw()
+                    while track_id is not None:
+                        track = self.__get_playback_track(track_id)
+                        if track is not None:
+                            return track
+                        # Track removed from an album
+                        self.__shuffle.remove([track_id])
+                        track_id = self.__shuffle.draw()
         except Exception as e:
             Logger.error("ShufflePLayer::__get_next(): %s", e)
         return Track()
 
-    def __get_tracks_random(self):
+    def __get_track(self, track_id):
         """
-            Return a random track and make sure it has never been played
+            Get track for id, from current playback if available
+            @param track_id as int
             @return Track
         """
-        # True if all albums have been played on time
-        if not self.__not_played_albums:
-            self.__not_played_albums = list(self.__to_play_albums)
-        while self.__not_played_albums:
-            album = self.__not_played_albums.pop(0)
-            if not album.tracks:
-                continue
-            for track in sorted(album.tracks,
-                                key=lambda *args: random()):
-                if not self.__in_shuffle_history(track):
-                    return track
-            self.__to_play_albums.remove(album)
-        if self.__to_play_albums:
-            return self.__get_tracks_random()
-        else:
-            return Track()
-
-    def __in_shuffle_history(self, track):
-        """
-            True if track in shuffle history
-            @param track as Track
-            @return bool
-        """
-        return track.album.id in self.__already_played_tracks.keys() and\
-            track.id in self.__already_played_tracks[track.album.id]
+        track = self.__get_playback_track(track_id)
+        if track is None:
+            track = Track(track_id)
+        return track
 
-    def __add_to_shuffle_history(self, track):
+    def __get_playback_track(self, track_id):
         """
-            Add a track to shuffle history
-            @param track as Track
+            Get track for id from current playback
+            @param track_id as int
+            @return Track/None
         """
-        if track.album.id not in self.__already_played_tracks.keys():
-            self.__already_played_tracks[track.album.id] = []
-        if track not in self.__already_played_tracks[track.album.id]:
-            self.__already_played_tracks[track.album.id].append(track.id)
+        album_id = App().tracks.get_album_id(track_id)
+        for album in self.get_albums_for_id(album_id):
+            for track in album.tracks:
+                if track.id == track_id:
+                    return track
+        return None
 
     def __on_playback_added(self, player, album):
         """
@@ -277,31 +249,24 @@ class ShufflePlayer:
             @param album as Album
         """
         if App().settings.get_value("shuffle") or self._is_party:
-            if album not in self.__to_play_albums:
-                self.__to_play_albums.append(album)
-                shuffle(self.__to_play_albums)
-            if album not in self.__not_played_albums:
-                self.__not_played_albums.append(album)
-            # If album already playing or
-            # if current track was last one
-            if App().player.current_track.album == album or\
-                    not self.__already_played_tracks:
-                self.__add_to_shuffle_history(App().player.current_track)
+            self.__shuffle.add(album.track_ids)
+            # If album already playing
+            if App().player.current_track.album.id == album.id:
+                self.__shuffle.set_played(App().player.current_track.id)
 
     def __on_playback_setted(self, player, albums):
         """
             Update shuffle for album
             @param player as Player
-            @param albums as [Album]
+            @param albums as PlaybackList
         """
         if App().settings.get_value("shuffle") or self._is_party:
-            self.__to_play_albums = albums
+            self.__shuffle.clear()
             if albums:
-                shuffle(self.__to_play_albums)
-            self.__not_played_albums = []
-            self.__already_played_tracks = {}
-            if App().player.current_track.album in albums:
-                self.__add_to_shuffle_history(App().player.current_track)
+                self.__shuffle.add(albums.track_ids)
+            current_track = App().player.current_track
+            if current_track.id is not None:
+                self.__shuffle.set_played(current_track.id)
 
     def __on_playback_removed(self, player, album):
         """
@@ -310,7 +275,7 @@ class ShufflePlayer:
             @param album as Album
         """
         if App().settings.get_value("shuffle") or self._is_party:
-            if album in self.__to_play_albums:
-                self.__to_play_albums.remove(album)
-            if album in self.__not_played_albums:
-                self.__not_played_albums.remove(album)
+            self.__shuffle.remove(album.track_ids)
+            # Album may still be in playback with other tracks
+            for _album in self.get_albums_for_id(album.id):
+                self.__shuffle.add(_album.track_ids)
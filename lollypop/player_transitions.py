@@ -12,14 +12,14 @@
 
 from gi.repository import Gst, GLib, GstAudio
 
-from time import sleep
-
 from lollypop.define import App
 
 
 class TransitionsPlayer:
     """
         Handle track transitions
+        Fades are volume envelopes applied per sample by GStreamer,
+        next track is started by a pipeline clock one-shot
     """
     __PADDING = 250
 
@@ -27,9 +27,16 @@ class TransitionsPlayer:
         """
             Init playbin
         """
-        self.__crossfading_id = None
-        self.__crossfade_up = False
-        self.__crossfade_down = False
+        self.__crossfading = False
+        self.__clock_id = None
+        # Ignore clock one-shots scheduled before last reschedule
+        self.__clock_serial = 0
+        self.__fade_id = None
+        self.__envelope_track_id = None
+        for playbin in [self._playbin1, self._playbin2]:
+            playbin.get_bus().connect("message::state-changed",
+                                      self.__on_bus_state_changed)
+        self.connect("seeked", self.__on_seeked)
         self.update_crossfading()
 
     def load(self, track):
@@ -45,6 +52,8 @@ class TransitionsPlayer:
                     "transitions-duration").get_int32()
             self.__do_crossfade(transition_duration, track)
             return True
+        self._plugins.clear_fade()
+        self.__envelope_track_id = None
         return False
 
     def set_crossfading(self, status):
@@ -52,15 +61,17 @@ class TransitionsPlayer:
             Set crossfading on/off
             @param status as bool
         """
-        if status and self.__crossfading_id is None:
-            transition_duration = App().settings.get_value(
-                "transitions-duration").get_int32()
-            timemout = min(transition_duration, 500)
-            self.__crossfading_id = GLib.timeout_add(
-                timemout, self.__check_for_crossfading)
-        elif not status and self.__crossfading_id is not None:
-            GLib.source_remove(self.__crossfading_id)
-            self.__crossfading_id = None
+        if status == self.__crossfading:
+            return
+        self.__crossfading = status
+        if status:
+            self.__set_envelope(self._current_track, False)
+            self.__schedule_crossfade()
+        else:
+            self.__unschedule_crossfade()
+            self.__envelope_track_id = None
+            for plugins in [self._plugins1, self._plugins2]:
+                plugins.clear_fade()
 
     def update_crossfading(self):
         """
@@ -77,58 +88,75 @@ class TransitionsPlayer:
             True if crossfading is on
             @return bool
         """
-        return self.__crossfading_id is not None
+        return self.__crossfading
+
+#######################
+# PROTECTED           #
+#######################
+    def _on_stream_start(self, bus, message):
+        """
+            Fade out current track if not done by crossfade
+            @param bus as Gst.Bus
+            @param message as Gst.Message
+        """
+        if self.crossfading and\
+                self._current_track.id != self.__envelope_track_id:
+            self.__set_envelope(self._current_track, False)
 
 #######################
 # PRIVATE             #
 #######################
-    def __check_for_crossfading(self):
+    def __set_envelope(self, track, fade_in):
         """
-            Check if we need to do crossfading
+            Set current plugins volume envelope for track
+            @param track as Track
+            @param fade_in as bool
         """
-        if self._current_track.duration > 0:
-            remaining = self.remaining
-            transition_duration = App().settings.get_value(
-                    "transitions-duration").get_int32()
-            if remaining < transition_duration + self.__PADDING:
-                self.__do_crossfade(transition_duration,
-                                    self._next_track)
-        return True
+        if track.id is None:
+            return
+        duration = App().settings.get_value(
+            "transitions-duration").get_int32()
+        points = [(0, 0.0 if fade_in else 1.0)]
+        if fade_in:
+            points.append((duration, 1.0))
+        if track.duration > 2 * duration:
+            points += [(track.duration - duration, 1.0),
+                       (track.duration, 0.0)]
+        self._plugins.set_fade(points)
+        self.__envelope_track_id = track.id
 
-    def __volume_up(self, playbin, plugins, duration):
+    def __schedule_crossfade(self, position=None):
         """
-            Make volume going up smoothly
-            @param playbin as Gst.Bin
-            @param plugins as PluginsPlayer
-            @param duration as int
+            Start next track on pipeline clock when fade out starts
+            @param position as int (ms)
         """
-        plugins.volume.props.volume = 0.0
-        self.__crossfade_up = True
-        # We add padding because user will not hear track around 0.2
-        sleep_ms = (duration + self.__PADDING) / 10
-        while plugins.volume.props.volume < 1.0:
-            vol = round(plugins.volume.props.volume + 0.1, 1)
-            plugins.volume.props.volume = vol
-            sleep(sleep_ms / 1000)
-        self.__crossfade_up = False
+        self.__unschedule_crossfade()
+        if not self.crossfading or self._current_track.duration <= 0 or\
+                not self.is_playing:
+            return
+        clock = self._playbin.get_clock()
+        if clock is None:
+            return
+        transition_duration = App().settings.get_value(
+            "transitions-duration").get_int32()
+        if position is None:
+            remaining = self.remaining
+        else:
+            remaining = self._current_track.duration - position
+        delay = max(0, remaining - transition_duration)
+        self.__clock_id = clock.new_single_shot_id(
+            clock.get_time() + delay * Gst.MSECOND)
+        Gst.Clock.id_wait_async(self.__clock_id, self.__on_clock_crossfade,
+                                self.__clock_serial)
 
-    def __volume_down(self, playbin, plugins, duration):
+    def __unschedule_crossfade(self):
         """
-            Make volume going down smoothly
-            @param playbin as Gst.Bin
-            @param plugins as PluginsPlayer
-            @param duration as int
+            Cancel pending crossfade
         """
-        plugins.volume.props.volume = 1.0
-        self.__crossfade_down = True
-        # We add padding because user will not hear track around 0.2
-        sleep_ms = (duration + self.__PADDING) / 10
-        while plugins.volume.props.volume > 0:
-            vol = round(plugins.volume.props.volume - 0.1, 1)
-            plugins.volume.props.volume = vol
-            sleep(sleep_ms / 1000)
-        playbin.set_state(Gst.State.NULL)
-        self.__crossfade_down = False
+        self.__clock_serial += 1
+        if self.__clock_id is not None:
+            Gst.Clock.id_unschedule(self.__clock_id)
+            self.__clock_id = None
 
     def __do_crossfade(self, duration, track):
         """
@@ -136,20 +164,28 @@ class TransitionsPlayer:
             @param duration as int
             @param track as Track
         """
+        self.__unschedule_crossfade()
         self._on_track_finished(self._current_track)
 
         if track.id is None:
             return
 
         # If some crossfade already running, just switch to track
-        if self.__crossfade_up or self.__crossfade_down:
+        if self.__fade_id is not None:
             self._playbin.set_state(Gst.State.NULL)
+            self.__set_envelope(track, False)
             if self._load_track(track):
                 self.play()
             return
 
-        App().task_helper.run(self.__volume_down, self._playbin,
-                              self._plugins, duration)
+        # Fade out from current position if track end not reached
+        position = self.position
+        if self._current_track.duration - position > duration:
+            self._plugins.set_fade([(0, 1.0), (position, 1.0),
+                                    (position + duration, 0.0)])
+        self.__fade_id = GLib.timeout_add(duration + self.__PADDING,
+                                          self.__on_fade_done,
+                                          self._playbin, self._plugins)
         if self._playbin == self._playbin2:
             self._playbin = self._playbin1
             self._plugins = self._plugins1
@@ -158,9 +194,65 @@ class TransitionsPlayer:
             self._plugins = self._plugins2
         rate = App().settings.get_value("volume-rate").get_double()
         self._playbin.set_volume(GstAudio.StreamVolumeFormat.CUBIC, rate)
-        if track.id is not None:
-            self._playbin.set_state(Gst.State.NULL)
-            if self._load_track(track):
-                self._playbin.set_state(Gst.State.PLAYING)
-            App().task_helper.run(self.__volume_up, self._playbin,
-                                  self._plugins, duration)
+        self._playbin.set_state(Gst.State.NULL)
+        # Envelope must be set before first buffer
+        self.__set_envelope(track, True)
+        if self._load_track(track):
+            self._playbin.set_state(Gst.State.PLAYING)
+
+    def __on_fade_done(self, playbin, plugins):
+        """
+            Stop faded out playbin
+            @param playbin as Gst.Bin
+            @param plugins as PluginsPlayer
+        """
+        self.__fade_id = None
+        if playbin != self._playbin:
+            playbin.set_state(Gst.State.NULL)
+            plugins.clear_fade()
+
+    def __on_clock_crossfade(self, clock, time, clock_id, serial):
+        """
+            Pass crossfade to main loop
+            @param clock as Gst.Clock
+            @param time as int
+            @param clock_id as Gst.ClockID
+            @param serial as int
+            @thread safe
+        """
+        GLib.idle_add(self.__on_crossfade_time, serial)
+        return True
+
+    def __on_crossfade_time(self, serial):
+        """
+            Crossfade with next track if still wanted
+            @param serial as int
+        """
+        if serial != self.__clock_serial:
+            return
+        self.__clock_id = None
+        transition_duration = App().settings.get_value(
+            "transitions-duration").get_int32()
+        self.__do_crossfade(transition_duration, self._next_track)
+
+    def __on_bus_state_changed(self, bus, message):
+        """
+            Schedule crossfade when current playbin starts playing
+            @param bus as Gst.Bus
+            @param message as Gst.Message
+        """
+        if message.src != self._playbin:
+            return
+        (old, new, pending) = message.parse_state_changed()
+        if new == Gst.State.PLAYING:
+            self.__schedule_crossfade()
+        else:
+            self.__unschedule_crossfade()
+
+    def __on_seeked(self, player, position):
+        """
+            Reschedule crossfade
+            @param player as Player
+            @param position as int
+        """
+        self.__schedule_crossfade(position)
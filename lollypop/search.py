@@ -10,16 +10,19 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from gi.repository import GObject
+from gi.repository import GObject, GLib, Gio
+
+from time import time
 
 from lollypop.define import StorageType, App
 from lollypop.utils import emit_signal, get_network_available
 from lollypop.search_local import LocalSearch
+from lollypop.logger import Logger
 
 
 class Search(GObject.Object):
     """
-        Local search
+        Local search and web searches running in parallel
     """
     __gsignals__ = {
         "match-artist": (GObject.SignalFlags.RUN_FIRST, None, (int, int)),
@@ -27,42 +30,42 @@ class Search(GObject.Object):
         "match-track": (GObject.SignalFlags.RUN_FIRST, None, (int, int)),
         "finished": (GObject.SignalFlags.RUN_FIRST, None, (bool,)),
     }
+    __WEB_SEARCHES = ["SPOTIFY", "DEEZER", "LASTFM", "MUSICBRAINZ"]
+    # Slow web searches are cancelled after this many seconds
+    __WEB_DEADLINE = 5
+    # Milliseconds between deadline/cancellation checks
+    __WEB_POLL = 250
 
     def __init__(self):
         """
             Init search
         """
         GObject.Object.__init__(self)
-        self.__search_count = 0
+        self.__local_count = 0
         self.__local_search = LocalSearch()
-        self.__connect_search_signals(self.__local_search)
-        self.__web_search = None
+        self.__local_search.connect("match-artist", self.__on_match,
+                                    "match-artist")
+        self.__local_search.connect("match-album", self.__on_match,
+                                    "match-album")
+        self.__local_search.connect("match-track", self.__on_match,
+                                    "match-track")
+        self.__local_search.connect("finished", self.__on_local_finished)
+        self.__web_names = []
+        self.__web_pending = []
+        self.__deadline = 0
+        self.__timeout_id = None
 
-    def set_web_search(self, name):
+    def set_web_search(self, names):
         """
-            Set web search to name
-            @param name as str
+            Set web searches to names
+            @param names as str, comma separated, "NONE" to disable
         """
-        self.__web_search = None
+        self.__web_names = []
         if not get_network_available("YOUTUBE"):
             return
-
-        if name == "SPOTIFY":
-            from lollypop.search_spotify import SpotifySearch
-            self.__web_search = SpotifySearch()
-            self.__connect_search_signals(self.__web_search)
-        elif name == "LASTFM":
-            from lollypop.search_lastfm import LastFMSearch
-            self.__web_search = LastFMSearch()
-            self.__connect_search_signals(self.__web_search)
-        elif name == "MUSICBRAINZ":
-            from lollypop.search_musicbrainz import MusicBrainzSearch
-            self.__web_search = MusicBrainzSearch()
-            self.__connect_search_signals(self.__web_search)
-        elif name == "DEEZER":
-            from lollypop.search_deezer import DeezerSearch
-            self.__web_search = DeezerSearch()
-            self.__connect_search_signals(self.__web_search)
+        for name in names.split(","):
+            if name in self.__WEB_SEARCHES and name not in self.__web_names:
+                self.__web_names.append(name)
 
     def load_tracks(self, album, cancellable):
         """
@@ -87,42 +90,137 @@ class Search(GObject.Object):
     def get(self, search, cancellable):
         """
             Get match for search
+            Web searches still running after __WEB_DEADLINE are cancelled
             @param search as str
             @param cancellable as Gio.Cancellable
         """
+        self.__stop_web_searches()
         # Only local items
         storage_type = StorageType.COLLECTION |\
             StorageType.SAVED |\
             StorageType.SEARCH
         App().task_helper.run(self.__local_search.get,
                               search, storage_type, cancellable)
-        self.__search_count += 1
-        if self.__web_search is not None:
-            storage_type = StorageType.SEARCH | StorageType.EPHEMERAL
-            App().task_helper.run(self.__web_search.get,
-                                  search, storage_type, cancellable)
-            self.__search_count += 1
+        self.__local_count += 1
+        storage_type = StorageType.SEARCH | StorageType.EPHEMERAL
+        for name in self.__web_names:
+            web_search = self.__get_web_search(name)
+            web_cancellable = Gio.Cancellable()
+            self.__web_pending.append((name, web_search, web_cancellable))
+            App().task_helper.run(web_search.get,
+                                  search, storage_type, web_cancellable)
+        if self.__web_pending:
+            self.__deadline = time() + self.__WEB_DEADLINE
+            self.__timeout_id = GLib.timeout_add(self.__WEB_POLL,
+                                                 self.__on_web_poll,
+                                                 cancellable)
 
 #######################
 # PRIVATE             #
 #######################
-    def __on_finished(self, search):
+    def __get_web_search(self, name):
         """
-            Emit finished signals if all search are finished
+            Get a new web search for name
+            @param name as str
+            @return Search provider
+        """
+        if name == "SPOTIFY":
+            from lollypop.search_spotify import SpotifySearch
+            web_search = SpotifySearch()
+        elif name == "LASTFM":
+            from lollypop.search_lastfm import LastFMSearch
+            web_search = LastFMSearch()
+        elif name == "MUSICBRAINZ":
+            from lollypop.search_musicbrainz import MusicBrainzSearch
+            web_search = MusicBrainzSearch()
+        else:
+            from lollypop.search_deezer import DeezerSearch
+            web_search = DeezerSearch()
+        web_search.connect("match-artist", self.__on_match, "match-artist")
+        web_search.connect("match-album", self.__on_match, "match-album")
+        web_search.connect("match-track", self.__on_match, "match-track")
+        web_search.connect("finished", self.__on_web_finished)
+        return web_search
+
+    def __stop_web_searches(self):
+        """
+            Cancel pending web searches, their results are dropped
+        """
+        if self.__timeout_id is not None:
+            GLib.source_remove(self.__timeout_id)
+            self.__timeout_id = None
+        for (name, web_search, web_cancellable) in self.__web_pending:
+            web_cancellable.cancel()
+        self.__web_pending = []
+
+    def __is_pending(self, search):
+        """
+            True if search belongs to current get()
             @param search as Search provider
+            @return bool
         """
-        self.__search_count -= 1
-        emit_signal(self, "finished", self.__search_count == 0)
+        if search == self.__local_search:
+            return True
+        for (name, web_search, web_cancellable) in self.__web_pending:
+            if web_search == search:
+                return True
+        return False
 
-    def __connect_search_signals(self, search):
+    def __emit_finished(self):
         """
-            Connect search signals
+            Emit finished signal, last if nothing is pending
+        """
+        emit_signal(self, "finished",
+                    self.__local_count == 0 and not self.__web_pending)
+
+    def __on_match(self, search, object_id, storage_type, signal):
+        """
+            Forward match from current searches
             @param search as Search provider
+            @param object_id as int
+            @param storage_type as StorageType
+            @param signal as str
+        """
+        if self.__is_pending(search):
+            self.emit(signal, object_id, storage_type)
+
+    def __on_local_finished(self, search):
+        """
+            Emit finished signal
+            @param search as LocalSearch
+        """
+        self.__local_count -= 1
+        self.__emit_finished()
+
+    def __on_web_finished(self, search):
+        """
+            Emit finished signal if search is current
+            @param search as Search provider
+        """
+        for item in self.__web_pending:
+            if item[1] == search:
+                self.__web_pending.remove(item)
+                self.__emit_finished()
+                break
+
+    def __on_web_poll(self, cancellable):
+        """
+            Cancel web searches if search is cancelled or deadline reached
+            @param cancellable as Gio.Cancellable
+            @return bool
         """
-        search.connect("match-artist",
-                       lambda x, y, z: self.emit("match-artist", y, z))
-        search.connect("match-album",
-                       lambda x, y, z: self.emit("match-album", y, z))
-        search.connect("match-track",
-                       lambda x, y, z: self.emit("match-track", y, z))
-        search.connect("finished", self.__on_finished)
+        if not self.__web_pending:
+            self.__timeout_id = None
+            return False
+        if cancellable.is_cancelled():
+            self.__timeout_id = None
+            self.__stop_web_searches()
+            return False
+        if time() > self.__deadline:
+            self.__timeout_id = None
+            Logger.info("Search: deadline reached for %s",
+                        [item[0] for item in self.__web_pending])
+            self.__stop_web_searches()
+            self.__emit_finished()
+            return False
+        return True
@@ -16,7 +16,7 @@ from lollypop.logger import Logger
 from lollypop.utils import emit_signal, get_network_available
 from lollypop.helper_web_deezer import DeezerWebHelper
 from lollypop.helper_web_save import SaveWebHelper
-from lollypop.define import App
+from lollypop.define import App, HttpPriority
 
 
 class DeezerSearch(SaveWebHelper, DeezerWebHelper):
@@ -46,7 +46,7 @@ class DeezerSearch(SaveWebHelper, DeezerWebHelper):
             uri = "https://api.deezer.com/search/album?q=%s" %\
                 search
             (status, data) = App().task_helper.load_uri_content_sync(
-                uri, cancellable)
+                uri, cancellable, HttpPriority.INTERACTIVE)
             if status:
                 decode = json.loads(data.decode("utf-8"))
                 for albums in decode["data"]:
@@ -71,7 +71,7 @@ class DeezerSearch(SaveWebHelper, DeezerWebHelper):
             uri = "https://api.deezer.com/album/%s/tracks" %\
                 deezid
             (status, data) = App().task_helper.load_uri_content_sync(
-                uri, cancellable)
+                uri, cancellable, HttpPriority.INTERACTIVE)
             if status:
                 decode = json.loads(data.decode("utf-8"))
                 # We want to share the same item as lp_album_id may change
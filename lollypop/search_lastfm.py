@@ -10,13 +10,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 
 from lollypop.logger import Logger
 from lollypop.utils import emit_signal, get_network_available
 from lollypop.helper_web_lastfm import LastFMWebHelper
 from lollypop.helper_web_save import SaveWebHelper
-from lollypop.define import LASTFM_API_KEY, App
+from lollypop.define import LASTFM_API_KEY, App, HttpPriority
 
 
 class LastFMSearch(LastFMWebHelper, SaveWebHelper):
@@ -47,28 +48,31 @@ class LastFMSearch(LastFMWebHelper, SaveWebHelper):
             uri += "&album=%s&api_key=%s&format=json" % (
                 search, LASTFM_API_KEY)
             (status, data) = App().task_helper.load_uri_content_sync(
-                uri, cancellable)
+                uri, cancellable, HttpPriority.INTERACTIVE)
             albums = []
             if status:
                 decode = json.loads(data.decode("utf-8"))
                 for album in decode["results"]["albummatches"]["album"]:
                     albums.append((album["name"], album["artist"]))
-            for (album, artist) in albums:
-                uri = "http://ws.audioscrobbler.com/2.0/?method=album.getinfo"
-                uri += "&api_key=%s&artist=%s&album=%s&format=json" % (
-                    LASTFM_API_KEY, artist, album)
-                (status, data) = App().task_helper.load_uri_content_sync(
-                    uri, cancellable)
-                if status:
-                    decode = json.loads(data.decode("utf-8"))
+            # Fetch albums in parallel, save them as they arrive
+            with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+                futures = [executor.submit(self.__get_album_info,
+                                           album, artist, cancellable)
+                           for (album, artist) in albums]
+                for future in as_completed(futures):
+                    if cancellable.is_cancelled():
+                        break
+                    info = future.result()
+                    if info is None:
+                        continue
                     try:
-                        payload = self.lollypop_album_payload(decode["album"])
+                        payload = self.lollypop_album_payload(info)
                         item = self.save_album_payload_to_db(payload,
                                                              storage_type,
                                                              True,
                                                              cancellable)
                         i = 1
-                        for track in decode["album"]["tracks"]["track"]:
+                        for track in info["tracks"]["track"]:
                             payload = self.lollypop_track_payload(track, i)
                             i += 1
                             self.save_track_payload_to_db(payload,
@@ -85,3 +89,28 @@ class LastFMSearch(LastFMWebHelper, SaveWebHelper):
 
     def load_tracks(self, album_id, storage_type, cancellable):
         pass
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_album_info(self, album, artist, cancellable):
+        """
+            Get album info payload
+            @param album as str
+            @param artist as str
+            @param cancellable as Gio.Cancellable
+            @return {}/None
+        """
+        try:
+            if cancellable.is_cancelled():
+                return None
+            uri = "http://ws.audioscrobbler.com/2.0/?method=album.getinfo"
+            uri += "&api_key=%s&artist=%s&album=%s&format=json" % (
+                LASTFM_API_KEY, artist, album)
+            (status, data) = App().task_helper.load_uri_content_sync(
+                uri, cancellable, HttpPriority.INTERACTIVE)
+            if status:
+                return json.loads(data.decode("utf-8"))["album"]
+        except Exception as e:
+            Logger.warning("LastFMSearch::__get_album_info(): %s", e)
+        return None
@@ -16,7 +16,7 @@ from lollypop.logger import Logger
 from lollypop.utils import emit_signal, get_network_available
 from lollypop.helper_web_musicbrainz import MusicBrainzWebHelper
 from lollypop.helper_web_save import SaveWebHelper
-from lollypop.define import App
+from lollypop.define import App, HttpPriority
 
 
 class MusicBrainzSearch(SaveWebHelper, MusicBrainzWebHelper):
@@ -46,7 +46,7 @@ class MusicBrainzSearch(SaveWebHelper, MusicBrainzWebHelper):
             uri = "http://musicbrainz.org/ws/2/release/?fmt=json&query=%s" %\
                 search
             (status, data) = App().task_helper.load_uri_content_sync(
-                uri, cancellable)
+                uri, cancellable, HttpPriority.INTERACTIVE)
             if status:
                 decode = json.loads(data.decode("utf-8"))
                 for release in decode["releases"]:
@@ -16,7 +16,7 @@ from lollypop.logger import Logger
 from lollypop.utils import emit_signal, get_network_available
 from lollypop.helper_web_spotify import SpotifyWebHelper
 from lollypop.helper_web_save import SaveWebHelper
-from lollypop.define import App, StorageType
+from lollypop.define import App, StorageType, HttpPriority
 
 
 class SpotifySearch(SpotifyWebHelper, SaveWebHelper):
@@ -51,7 +51,7 @@ class SpotifySearch(SpotifyWebHelper, SaveWebHelper):
             uri += "q=%s&type=album,track" % search
             (status,
              data) = App().task_helper.load_uri_content_sync_with_headers(
-                    uri, headers, cancellable)
+                    uri, headers, cancellable, HttpPriority.INTERACTIVE)
             if status:
                 decode = json.loads(data.decode("utf-8"))
                 for album in decode["albums"]["items"]:
@@ -95,7 +95,7 @@ class SpotifySearch(SpotifyWebHelper, SaveWebHelper):
             headers = [("Authorization", bearer)]
             (status,
              data) = App().task_helper.load_uri_content_sync_with_headers(
-                    uri, headers, cancellable)
+                    uri, headers, cancellable, HttpPriority.INTERACTIVE)
             if status:
                 decode = json.loads(data.decode("utf-8"))
                 # We want to share the same item as lp_album_id may change
@@ -10,6 +10,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+from concurrent.futures import ThreadPoolExecutor
 import json
 
 from lollypop.define import App
@@ -44,26 +45,39 @@ class DeezerSimilars(SaveWebHelper, DeezerWebHelper):
                 uri = "https://api.deezer.com/artist/%s/radio" % deezer_id
                 (status, data) = App().task_helper.load_uri_content_sync(
                     uri, cancellable)
-                if status:
-                    decode = json.loads(data.decode("utf-8"))
-                    for payload in decode["data"]:
-                        track_payload = self.get_track_payload(
-                            payload["id"], cancellable)
-                        album_payload = self.get_album_payload(
-                            payload["album"]["id"], cancellable)
-                        lollypop_payload = self.lollypop_album_payload(
-                            album_payload)
-                        item = self.save_album_payload_to_db(lollypop_payload,
-                                                             storage_type,
-                                                             True,
-                                                             cancellable)
-                        lollypop_payload = self.lollypop_track_payload(
-                            track_payload)
-                        self.save_track_payload_to_db(lollypop_payload,
-                                                      item,
-                                                      storage_type,
-                                                      True,
-                                                      cancellable)
+                if not status:
+                    continue
+                decode = json.loads(data.decode("utf-8"))
+                track_ids = [payload["id"] for payload in decode["data"]]
+                album_ids = []
+                for payload in decode["data"]:
+                    if payload["album"]["id"] not in album_ids:
+                        album_ids.append(payload["album"]["id"])
+                # Radio payloads miss track numbers and album details
+                with ThreadPoolExecutor(
+                        max_workers=self.MAX_WORKERS) as executor:
+                    tracks = executor.map(
+                        lambda track_id: self.get_track_payload(
+                            track_id, cancellable),
+                        track_ids)
+                    albums = executor.map(
+                        lambda album_id: self.get_album_payload(
+                            album_id, cancellable),
+                        album_ids)
+                    tracks = list(tracks)
+                    albums = dict(zip(album_ids, albums))
+                payloads = []
+                for track_payload in tracks:
+                    if track_payload is None:
+                        continue
+                    album_payload = albums.get(track_payload["album"]["id"])
+                    if album_payload is None:
+                        continue
+                    payloads.append(
+                        (self.lollypop_album_payload(album_payload),
+                         self.lollypop_track_payload(track_payload)))
+                self.save_payloads_to_db(payloads, storage_type,
+                                         True, cancellable)
             except Exception as e:
                 Logger.error("DeezerSimilars::load_similars(): %s", e)
         emit_signal(self, "finished")
@@ -10,16 +10,44 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from random import shuffle
+from gi.repository import GLib
+
+from heapq import nlargest
+from math import log, log1p, sqrt
+from random import sample
+from threading import Lock
 
 from lollypop.define import App, StorageType
+from lollypop.sqlcursor import SqlCursor
 from lollypop.logger import Logger
 
 
 class LocalSimilars:
     """
         Search similar artists locally
+        Album artists are linked by shared genres (IDF weighted), featuring,
+        playlists and listening sessions
+        Best neighbours are kept in DB, a search is a single lookup
     """
+
+    __LOCK = Lock()
+    # Bump to rebuild index when scoring changes
+    __VERSION = 2
+    # Neighbours kept per artist
+    __NEIGHBOURS = 50
+    # Genres shared by more artists are not scored for all their artists,
+    # only for already found candidates and a sample of genre artists
+    __MAX_GENRE_ARTISTS = 500
+    # Playlists with more artists are not meaningful
+    __MAX_PLAYLIST_ARTISTS = 100
+    # Tracks listened within this delay (s) are in same session
+    __SESSION_GAP = 1800
+    __FEATURING_WEIGHT = 1.0
+    __PLAYLIST_WEIGHT = 1.0
+    __SESSION_WEIGHT = 0.5
+    # Above this count of scanned tracks, rebuild whole index
+    __MAX_UPDATED_TRACKS = 500
+
     def __init__(self):
         """
             Init provider
@@ -29,18 +57,207 @@ class LocalSimilars:
     def get_similar_artists(self, artist_names, cancellable):
         """
             Get similar artists
-            @param artist_ids as [int]
+            @param artist_names as [str]
             @param cancellable as Gio.Cancellable
             @return [(str, None)]
         """
         artist_ids = []
         for artist_name in artist_names:
-            artist_ids.append(App().artists.get_id(artist_name)[0])
-        genre_ids = App().artists.get_genre_ids(artist_ids,
-                                                StorageType.COLLECTION)
-        artists = App().artists.get(genre_ids, StorageType.COLLECTION)
-        shuffle(artists)
-        result = [(name, None) for (artist_id, name, sortname) in artists]
+            artist_id = App().artists.get_id(artist_name)[0]
+            if artist_id is not None:
+                artist_ids.append(artist_id)
+        result = [(App().artists.get_name(artist_id), None)
+                  for artist_id in self.get_similar_artist_ids(artist_ids)]
         if result:
             Logger.info("Found similar artists with LocalSimilars")
         return result
+
+    def get_similar_artist_ids(self, artist_ids, limit=50):
+        """
+            Get similar album artists, best first
+            @param artist_ids as [int]
+            @param limit as int
+            @return [int]
+        """
+        if not artist_ids:
+            return []
+        if not self.__is_built():
+            self.update([])
+        return App().artists.get_similar_ids(artist_ids, limit)
+
+    def update(self, track_ids=None):
+        """
+            Update index for artists of tracks, rebuild it if needed
+            @param track_ids as [int]/None
+            @thread safe
+        """
+        with self.__LOCK:
+            try:
+                SqlCursor.add(App().db)
+                if track_ids is None or not self.__is_built() or\
+                        len(track_ids) > self.__MAX_UPDATED_TRACKS:
+                    self.__rebuild()
+                elif track_ids:
+                    artist_ids = set()
+                    for track_id in track_ids:
+                        artist_ids |= set(App().tracks.get_artist_ids(
+                            track_id))
+                    self.__update(artist_ids)
+            except Exception as e:
+                Logger.error("LocalSimilars::update(): %s", e)
+            finally:
+                SqlCursor.remove(App().db)
+
+#######################
+# PRIVATE             #
+#######################
+    def __rebuild(self):
+        """
+            Rebuild whole index
+        """
+        (genres, links) = self.__load()
+        App().artists.clear_similars()
+        for artist_id in genres.keys():
+            App().artists.set_similars(
+                artist_id, self.__get_neighbours(artist_id, genres, links))
+        # Index may be empty, do not rebuild it on each search
+        App().settings.set_value("similars-index-version",
+                                 GLib.Variant("i", self.__VERSION))
+        Logger.info("LocalSimilars: index built for %s artists", len(genres))
+
+    def __is_built(self):
+        """
+            True if index is built with current scoring
+            @return bool
+        """
+        return App().settings.get_value(
+            "similars-index-version").get_int32() == self.__VERSION
+
+    def __update(self, artist_ids):
+        """
+            Update index for artists and their neighbours
+            @param artist_ids as set
+        """
+        (genres, links) = self.__load()
+        for artist_id in artist_ids & genres.keys():
+            neighbours = self.__get_neighbours(artist_id, genres, links)
+            App().artists.set_similars(artist_id, neighbours)
+            for (similar_id, score) in neighbours:
+                App().artists.add_similar(similar_id, artist_id, score,
+                                          self.__NEIGHBOURS)
+
+    def __load(self):
+        """
+            Load similarity signals from DB
+            @return ({int: set}, {int: {int: float}}) as
+                    genres for album artists, links between album artists
+        """
+        genres = {}
+        for (artist_id, genre_id) in App().artists.get_genre_links(
+                StorageType.COLLECTION):
+            genres.setdefault(artist_id, set()).add(genre_id)
+        links = {}
+
+        def add_link(artist_id1, artist_id2, weight):
+            if artist_id1 == artist_id2 or artist_id1 not in genres.keys()\
+                    or artist_id2 not in genres.keys():
+                return
+            for (key, value) in [(artist_id1, artist_id2),
+                                 (artist_id2, artist_id1)]:
+                artist_links = links.setdefault(key, {})
+                artist_links[value] = artist_links.get(value, 0) + weight
+
+        for (featured_id, artist_id) in App().artists.get_featuring_links(
+                StorageType.COLLECTION):
+            add_link(featured_id, artist_id, self.__FEATURING_WEIGHT)
+        # Playlists
+        uris = {}
+        for (uri, artist_id) in App().artists.get_uri_links(
+                StorageType.COLLECTION):
+            uris.setdefault(uri, set()).add(artist_id)
+        for playlist_id in App().playlists.get_ids():
+            artist_ids = set()
+            for uri in App().playlists.get_track_uris(playlist_id):
+                artist_ids |= uris.get(uri, set())
+            artist_ids &= genres.keys()
+            if len(artist_ids) > self.__MAX_PLAYLIST_ARTISTS:
+                continue
+            weight = self.__PLAYLIST_WEIGHT / max(1, len(artist_ids) - 1)
+            artist_ids = list(artist_ids)
+            for (i, artist_id) in enumerate(artist_ids):
+                for similar_id in artist_ids[i + 1:]:
+                    add_link(artist_id, similar_id, weight)
+        # Listening sessions, consecutive artists only
+        (previous_ltime, previous_id) = (0, None)
+        for (ltime, artist_id) in App().artists.get_listening_links(
+                StorageType.COLLECTION):
+            if previous_id is not None and\
+                    ltime - previous_ltime <= self.__SESSION_GAP:
+                add_link(previous_id, artist_id, self.__SESSION_WEIGHT)
+            (previous_ltime, previous_id) = (ltime, artist_id)
+        self.__set_idf(genres)
+        return (genres, links)
+
+    def __get_neighbours(self, artist_id, genres, links):
+        """
+            Get best neighbours for artist
+            @param artist_id as int
+            @param genres as {int: set}
+            @param links as {int: {int: float}}
+            @return [(int, float)] as artist id, score
+        """
+        scores = {}
+        large_genre_ids = []
+        for genre_id in genres[artist_id]:
+            artist_ids = self.__genre_artists[genre_id]
+            if len(artist_ids) > self.__MAX_GENRE_ARTISTS:
+                large_genre_ids.append(genre_id)
+                continue
+            weight = self.__idf[genre_id] ** 2
+            for similar_id in artist_ids:
+                scores[similar_id] = scores.get(similar_id, 0) + weight
+        # Scoring all artists of large genres is quadratic, IDF already
+        # makes them weak, score candidates and a sample of genre artists
+        candidates = set(scores.keys()) | set(links.get(artist_id, {}).keys())
+        for genre_id in large_genre_ids:
+            artist_ids = self.__genre_artists[genre_id]
+            candidates |= set(sample(artist_ids,
+                                     min(len(artist_ids),
+                                         self.__NEIGHBOURS * 2)))
+        for genre_id in large_genre_ids:
+            weight = self.__idf[genre_id] ** 2
+            for similar_id in candidates:
+                if genre_id in genres[similar_id]:
+                    scores[similar_id] = scores.get(similar_id, 0) + weight
+        # Cosine similarity of genre vectors
+        norm = self.__norms[artist_id]
+        for similar_id in scores.keys():
+            divisor = norm * self.__norms[similar_id]
+            scores[similar_id] = scores[similar_id] / divisor\
+                if divisor else 0
+        for (similar_id, weight) in links.get(artist_id, {}).items():
+            scores[similar_id] = scores.get(similar_id, 0) + log1p(weight)
+        scores.pop(artist_id, None)
+        return nlargest(self.__NEIGHBOURS,
+                        [(similar_id, score)
+                         for (similar_id, score) in scores.items()
+                         if score > 0],
+                        key=lambda item: item[1])
+
+    def __set_idf(self, genres):
+        """
+            Calculate genres IDF and artists norms
+            @param genres as {int: set}
+        """
+        self.__genre_artists = {}
+        for (artist_id, genre_ids) in genres.items():
+            for genre_id in genre_ids:
+                self.__genre_artists.setdefault(genre_id, []).append(
+                    artist_id)
+        count = len(genres)
+        self.__idf = {genre_id: log(count / len(artist_ids))
+                      for (genre_id, artist_ids)
+                      in self.__genre_artists.items()}
+        self.__norms = {artist_id: sqrt(sum(self.__idf[genre_id] ** 2
+                                            for genre_id in genre_ids))
+                        for (artist_id, genre_ids) in genres.items()}
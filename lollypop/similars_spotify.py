@@ -10,7 +10,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from random import choice, shuffle
+from concurrent.futures import ThreadPoolExecutor
+from random import shuffle
 import json
 
 from lollypop.logger import Logger
@@ -40,38 +41,29 @@ class SpotifySimilars(SaveWebHelper, SpotifyWebHelper):
         """
         names = [App().artists.get_name(artist_id) for artist_id in artist_ids]
         spotify_ids = self.get_similar_artist_ids(names, cancellable)
-        track_ids = []
-        for spotify_id in spotify_ids:
-            spotify_ids = self.get_artist_top_tracks(spotify_id, cancellable)
-            # We want some randomizing so keep tracks for later usage
-            spotify_id = choice(spotify_ids)
-            track_ids += spotify_ids
-            payload = self.get_track_payload(spotify_id, cancellable)
-            lollypop_payload = self.lollypop_album_payload(payload["album"])
-            item = self.save_album_payload_to_db(lollypop_payload,
-                                                 storage_type,
-                                                 True,
-                                                 cancellable)
-            lollypop_payload = self.lollypop_track_payload(payload)
-            self.save_track_payload_to_db(lollypop_payload,
-                                          item,
-                                          storage_type,
-                                          True,
-                                          cancellable)
-        shuffle(track_ids)
-        for spotify_id in track_ids:
-            payload = self.get_track_payload(spotify_id, cancellable)
-            lollypop_payload = self.lollypop_album_payload(payload["album"])
-            item = self.save_album_payload_to_db(lollypop_payload,
-                                                 storage_type,
-                                                 True,
-                                                 cancellable)
-            lollypop_payload = self.lollypop_track_payload(payload)
-            self.save_track_payload_to_db(lollypop_payload,
-                                          item,
-                                          storage_type,
-                                          True,
-                                          cancellable)
+        # Top tracks already contain full track payloads
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            top_tracks = list(executor.map(
+                lambda spotify_id: self.get_artist_top_tracks(spotify_id,
+                                                              cancellable),
+                spotify_ids))
+        # One random track per artist first, others later
+        firsts = []
+        others = []
+        for tracks in top_tracks:
+            if tracks:
+                shuffle(tracks)
+                firsts.append(tracks[0])
+                others += tracks[1:]
+        shuffle(others)
+        payloads = []
+        for payload in firsts + others:
+            try:
+                payloads.append((self.lollypop_album_payload(payload["album"]),
+                                 self.lollypop_track_payload(payload)))
+            except Exception as e:
+                Logger.warning("SpotifySimilars::load_similars(): %s", e)
+        self.save_payloads_to_db(payloads, storage_type, True, cancellable)
         emit_signal(self, "finished")
 
     def get_similar_artist_ids(self, artist_names, cancellable):
@@ -116,21 +116,22 @@ class CurrentAlbumsView(AlbumsListView, SignalsHelper):
 #######################
 # PROTECTED           #
 #######################
-    def _on_queue_changed(self, *ignore):
+    def _on_queue_changed(self, player, track_ids):
         """
             Clean view and reload if empty
+            @param player as Player
+            @param track_ids as {int}
         """
-        queue = App().player.queue
-        if queue:
+        if player.queue:
             for row in self.children:
                 if row.revealed:
                     for subrow in row.children:
-                        if subrow.track.id not in queue:
+                        if not player.is_in_queue(subrow.track.id):
                             subrow.destroy()
                             break
                 count = len(row.album.tracks)
                 for track in row.album.tracks:
-                    if track.id not in queue:
+                    if not player.is_in_queue(track.id):
                         row.album.remove_track(track)
                         if count == 1:
                             row.destroy()
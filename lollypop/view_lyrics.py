@@ -16,14 +16,13 @@ from gettext import gettext as _
 
 from lollypop.view import View
 from lollypop.define import App, ViewType
-from lollypop.define import StorageType, LYRICS_PATH
+from lollypop.define import StorageType
 from lollypop.logger import Logger
 from lollypop.utils import get_network_available
 from lollypop.objects_track import Track
 from lollypop.helper_lyrics import LyricsHelper
 from lollypop.helper_signals import SignalsHelper, signals_map
 from lollypop.widgets_banner_lyrics import LyricsBannerWidget
-from lollypop.information_store import InformationStore
 
 
 class LyricsLabel(Gtk.Stack):
@@ -112,12 +111,13 @@ class LyricsView(View, SignalsHelper):
         self.__banner.connect("translate", self.__on_translate)
         self.add_widget(self.__lyrics_label, self.__banner)
         self.__lyrics_helper = LyricsHelper()
+        self.__prefetch_helper = LyricsHelper()
         self.__update_lyrics_style()
-        self.__information_store = InformationStore()
         return [
             (App().window.container.widget, "notify::folded",
              "_on_container_folded"),
-            (App().player, "current-changed", "_on_current_changed")
+            (App().player, "current-changed", "_on_current_changed"),
+            (App().player, "next-changed", "_on_next_changed")
         ]
 
     def populate(self, track):
@@ -145,26 +145,15 @@ class LyricsView(View, SignalsHelper):
                     self.__lyrics_timeout_id = None
                 if track.storage_type & (StorageType.COLLECTION |
                                          StorageType.EXTERNAL):
-                    from lollypop.tagreader import TagReader, Discoverer
-                    tagreader = TagReader()
-                    discoverer = Discoverer()
-                    try:
-                        info = discoverer.get_info(track.uri)
-                    except:
-                        info = None
-                    if info is not None:
-                        tags = info.get_tags()
-                        lyrics = tagreader.get_lyrics(tags)
+                    lyrics = self.__lyrics_helper.text
+        if not lyrics and not get_network_available():
+            # Web lyrics downloaded previously, even outdated
+            lyrics = self.__lyrics_helper.get_lyrics_from_disk(track)
         if lyrics:
             self.__lyrics_label.set_text(lyrics)
             self.__lyrics_text = lyrics
         else:
-            name = track.name + track.album.name + ",".join(track.artists)
-            content = self.__information_store.get_information(name,
-                                                               LYRICS_PATH)
-            if content:
-                self.__lyrics_label.set_text(content.decode("utf-8"))
-            elif not get_network_available():
+            if not get_network_available():
                 self.__lyrics_label.set_text(
                     _("Network unavailable or disabled in settings"))
             else:
@@ -198,6 +187,7 @@ class LyricsView(View, SignalsHelper):
             @param widget as Gtk.Widget
         """
         self.__lyrics_helper.cancel()
+        self.__prefetch_helper.cancel()
         View._on_unmap(self, widget)
         if self.__lyrics_timeout_id is not None:
             GLib.source_remove(self.__lyrics_timeout_id)
@@ -210,6 +200,16 @@ class LyricsView(View, SignalsHelper):
         """
         self.populate(App().player.current_track)
 
+    def _on_next_changed(self, player):
+        """
+            Prepare lyrics for next track
+            @param player as Player
+        """
+        track = App().player.next_track
+        if isinstance(track, Track) and track.id is not None:
+            self.__prefetch_helper.cancel()
+            self.__prefetch_helper.prefetch(track)
+
     def _on_container_folded(self, leaflet, folded):
         """
             Handle libhandy folded status
@@ -311,8 +311,4 @@ class LyricsView(View, SignalsHelper):
         else:
             self.__lyrics_label.set_text(lyrics)
             self.__lyrics_text = lyrics
-            name = track.name + track.album.name + ",".join(track.artists)
-            self.__information_store.save_information(name,
-                                                      LYRICS_PATH,
-                                                      lyrics.encode("utf-8"))
             self.__banner.translate_button.set_sensitive(True)
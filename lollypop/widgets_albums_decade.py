@@ -13,14 +13,16 @@
 
 from lollypop.define import App, Type
 from lollypop.utils import get_default_storage_type
+from lollypop.helper_signals import SignalsHelper, signals_map
 from lollypop.widgets_albums_rounded import RoundedAlbumsWidget
 
 
-class AlbumsDecadeWidget(RoundedAlbumsWidget):
+class AlbumsDecadeWidget(RoundedAlbumsWidget, SignalsHelper):
     """
         Decade widget showing cover for 4 albums
     """
 
+    @signals_map
     def __init__(self, item_ids, view_type, font_height):
         """
             Init widget
@@ -32,6 +34,9 @@ class AlbumsDecadeWidget(RoundedAlbumsWidget):
         RoundedAlbumsWidget.__init__(self, item_ids, decade_str,
                                      decade_str, view_type, font_height)
         self._genre = Type.YEARS
+        return [
+            (App().art, "artwork-cleared", "_on_artwork_cleared")
+        ]
 
     def populate(self):
         """
@@ -11,14 +11,16 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 from lollypop.define import App, Type
+from lollypop.helper_signals import SignalsHelper, signals_map
 from lollypop.widgets_albums_rounded import RoundedAlbumsWidget
 
 
-class AlbumsGenreWidget(RoundedAlbumsWidget):
+class AlbumsGenreWidget(RoundedAlbumsWidget, SignalsHelper):
     """
         Genre widget showing cover for 4 albums
     """
 
+    @signals_map
     def __init__(self, genre_id, storage_type, view_type, font_height):
         """
             Init widget
@@ -31,6 +33,9 @@ class AlbumsGenreWidget(RoundedAlbumsWidget):
         RoundedAlbumsWidget.__init__(self, genre_id, name, sortname,
                                      view_type, font_height)
         self._genre = Type.GENRES
+        return [
+            (App().art, "artwork-cleared", "_on_artwork_cleared")
+        ]
 
     def populate(self):
         """
@@ -40,6 +40,7 @@ class RoundedAlbumsWidget(RoundedFlowBoxWidget):
                                       view_type, font_height)
         self._genre = Type.NONE
         self.__album_ids = []
+        self.__used_album_ids = []
         self.__cancellable = Gio.Cancellable()
         self._scale_factor = self.get_scale_factor()
         self.connect("unmap", self.__on_unmap)
@@ -89,6 +90,7 @@ class RoundedAlbumsWidget(RoundedFlowBoxWidget):
         album_ids = list(self.__album_ids)
         album_pixbufs = []
         album_scaled_pixbufs = []
+        self.__used_album_ids = []
         while album_ids and len(album_pixbufs) != 9:
             album_id = album_ids.pop(0)
             pixbuf = App().art.get_album_artwork(Album(album_id),
@@ -97,6 +99,7 @@ class RoundedAlbumsWidget(RoundedFlowBoxWidget):
                                                  self._scale_factor)
             if pixbuf is not None:
                 album_pixbufs.append(pixbuf)
+                self.__used_album_ids.append(album_id)
         if len(album_pixbufs) == 0:
             self.__cover_size = self._art_size / 2
             positions = [(0.5, 0.5)]
@@ -145,6 +148,17 @@ class RoundedAlbumsWidget(RoundedFlowBoxWidget):
         self.__draw_surface(surface, ctx, positions,
                             album_scaled_pixbufs, set_surface)
 
+    def _on_artwork_cleared(self, art, name, prefix):
+        """
+            Update artwork if our collage has been cleared
+            @param art as Art
+            @param name as str
+            @param prefix as str
+        """
+        if self._artwork is not None and\
+                prefix == "ROUNDED" and name == self.artwork_name:
+            self.set_artwork()
+
 #######################
 # PRIVATE             #
 #######################
@@ -162,6 +176,9 @@ class RoundedAlbumsWidget(RoundedFlowBoxWidget):
         App().art.add_artwork_to_cache(self.artwork_name,
                                        rounded,
                                        "ROUNDED")
+        # Remember albums, collage is invalidated when one of them changes
+        App().task_helper.run(App().cache.set_collage_album_ids,
+                              self.artwork_name, self.__used_album_ids)
         del rounded
         emit_signal(self, "populated")
 
@@ -182,7 +182,7 @@ class CurrentAlbumsBannerWidget(BannerWidget, SignalsHelper):
             Update clear button state
             @param player as Player
         """
-        sensitive = player.albums != []
+        sensitive = len(player.albums) != 0
         GLib.idle_add(self.__clear_button.set_sensitive, sensitive)
         GLib.idle_add(self.__clear_button.set_sensitive, sensitive)
         GLib.idle_add(self.__jump_button.set_sensitive, sensitive)
@@ -64,12 +64,15 @@ class TracksWidget(Gtk.ListBox, SignalsHelper, GesturesHelper):
 #######################
 # PROTECTED           #
 #######################
-    def _on_queue_changed(self, *ignore):
+    def _on_queue_changed(self, player, track_ids):
         """
-            Update all position labels
+            Update position labels of changed and queued tracks
+            @param player as Player
+            @param track_ids as {int}
         """
         for row in self.get_children():
-            row.update_number_label()
+            if row.track.id in track_ids or player.is_in_queue(row.track.id):
+                row.update_number_label()
 
     def _on_primary_long_press_gesture(self, x, y):
         """
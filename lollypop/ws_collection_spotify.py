@@ -11,8 +11,9 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from time import time
-from random import shuffle
+from random import shuffle, choice
 from locale import getdefaultlocale
 
 from lollypop.logger import Logger
@@ -49,21 +50,22 @@ class SpotifyCollectionWebService(SpotifyWebHelper):
                                                           cancellable)
             # Add albums
             shuffle(similar_ids)
-            for similar_id in similar_ids[:self.MAX_ITEMS_PER_STORAGE_TYPE]:
-                albums_payload = self.__get_artist_albums_payload(similar_id,
-                                                                  cancellable)
-                shuffle(albums_payload)
-                for album in albums_payload:
-                    if cancellable.is_cancelled():
-                        raise Exception("Cancelled")
+            with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+                albums_payloads = list(executor.map(
+                    lambda similar_id: self.__get_artist_albums_payload(
+                        similar_id, cancellable),
+                    similar_ids[:self.MAX_ITEMS_PER_STORAGE_TYPE]))
+            payloads = []
+            for albums_payload in albums_payloads:
+                if albums_payload:
+                    album = choice(albums_payload)
                     lollypop_payload = SpotifyWebHelper.lollypop_album_payload(
                         self, album)
-                    self.save_album_payload_to_db(
-                                           lollypop_payload,
-                                           StorageType.SPOTIFY_SIMILARS,
-                                           True,
-                                           cancellable)
-                    break
+                    payloads.append((lollypop_payload, None))
+            self.save_payloads_to_db(payloads,
+                                     StorageType.SPOTIFY_SIMILARS,
+                                     True,
+                                     cancellable)
         except Exception as e:
             Logger.warning("SpotifyWebService::search_similar_albums(): %s", e)
 
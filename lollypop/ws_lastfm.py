@@ -14,9 +14,11 @@ from gi.repository import Soup, Gio
 
 import json
 from hashlib import md5
-from pickle import load, dump
+from pickle import load
+from os import remove
 
 from lollypop.helper_passwords import PasswordsHelper
+from lollypop.helper_scrobble_journal import ScrobbleJournalHelper
 from lollypop.logger import Logger
 from lollypop.utils import get_network_available
 from lollypop.define import LOLLYPOP_DATA_PATH, App
@@ -28,43 +30,42 @@ class LastFMWebService:
         Handle scrobbling to Last.fm and all authenticated API calls
     """
 
+    # Max scrobbles per track.scrobble call
+    __BATCH_SIZE = 50
+    # Errors worth a retry: invalid session, service offline,
+    # temporarily unavailable, rate limit exceeded
+    __RETRY_ERRORS = ["9", "11", "16", "29"]
+
     def __init__(self, name):
         """
             Init service
             @param name as str
         """
         self.__name = name
-        self.__queue = []
+        self.__cancellable = Gio.Cancellable()
         if name == "LIBREFM":
             self.__uri = "https://libre.fm/2.0/"
         else:
             self.__uri = "https://ws.audioscrobbler.com/2.0/"
+        self.__journal = ScrobbleJournalHelper(name, self.__BATCH_SIZE,
+                                               self.__submit)
+        self.__migrate_queue()
         self.start()
 
     def start(self):
         """
-            Start web service (load save queue)
+            Start web service (submit pending listens)
         """
-        try:
-            self.__cancellable = Gio.Cancellable()
-            self.__queue = load(
-                open(LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name, "rb"))
-        except Exception as e:
-            Logger.info("LastFMWebService::__init__(): %s", e)
-            self.__queue = []
+        self.__cancellable = Gio.Cancellable()
+        self.__journal.start()
 
     def stop(self):
         """
-            Stop current tasks and save queue to disk
+            Stop current tasks, pending listens stay on disk
             @return bool
         """
         self.__cancellable.cancel()
-        try:
-            with open(LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name,
-                      "wb") as f:
-                dump(list(self.__queue), f)
-        except Exception as e:
-            Logger.info("LastFMWebService::stop: %s", e)
+        self.__journal.stop()
         return True
 
     def listen(self, track, timestamp):
@@ -73,11 +74,12 @@ class LastFMWebService:
             @param track as Track
             @param timestamp as int
         """
-        if App().settings.get_value("disable-scrobbling") or\
-                not get_network_available():
-            self.__queue.append((track, timestamp))
+        # No account configured, do not keep listens
+        if not App().ws_director.token_ws.has_token(self.__name):
+            return
         elif track.id is not None and track.id >= 0:
-            App().task_helper.run(self.__listen, track, timestamp)
+            self.__journal.append(self.__get_entry(track, timestamp))
+            self.__journal.drain()
 
     def playing_now(self, track):
         """
@@ -186,43 +188,78 @@ class LastFMWebService:
         api_sig += LASTFM_API_SECRET
         return md5(api_sig.encode("utf-8")).hexdigest()
 
-    def __listen(self, track, timestamp):
+    def __migrate_queue(self):
+        """
+            Move listens from old pickled queue to journal
         """
-            Scrobble track
+        path = LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name
+        try:
+            with open(path, "rb") as f:
+                for (track, timestamp) in load(f):
+                    self.__journal.append(self.__get_entry(track, timestamp))
+            remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            Logger.info("LastFMWebService::__migrate_queue(): %s", e)
+
+    def __get_entry(self, track, timestamp):
+        """
+            Get journal entry for track
             @param track as Track
             @param timestamp as int
+            @return {}
+        """
+        entry = {"artist": track.artists[0],
+                 "track": track.name,
+                 "album": track.album.name,
+                 "timestamp": str(timestamp)}
+        if track.mbid and track.mbid.find(":") == -1:
+            entry["mbid"] = track.mbid
+        return entry
+
+    def __submit(self, entries, cancellable):
+        """
+            Scrobble entries with one call
+            @param entries as [{}]
+            @param cancellable as Gio.Cancellable
+            @return bool, False to retry later
         """
-        tracks = self.__queue + [(track, timestamp)]
-        self.__queue = []
         try:
-            for (track, timestamp) in tracks:
-                token = App().ws_director.token_ws.get_token(
-                    self.__name, self.__cancellable)
-                if token is None:
-                    return
-                args = self.__get_args_for_method("track.scrobble")
-                args.append(("artist", track.artists[0]))
-                args.append(("track", track.name))
-                args.append(("album", track.album.name))
-                if track.mbid and track.mbid.find(":") == -1:
-                    args.append(("mbid", track.mbid))
-                args.append(("timestamp", str(timestamp)))
-                args.append(("sk", token))
-                api_sig = self.__get_sig_for_args(args)
-                args.append(("api_sig", api_sig))
-                post_data = {}
-                for (name, value) in args:
-                    post_data[name] = value
-                msg = Soup.form_request_new_from_hash("POST",
-                                                      self.__uri,
-                                                      post_data)
-                msg.request_headers.append("Accept-Charset", "utf-8")
-                data = App().task_helper.send_message_sync(msg,
-                                                           self.__cancellable)
-                if data is not None:
-                    Logger.debug("%s: %s", self.__uri, data)
+            token = App().ws_director.token_ws.get_token(
+                self.__name, cancellable)
+            if token is None:
+                # Drop listens if no account is configured
+                return not App().ws_director.token_ws.has_token(
+                    self.__name)
+            args = self.__get_args_for_method("track.scrobble")
+            for (i, entry) in enumerate(entries):
+                for (name, value) in entry.items():
+                    args.append(("%s[%s]" % (name, i), value))
+            args.append(("sk", token))
+            api_sig = self.__get_sig_for_args(args)
+            args.append(("api_sig", api_sig))
+            post_data = {}
+            for (name, value) in args:
+                post_data[name] = value
+            msg = Soup.form_request_new_from_hash("POST",
+                                                  self.__uri,
+                                                  post_data)
+            msg.request_headers.append("Accept-Charset", "utf-8")
+            data = App().task_helper.send_message_sync(msg, cancellable)
+            if data is None:
+                return False
+            Logger.debug("%s: %s", self.__uri, data)
+            if data.find(b'status="failed"') != -1:
+                for code in self.__RETRY_ERRORS:
+                    if data.find(b'code="%s"' % code.encode("utf-8")) != -1:
+                        return False
+                # Rejected by service, do not retry
+                Logger.warning("LastFMWebService::__submit(): %s", data)
+            return True
         except Exception as e:
-            Logger.error("LastFMWebService::__listen(): %s" % e)
+            Logger.error("LastFMWebService::__submit(): %s" % e)
+        return False
 
     def __playing_now(self, track):
         """
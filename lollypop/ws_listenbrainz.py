@@ -14,9 +14,11 @@
 from gi.repository import Soup, GObject, Gio
 
 import json
-from pickle import load, dump
+from pickle import load
+from os import remove
 
 from lollypop.logger import Logger
+from lollypop.helper_scrobble_journal import ScrobbleJournalHelper
 from lollypop.define import App, LOLLYPOP_DATA_PATH
 from lollypop.utils import get_network_available
 
@@ -29,6 +31,8 @@ class ListenBrainzWebService(GObject.GObject):
     """
 
     user_token = GObject.Property(type=str, default="plop")
+    # Listens per import call
+    __BATCH_SIZE = 500
 
     def __init__(self):
         """
@@ -38,35 +42,29 @@ class ListenBrainzWebService(GObject.GObject):
         try:
             self.__uri = "https://api.listenbrainz.org/1/submit-listens"
             self.__name = "listenbrainz"
-            self.__queue = []
+            self.__cancellable = Gio.Cancellable()
+            self.__journal = ScrobbleJournalHelper(self.__name,
+                                                   self.__BATCH_SIZE,
+                                                   self.__submit)
+            self.__migrate_queue()
             self.start()
         except Exception as e:
             Logger.info("LastFM::__init__(): %s", e)
 
     def start(self):
         """
-            Start web service (load save queue)
+            Start web service (submit pending listens)
         """
-        try:
-            self.__cancellable = Gio.Cancellable()
-            self.__queue = load(
-                open(LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name, "rb"))
-        except Exception as e:
-            Logger.info("ListenBrainzWebService::__init__(): %s", e)
-            self.__queue = []
+        self.__cancellable = Gio.Cancellable()
+        self.__journal.start()
 
     def stop(self):
         """
-            Stop current tasks and save queue to disk
+            Stop current tasks, pending listens stay on disk
             @return bool
         """
         self.__cancellable.cancel()
-        try:
-            with open(LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name,
-                      "wb") as f:
-                dump(list(self.__queue), f)
-        except Exception as e:
-            Logger.info("ListenBrainzWebService::stop: %s", e)
+        self.__journal.stop()
         return True
 
     def listen(self, track, timestamp):
@@ -78,11 +76,9 @@ class ListenBrainzWebService(GObject.GObject):
         if not App().settings.get_value(
                 "listenbrainz-user-token").get_string():
             return
-        elif App().settings.get_value("disable-scrobbling") or\
-                not get_network_available():
-            self.__queue.append((track, timestamp))
         elif track.id is not None and track.id >= 0:
-            App().task_helper.run(self.__listen, track, timestamp)
+            self.__journal.append(self.__get_listen(track, timestamp))
+            self.__journal.drain()
 
     def playing_now(self, track):
         """
@@ -110,37 +106,68 @@ class ListenBrainzWebService(GObject.GObject):
 #######################
 # PRIVATE             #
 #######################
-    def __listen(self, track, timestamp):
+    def __migrate_queue(self):
+        """
+            Move listens from old pickled queue to journal
         """
-            Scrobble track
+        path = LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name
+        try:
+            with open(path, "rb") as f:
+                for (track, timestamp) in load(f):
+                    self.__journal.append(self.__get_listen(track, timestamp))
+            remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            Logger.info("ListenBrainzWebService::__migrate_queue(): %s", e)
+
+    def __get_listen(self, track, timestamp):
+        """
+            Get journal entry for track
             @param track as Track
             @param timestamp as int
+            @return {}
+        """
+        listen = self.__get_payload(track)[0]
+        listen["listened_at"] = timestamp
+        return listen
+
+    def __submit(self, listens, cancellable):
+        """
+            Submit listens with one import call
+            @param listens as [{}]
+            @param cancellable as Gio.Cancellable
+            @return bool, False to retry later
         """
-        tracks = self.__queue + [(track, timestamp)]
-        self.__queue = []
         try:
-            for (track, timestamp) in tracks:
-                payload = self.__get_payload(track)
-                payload[0]["listened_at"] = timestamp
-                post_data = {
-                    "listen_type": "single",
-                    "payload": payload
-                }
-                body = json.dumps(post_data).encode("utf-8")
-                msg = Soup.Message.new("POST", self.__uri)
-                msg.set_request("application/json",
-                                Soup.MemoryUse.STATIC,
-                                body)
-                msg.request_headers.append("Accept-Charset", "utf-8")
-                msg.request_headers.append("Authorization",
-                                           "Token %s" % self.user_token)
-                msg.request_headers.append("Content-Type", "application/json")
-                data = App().task_helper.send_message_sync(msg,
-                                                           self.__cancellable)
-                if data is not None:
-                    Logger.debug("%s: %s", self.__uri, data)
+            post_data = {
+                "listen_type": "import" if len(listens) > 1 else "single",
+                "payload": listens
+            }
+            body = json.dumps(post_data).encode("utf-8")
+            msg = Soup.Message.new("POST", self.__uri)
+            msg.set_request("application/json",
+                            Soup.MemoryUse.STATIC,
+                            body)
+            msg.request_headers.append("Accept-Charset", "utf-8")
+            msg.request_headers.append("Authorization",
+                                       "Token %s" % self.user_token)
+            msg.request_headers.append("Content-Type", "application/json")
+            data = App().task_helper.send_message_sync(msg, cancellable)
+            if data is None:
+                return False
+            Logger.debug("%s: %s", self.__uri, data)
+            status = msg.get_property("status-code")
+            # Transport error, bad token, timeout, rate limit, server error
+            if status < 100 or status in [401, 408, 429] or status >= 500:
+                return False
+            elif status >= 400:
+                # Rejected by service, do not retry
+                Logger.warning("ListenBrainzWebService::__submit(): %s", data)
+            return True
         except Exception as e:
-            Logger.error("ListenBrainzWebService::__listen(): %s" % e)
+            Logger.error("ListenBrainzWebService::__submit(): %s" % e)
+        return False
 
     def __playing_now(self, track):
         """
@@ -62,6 +62,14 @@ class TokenWebService:
             self.__loading_token[service] = False
         return self.__tokens[service]
 
+    def has_token(self, service):
+        """
+            False if service has no account configured
+            @param service as str
+            @return bool
+        """
+        return self.__tokens[service] != ""
+
     def get_lastfm_auth_token(self, service, cancellable, callback):
         """
             Get a new initial auth token